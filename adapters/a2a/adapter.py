@@ -1,10 +1,10 @@
 # adapters/a2a/adapter.py
-import json
 from pathlib import Path
 from typing import Dict, Any
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
 
 # Assumes SDK is structured as sdk/python/e4a_sdk
+from sdk.python.e4a_sdk import schema_registry
 from sdk.python.e4a_sdk.mandate_engine import MandateEngine, MandateEngineError
 from sdk.python.e4a_sdk.governance_kernel import GovernanceKernel
 from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
@@ -12,10 +12,8 @@ from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
 SPEC_DIR = Path(__file__).resolve().parents[2] / "specs"
 
 def _load_schema(name: str) -> Dict[str, Any]:
-    path = SPEC_DIR / name
-    if not path.exists():
-        raise FileNotFoundError(f"Schema not found: {path}")
-    return json.loads(path.read_text())
+    # Served from the shared registry: parsed and compiled once per process.
+    return schema_registry.get_schema(str(SPEC_DIR / name))
 
 MANDATE_SCHEMA = _load_schema("mandate_v1.json")
 
@@ -46,9 +44,8 @@ class E4A_A2A_Adapter:
         Raises:
             ValueError: If the payload fails schema validation.
         """
-        schema = _load_schema(schema_name)
         try:
-            validate(instance=payload, schema=schema)
+            schema_registry.validate(payload, str(SPEC_DIR / schema_name))
         except ValidationError as e:
             raise ValueError(f"Payload failed schema validation: {e.message}")
 
@@ -1,18 +1,54 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
 from sdk.python.e4a_sdk.mandate_engine import MandateEngine, MANDATE_SCHEMA
 from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
 from sdk.python.e4a_sdk.governance_kernel import GovernanceKernel
 from sdk.python.e4a_sdk.reputation_index import ReputationIndex
 from sdk.python.e4a_sdk.gate_engine import GateEngine, GateEngineError
+from sdk.python.e4a_sdk.config_loader import load_config
+from sdk.python.e4a_sdk.execution_pipeline import ExecutionPipeline, ExecutionPipelineError, ExecutionQueueFull
+from sdk.python.e4a_sdk.storage import open_storage
 
-def create_app():
-    app = FastAPI(title="E4A Protocol API", version="1.0")
+def create_app(config=None):
+    @asynccontextmanager
+    async def lifespan(app):
+        engine.gate_engine.start_expiry()
+        rep.start_checkpoints(reputation.get("checkpoint_seconds") or 5.0)
+        yield
+        pipeline.stop()
+        engine.gate_engine.stop_expiry()
+        rep.close()
+        scribe.close()
+
+    app = FastAPI(title="E4A Protocol API", version="1.0", lifespan=lifespan)
+    config = config or load_config()
 
     scribe = ScribeAgent(node_id="api-node")
-    engine = MandateEngine(scribe)
+    gates = config.get("gates") or {}
+    engine = MandateEngine(scribe, storage=open_storage(config.get("db")),
+                           gate_expiry_seconds=gates.get("expiry_seconds"),
+                           auto_execution_max_entries=gates.get("auto_execution_max_entries", 10_000))
+    execution = config.get("execution") or {}
+    pipeline = ExecutionPipeline(engine,
+                                 rail_limits=execution.get("rail_limits"),
+                                 default_limit=execution.get("default_limit", 4),
+                                 max_queue=execution.get("max_queue", 1000))
+    if gates.get("auto_execute"):
+        # approved gates hand their mandate to the background pipeline; the execution_id (or a
+        # full queue) is kept in engine.auto_executions and returned by POST /gates/{id}/approve
+        engine.enable_auto_execute(
+            lambda mandate_id: pipeline.submit(mandate_id, executor_id="gate-approval").execution_id)
+    app.state.engine = engine
+    app.state.pipeline = pipeline
     gov = GovernanceKernel()
-    rep = ReputationIndex()
+    reputation = config.get("reputation") or {}
+    rep = ReputationIndex(event_rules=reputation.get("event_rules"), store=reputation.get("store"),
+                          half_life=reputation.get("half_life_seconds"))
 
     class IntentPart(BaseModel):
         goal: str
@@ -27,28 +63,126 @@ def create_app():
         amount: float
         currency: str = "USD"
         intent: IntentPart
+        replay_nonce: Optional[str] = None
+        policy_tags: Optional[list[str]] = None
+
+    class MandateBatchRequest(BaseModel):
+        # items are parsed one by one so a malformed item is reported, not fatal to the batch
+        mandates: list[dict[str, Any]]
 
 
 
     @app.post("/mandates/create")
     def create_mandate(req: MandateRequest):
         print(f"DEBUG: Mandate received by API: {req.model_dump()}") # DEBUG PRINT
-        result = engine.create_mandate(req.model_dump())
+        result = engine.create_mandate(req.model_dump(exclude_none=True))
         return {"status": "created", "mandate": result}
 
 
+    @app.post("/mandates/batch")
+    def create_mandates(req: MandateBatchRequest):
+        parsed, rejected = [], {}
+        for index, item in enumerate(req.mandates):
+            try:
+                parsed.append((index, MandateRequest.model_validate(item).model_dump(exclude_none=True)))
+            except ValidationError as e:
+                rejected[index] = {"index": index, "status": "error", "error": str(e)}
+
+        results = engine.create_mandates(m for _, m in parsed)
+        for (index, _), result in zip(parsed, results):
+            result["index"] = index
+        results = sorted(results + list(rejected.values()), key=lambda r: r["index"])
+
+        counts = {"created": 0, "duplicate": 0, "error": 0}
+        for result in results:
+            counts[result["status"]] += 1
+        if counts["error"] == 0:
+            status = "created"
+        elif counts["error"] == len(results):
+            status = "failed"
+        else:
+            status = "partial"
+        return {"status": status, "counts": counts, "results": results}
+
+
     @app.post("/mandates/execute/{mandate_id}")
-    def execute_mandate(mandate_id: str):
+    def execute_mandate(mandate_id: str, background: bool = False, rail: str = "default"):
+        if mandate_id not in engine.mandates:
+            raise HTTPException(status_code=404, detail="Mandate not found")
+        if background:
+            try:
+                handle = pipeline.submit(mandate_id, rail=rail)
+            except ExecutionQueueFull as e:
+                raise HTTPException(status_code=429, detail=str(e))
+            return {"status": "queued", "mandate_id": mandate_id, "execution_id": handle.execution_id}
         result = engine.execute_mandate(mandate_id)
         return {"status": "executed", "mandate_id": mandate_id, "result": result}
 
 
+    @app.get("/executions/{execution_id}")
+    def get_execution(execution_id: str):
+        try:
+            return pipeline.get(execution_id).to_dict()
+        except ExecutionPipelineError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+
+    @app.get("/mandates/{mandate_id}/execution")
+    def get_auto_execution(mandate_id: str):
+        execution = engine.auto_execution(mandate_id)
+        if execution is None:
+            raise HTTPException(status_code=404, detail="No execution was started by gate approval")
+        return {"mandate_id": mandate_id, **execution}
+
+
     @app.get("/reputation")
     def get_reputation():
         rep.ingest_from_scribe(scribe)
         return {"reputation": rep.get_all()}
 
 
+    @app.get("/reputation/as_of")
+    def get_reputation_as_of(at: str, actors: str = None):
+        rep.ingest_from_scribe(scribe)
+        try:
+            scores = rep.scores_as_of(at, actors.split(",") if actors else None)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"at": at, "scores": scores}
+
+
+    def leaderboard(page, limit, offset, bound):
+        if not 1 <= limit <= 1000 or offset < 0:
+            raise HTTPException(status_code=400, detail="limit must be 1-1000 and offset >= 0")
+        rep.ingest_from_scribe(scribe)
+        return {"total": len(rep.scores), "offset": offset, "actors": page(limit, offset, bound)}
+
+    @app.get("/reputation/top")
+    def get_reputation_top(limit: int = 10, offset: int = 0, min_score: Optional[float] = None):
+        return leaderboard(rep.top, limit, offset, min_score)
+
+    @app.get("/reputation/bottom")
+    def get_reputation_bottom(limit: int = 10, offset: int = 0, max_score: Optional[float] = None):
+        return leaderboard(rep.bottom, limit, offset, max_score)
+
+    @app.get("/reputation/percentile")
+    def get_reputation_percentile(p: float):
+        rep.ingest_from_scribe(scribe)
+        try:
+            return {"percentile": p, "score": rep.score_at_percentile(p)}
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @app.get("/reputation/actors/{actor_id}")
+    def get_reputation_actor(actor_id: str):
+        rep.ingest_from_scribe(scribe)
+        rank = rep.rank_of(actor_id)
+        if rank is None:
+            raise HTTPException(status_code=404, detail="actor has no reputation yet")
+        return {"actor_id": actor_id, "score": rep.get_score(actor_id), "rank": rank,
+                "percentile": rep.percentile(actor_id), "total": len(rep.scores)}
+
+
     class Proposal(BaseModel):
         id: str
         action: str
@@ -70,19 +204,123 @@ def create_app():
         return {"status": "enacted", "result": gov.enact(pid)}
 
 
+    # static /gates/... routes go first: /gates/inbox/wait must not match /gates/{gate_id}/wait
     @app.get("/gates/pending")
     def get_pending_gates():
-        pending_gates = [gate for gate in engine.gate_engine.gates.values() if gate['status'] == 'pending']
+        pending_gates = engine.gate_engine.pending_gates()
         return {"pending_gates": pending_gates}
 
 
+    @app.get("/gates/inbox/{approver_id}")
+    def get_gate_inbox(approver_id: str, limit: Optional[int] = None):
+        gates = engine.gate_engine.inbox(approver_id, limit=limit)
+        return {"approver_id": approver_id, "total": engine.gate_engine.inbox_size(approver_id), "gates": gates}
+
+
+    def gate_or_404(gate_id):
+        # sweeps expired gates first; async handlers run it via asyncio.to_thread
+        try:
+            return engine.gate_engine.get_gate_status(gate_id)
+        except GateEngineError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+
+
+    @app.get("/gates/{gate_id}/wait")
+    async def wait_for_gate(gate_id: str, timeout: float = 30.0):
+        # long-poll: answers as soon as the gate leaves 'pending', or with the pending gate after timeout
+        loop = asyncio.get_running_loop()
+        resolved = asyncio.Event()
+        token = engine.gate_engine.subscribe(lambda gate, previous: loop.call_soon_threadsafe(resolved.set),
+                                             gate_id=gate_id)
+        try:
+            gate = await asyncio.to_thread(gate_or_404, gate_id)
+            if gate["status"] == "pending":
+                try:
+                    await asyncio.wait_for(resolved.wait(), min(max(timeout, 0.0), 300.0))
+                except asyncio.TimeoutError:
+                    pass
+                gate = await asyncio.to_thread(gate_or_404, gate_id)
+        finally:
+            engine.gate_engine.unsubscribe(token)
+        return {"status": "pending" if gate["status"] == "pending" else "resolved", "gate": gate}
+
+
+    @app.get("/gates/{gate_id}/events")
+    async def gate_events(gate_id: str, keepalive: float = 15.0):
+        # Server-Sent Events: the current gate, then one event per status change until it resolves
+        loop = asyncio.get_running_loop()
+        changes = asyncio.Queue()
+        token = engine.gate_engine.subscribe(
+            lambda gate, previous: loop.call_soon_threadsafe(changes.put_nowait, gate), gate_id=gate_id)
+        try:
+            gate = await asyncio.to_thread(gate_or_404, gate_id)
+        except HTTPException:
+            engine.gate_engine.unsubscribe(token)
+            raise
+
+        async def stream(gate):
+            try:
+                yield f"event: gate\ndata: {json.dumps(gate, default=str)}\n\n"
+                while gate["status"] == "pending":
+                    try:
+                        gate = await asyncio.wait_for(changes.get(), keepalive)
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"
+                        continue
+                    yield f"event: gate\ndata: {json.dumps(gate, default=str)}\n\n"
+            finally:
+                engine.gate_engine.unsubscribe(token)
+
+        return StreamingResponse(stream(gate), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache"})
+
+
+    class GateDecisionRequest(BaseModel):
+        actor_id: str
+        gate_ids: Optional[list[str]] = None
+        policy_tag: Optional[str] = None
+
+    def decide_many(decide, req):
+        try:
+            results = decide(req.actor_id, gate_ids=req.gate_ids, policy_tag=req.policy_tag)
+        except GateEngineError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        counts = {"applied": 0, "error": 0}
+        for result in results:
+            counts[result["status"]] += 1
+        if counts["error"] == 0:
+            status = "success"
+        elif counts["error"] == len(results):
+            status = "failed"
+        else:
+            status = "partial"
+        return {"status": status, "counts": counts, "results": results}
+
+
+    @app.post("/gates/approve")
+    def approve_gates(req: GateDecisionRequest):
+        return decide_many(engine.gate_engine.approve_many, req)
+
+
+    @app.post("/gates/reject")
+    def reject_gates(req: GateDecisionRequest):
+        return decide_many(engine.gate_engine.reject_many, req)
+
+
     @app.post("/gates/{gate_id}/approve")
     def approve_gate(gate_id: str, approver_id: str):
         try:
             gate = engine.gate_engine.approve_gate(gate_id, approver_id)
-            return {"status": "success", "gate": gate}
         except GateEngineError as e:
             return {"status": "error", "message": str(e)}
+        response = {"status": "success", "gate": gate}
+        execution = engine.auto_execution(gate["mandate_id"])
+        if gate["status"] == "approved" and execution and execution["gate_id"] == gate_id:
+            if execution["status"] == "failed":
+                response["execution_error"] = execution["error"]
+            else:
+                response["execution_id"] = execution["result"]
+        return response
 
 
     @app.post("/gates/{gate_id}/reject")
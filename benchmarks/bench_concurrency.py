@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Throughput of a mixed mandate/gate workload under N concurrent clients, with invariant checks.
+
+Each client creates mandates (half with a shared replay_nonce), executes them, and approves the
+gates of the ones that need approval. After every run the store must hold exactly one mandate
+per nonce, one gate per approval-requiring mandate, and every gate must be approved.
+
+Usage: python -m benchmarks.bench_concurrency [ops_per_client] [backend: memory|sqlite]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sdk.python.e4a_sdk.mandate_engine import MandateEngine, MandateEngineError
+from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
+from sdk.python.e4a_sdk.storage import InMemoryStorage, SQLiteStorage
+
+APPROVERS = ["human-admin", "human-security"]
+
+
+def _mandate(client, i):
+    needs_approval = i % 4 == 0
+    return {
+        "issuer": f"did:ex:issuer-{client}",
+        "beneficiary": "did:ex:bob",
+        "amount": 10.0,
+        "currency": "USD",
+        "replay_nonce": f"nonce-{i}" if i % 2 else None,
+        "fee_distribution": {"protocol": 0.01, "validator": 0.01, "issuer": 0.0},
+        "intent": {"goal": "g", "expected_outcome": "o", "contextual_tone": "formal", "statistical_purpose": "p",
+                   "requires_approval": APPROVERS if needs_approval else []},
+    }
+
+
+def _client(engine, client, ops, barrier):
+    barrier.wait()
+    for i in range(ops):
+        payload = {k: v for k, v in _mandate(client, i).items() if v is not None}
+        m = engine.create_mandate(payload)
+        try:
+            engine.execute_mandate(m["mandate_id"])
+        except MandateEngineError:
+            gate = engine.gate_engine.get_gate_by_mandate_id(m["mandate_id"])
+            for approver in APPROVERS:
+                try:
+                    engine.gate_engine.approve_gate(gate["gate_id"], approver)
+                except Exception:
+                    pass  # another client already resolved this shared-nonce gate
+            engine.execute_mandate(m["mandate_id"])
+
+
+def _check(engine, clients, ops):
+    mandates = list(engine.storage.iter_mandates())
+    nonces = [m.get("replay_nonce") for m in mandates if m.get("replay_nonce")]
+    assert len(nonces) == len(set(nonces)) == ops // 2, "duplicate replay_nonce stored"
+    assert len(mandates) == len(nonces) + clients * (ops - ops // 2)
+    gates = engine.storage.find_gates()
+    by_mandate = [g["mandate_id"] for g in gates]
+    assert len(by_mandate) == len(set(by_mandate)), "two gates for one mandate"
+    assert all(g["status"] == "approved" for g in gates), "unresolved gate"
+    assert len(engine.scribe.ledger) == len(mandates) + clients * ops, "scribe entries lost"
+
+
+def run(clients, ops, backend):
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, "e4a.db")) if backend == "sqlite" else InMemoryStorage()
+        engine = MandateEngine(scribe=ScribeAgent(), storage=storage)
+        barrier = threading.Barrier(clients)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(clients) as pool:
+            for f in [pool.submit(_client, engine, c, ops, barrier) for c in range(clients)]:
+                f.result()
+        elapsed = time.perf_counter() - start
+        _check(engine, clients, ops)
+        storage.close()
+    return clients * ops / elapsed
+
+
+def main(ops=200, backend="memory"):
+    print(f"{backend}: {ops} create+execute(+approve) cycles per client")
+    for clients in (1, 4, 16, 64):
+        print(f"  {clients:3d} clients  {run(clients, ops, backend):10,.0f} cycles/s  invariants ok")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200, sys.argv[2] if len(sys.argv) > 2 else "memory")
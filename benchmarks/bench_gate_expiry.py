@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Cost of GateEngine's expiry scheduler with hundreds of thousands of timers.
+
+Reports gate creation rate with and without a deadline, the idle check that every read
+performs (nothing due), and how fast a sweep expires gates once their deadlines pass.
+
+Usage: python -m benchmarks.bench_gate_expiry [n_gates]
+"""
+import random
+import sys
+import time
+
+from sdk.python.e4a_sdk.gate_engine import GateEngine
+from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
+
+
+class Clock:
+    now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _create(engine, n, expiry):
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for i in range(n):
+        engine.create_gate(f"mandate-{i}", ["human-admin"], {"action": "deploy"},
+                           expires_in_seconds=rng.uniform(60, 3600) if expiry else None)
+    return n / (time.perf_counter() - start)
+
+
+def main(n=200_000):
+    plain = _create(GateEngine(), n, expiry=False)
+    clock = Clock()
+    engine = GateEngine(scribe=ScribeAgent(), clock=clock)
+    timed = _create(engine, n, expiry=True)
+    print(f"{n:,} gates")
+    print(f"  create, no deadline     {plain:12,.0f} gates/s")
+    print(f"  create, with deadline   {timed:12,.0f} gates/s")
+
+    reps = 100_000
+    start = time.perf_counter()
+    for _ in range(reps):
+        engine.expire_due()
+    print(f"  idle expire_due()       {reps / (time.perf_counter() - start):12,.0f} calls/s")
+
+    clock.now += 3600
+    start = time.perf_counter()
+    expired = engine.expire_due()
+    elapsed = time.perf_counter() - start
+    print(f"  sweep                   {len(expired) / elapsed:12,.0f} gates/s ({len(expired):,} expired)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Gate lookups with tens of thousands of open gates: full scans vs GateEngine's indexes.
+
+Usage: python -m benchmarks.bench_gate_index [n_gates] [n_approvers]
+"""
+import random
+import sys
+import time
+
+from sdk.python.e4a_sdk.gate_engine import GateEngine
+
+
+def _rate(fn, args):
+    start = time.perf_counter()
+    for a in args:
+        fn(a)
+    return len(args) / (time.perf_counter() - start)
+
+
+def main(n=50_000, approvers=300):
+    rng = random.Random(7)
+    engine = GateEngine()
+    people = [f"human-{i}" for i in range(approvers)]
+    for i in range(n):
+        engine.create_gate(f"mandate-{i}", rng.sample(people, 2), {"action": "deploy"})
+    mandate_ids = [f"mandate-{rng.randrange(n)}" for _ in range(200)]
+    inbox_of = [rng.choice(people) for _ in range(200)]
+
+    def scan_by_mandate(mid):
+        return engine.storage.find_gates(mandate_id=mid)
+
+    def scan_inbox(who):
+        return [g for g in engine.storage.find_gates(status="pending")
+                if who in g["required_approvers"] and who not in g["approvals"]]
+
+    print(f"{n:,} pending gates, {approvers} approvers (lookups/s)")
+    print(f"{'':22s} {'scan':>10s} {'index':>10s}")
+    print(f"{'gate by mandate_id':22s} {_rate(scan_by_mandate, mandate_ids):10,.0f} "
+          f"{_rate(engine.get_gate_by_mandate_id, mandate_ids):10,.0f}")
+    print(f"{'approver inbox':22s} {_rate(scan_inbox, inbox_of[:20]):10,.0f} "
+          f"{_rate(engine.inbox, inbox_of):10,.0f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
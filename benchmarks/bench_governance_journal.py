@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Vote throughput against a large governance state: rewrite-the-whole-file (previous
+GovernanceKernel behaviour) vs the append-only journal under each fsync policy.
+
+Usage: python -m benchmarks.bench_governance_journal [n_proposals] [n_votes]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+from sdk.python.e4a_sdk.governance_kernel import GovernanceKernel
+from sdk.python.e4a_sdk.reputation_index import ReputationIndex
+
+
+def _populate(g, n):
+    g.register_charter("charter", {"name": "bench"})
+    for i in range(n):
+        g.submit_proposal("charter", f"prop-{i}", {"action": "noop", "description": "x" * 80})
+    g.compact()
+
+
+def _rewrite_vote(path, proposal_id, voter_id, vote):
+    # what every vote used to cost: load the full state, then truncate-and-rewrite it with indent=2
+    with open(path) as fh:
+        state = json.load(fh)
+    state["proposals"][proposal_id]["votes"][voter_id] = vote
+    with open(path, "w") as fh:
+        json.dump(state, fh, indent=2, default=str)
+
+
+def main(n_proposals=5_000, n_votes=500):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "gov.json")
+        g = GovernanceKernel(ReputationIndex(), state_path=path, snapshot_every=None)
+        _populate(g, n_proposals)
+        g.close()
+        size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        for i in range(n_votes // 10):  # it is slow; extrapolate from fewer votes
+            _rewrite_vote(path, f"prop-{i % n_proposals}", f"voter-{i}", "yes")
+        rewrite = (n_votes // 10) / (time.perf_counter() - start)
+
+        print(f"{n_proposals:,} proposals ({size / 1e6:.1f} MB snapshot), votes/s")
+        print(f"  full rewrite (old)      {rewrite:10,.0f}")
+        for policy in ("never", "interval", "always"):
+            g = GovernanceKernel(ReputationIndex(), state_path=path, fsync=policy, snapshot_every=None)
+            start = time.perf_counter()
+            for i in range(n_votes):
+                g.vote(f"prop-{i % n_proposals}", f"voter-{i}", "yes")
+            rate = n_votes / (time.perf_counter() - start)
+            g.close()
+            print(f"  journal, fsync={policy:8s} {rate:10,.0f}")
+
+        start = time.perf_counter()
+        GovernanceKernel(ReputationIndex(), state_path=path)
+        print(f"  cold start (snapshot + {3 * n_votes:,}-op journal) {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Aggregate vote throughput with N processes sharing one governance state (one kernel per
+uvicorn worker). Compares the previous approach made safe with a file lock (load, modify and
+rewrite the whole file per vote) against the locked journal, and checks no vote was lost.
+
+Usage: python -m benchmarks.bench_governance_multiprocess [n_proposals] [votes_per_worker]
+"""
+import fcntl
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from sdk.python.e4a_sdk.governance_kernel import GovernanceKernel
+from sdk.python.e4a_sdk.reputation_index import ReputationIndex
+
+
+def _kernel(path):
+    return GovernanceKernel(ReputationIndex(), state_path=path, fsync="never")
+
+
+def _rewrite_worker(path, worker, n_proposals, votes, start):
+    start.wait()
+    for i in range(votes):
+        with open(f"{path}.lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            with open(path) as fh:
+                state = json.load(fh)
+            state["proposals"][f"prop-{i % n_proposals}"]["votes"][f"voter-{worker}-{i}"] = "yes"
+            with open(path, "w") as fh:
+                json.dump(state, fh, indent=2, default=str)
+
+
+def _journal_worker(path, worker, n_proposals, votes, start):
+    g = _kernel(path)
+    start.wait()
+    for i in range(votes):
+        g.vote(f"prop-{i % n_proposals}", f"voter-{worker}-{i}", "yes")
+    g.close()
+
+
+def _run(target, path, workers, n_proposals, votes):
+    ctx = multiprocessing.get_context("spawn")
+    start = ctx.Event()
+    procs = [ctx.Process(target=target, args=(path, w, n_proposals, votes, start)) for w in range(workers)]
+    for proc in procs:
+        proc.start()
+    time.sleep(1.0)  # let every worker load the state first
+    began = time.perf_counter()
+    start.set()
+    for proc in procs:
+        proc.join()
+    return workers * votes / (time.perf_counter() - began)
+
+
+def main(n_proposals=2_000, votes=300):
+    print(f"{n_proposals:,} proposals, {votes} votes per worker; aggregate votes/s")
+    print("  workers  full rewrite (old)  locked journal")
+    for workers in (1, 2, 4, 8):
+        rates = []
+        for target in (_rewrite_worker, _journal_worker):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "gov.json")
+                g = _kernel(path)
+                g.register_charter("charter", {"name": "bench"})
+                for i in range(n_proposals):
+                    g.submit_proposal("charter", f"prop-{i}", {"action": "noop", "description": "x" * 80})
+                g.compact()
+                g.close()
+                rates.append(_run(target, path, workers, n_proposals, votes))
+                cast = sum(len(p["votes"]) for p in _kernel(path).state["proposals"].values())
+                assert cast == workers * votes, f"lost votes: {workers * votes - cast}"
+        print(f"  {workers:7d}  {rates[0]:18,.0f}  {rates[1]:14,.0f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
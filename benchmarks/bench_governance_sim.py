@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Governance Monte Carlo throughput: replaying each synthetic election through
+GovernanceKernel.vote() + simulate_and_enact() vs GovernanceSimulator's vectorized trials,
+and a full quorum_fraction x threshold sweep.
+
+Usage: python -m benchmarks.bench_governance_sim [trials]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sdk.python.e4a_sdk.governance_kernel import GovernanceKernel
+from sdk.python.e4a_sdk.governance_sim import GovernanceSimulator, quorum_votes
+from sdk.python.e4a_sdk.reputation_index import ReputationIndex
+
+
+def _kernel_trials(trials, voters=200, turnout=0.35, support=0.55):
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        g = GovernanceKernel(ReputationIndex(), state_path=os.path.join(tmp, "gov.json"),
+                             fsync="never", snapshot_every=None)
+        g.register_charter("c", {})
+        enacted = 0
+        for t in range(trials):
+            g.submit_proposal("c", f"p-{t}", {"action": "a"})
+            for v in range(voters):
+                if rng.random() < turnout:
+                    g.vote(f"p-{t}", f"voter-{v}", "yes" if rng.random() < support else "no")
+            enacted += g.simulate_and_enact(f"p-{t}", quorum=quorum_votes(0.2, voters))["status"] == "enacted"
+        g.close()
+    return enacted / trials
+
+
+def main(trials=10_000):
+    sim = GovernanceSimulator()
+    kernel_trials = max(trials // 200, 10)  # far slower; extrapolate
+    start = time.perf_counter()
+    _kernel_trials(kernel_trials)
+    kernel_rate = kernel_trials / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    result = sim.simulate("standard", "default", trials=trials, seed=1)
+    sim_rate = trials / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    sweep = sim.sweep("default", trials=trials, seed=1)
+    sweep_time = time.perf_counter() - start
+    scenarios = len(sweep["quorum_fractions"]) * len(sweep["thresholds"])
+
+    start = time.perf_counter()
+    report = sim.report(trials=trials, seed=1)
+    report_time = time.perf_counter() - start
+
+    print(f"200 voters per election, {trials:,} trials")
+    print(f"  kernel vote() replay      {kernel_rate:12,.0f} trials/s")
+    print(f"  GovernanceSimulator       {sim_rate:12,.0f} trials/s  (P(enact)={result['enact_probability']:.3f})")
+    print(f"  sweep: {scenarios:,} quorum_fraction x threshold settings in {sweep_time:.2f}s")
+    n = sum(len(pops) for pops in report.values())
+    print(f"  report: {n} rule x population pairs in {report_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Live tallies for many open proposals: recomputing every weighted total from the votes
+(one get_score per vote, as simulate_and_enact used to) vs GovernanceKernel's running tallies.
+
+Usage: python -m benchmarks.bench_governance_tally [n_proposals] [votes_per_proposal]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sdk.python.e4a_sdk.governance_kernel import GovernanceKernel
+from sdk.python.e4a_sdk.reputation_index import ReputationIndex
+
+
+def _recompute_all(g):
+    out = {}
+    for pid, prop in g.state["proposals"].items():
+        yes = no = 0.0
+        for voter_id, vote in prop["votes"].items():
+            score = g.reputation_index.get_score(voter_id)
+            if vote.lower() in ("yes", "y", "approve"):
+                yes += score
+            elif vote.lower() in ("no", "n", "reject"):
+                no += score
+        out[pid] = (yes, no)
+    return out
+
+
+def main(n_proposals=5_000, votes=50):
+    rng = random.Random(3)
+    rep = ReputationIndex()
+    voters = [f"voter-{i}" for i in range(2_000)]
+    for v in voters:
+        rep.record_action(v, rng.uniform(-5, 5))
+    with tempfile.TemporaryDirectory() as tmp:
+        g = GovernanceKernel(rep, state_path=os.path.join(tmp, "gov.json"), fsync="never", snapshot_every=None)
+        g.register_charter("c", {})
+        start = time.perf_counter()
+        for p in range(n_proposals):
+            g.submit_proposal("c", f"p-{p}", {"action": "a"})
+            for v in rng.sample(voters, votes):
+                g.vote(f"p-{p}", v, rng.choice(("yes", "no")))
+        vote_rate = n_proposals * votes / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        _recompute_all(g)
+        recompute = time.perf_counter() - start
+        start = time.perf_counter()
+        g.tallies()
+        live = time.perf_counter() - start
+        start = time.perf_counter()
+        for v in voters[:200]:
+            rep.record_action(v, 1.0)
+        rep_update = (time.perf_counter() - start) / 200
+
+        print(f"{n_proposals:,} open proposals x {votes} votes ({vote_rate:,.0f} votes/s journaled)")
+        print(f"  all tallies, recomputed   {recompute * 1e3:8.1f} ms")
+        print(f"  all tallies, running      {live * 1e3:8.1f} ms")
+        adjusted = n_proposals * votes // len(voters)
+        print(f"  one reputation change     {rep_update * 1e6:8.1f} us (adjusts ~{adjusted} tallies)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
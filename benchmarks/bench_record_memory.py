@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Bytes per stored mandate (and per gate): plain dict storage vs compact slotted records.
+
+Usage: python -m benchmarks.bench_record_memory [n_mandates]
+"""
+import gc
+import json
+import sys
+import tracemalloc
+
+from sdk.python.e4a_sdk.gate_engine import GateEngine
+from sdk.python.e4a_sdk.storage import InMemoryStorage
+
+TONES = ["formal", "neutral", "urgent", "collaborative"]
+
+
+def _mandate(i):
+    # round-trip through JSON so every string is a fresh object, as it would be off the wire
+    return json.loads(json.dumps({
+        "mandate_id": f"mandate-{i:08d}",
+        "issuer": f"did:ex:issuer-{i % 2000}",
+        "beneficiary": f"did:ex:beneficiary-{i % 10000}",
+        "amount": float(i % 5000) + 0.25,
+        "currency": "USD" if i % 4 else "EUR",
+        "created_at": "2025-11-09T12:00:00.000000Z",
+        "fee_distribution": {"protocol": 0.01, "validator": 0.01, "issuer": 0.0},
+        "intent": {
+            "goal": "transfer funds",
+            "expected_outcome": "funds transferred",
+            "contextual_tone": TONES[i % 4],
+            "statistical_purpose": "facilitate transaction",
+            "requires_approval": ["human-admin"] if i % 10 == 0 else [],
+        },
+    }))
+
+
+def _measure(compact, n):
+    gc.collect()
+    tracemalloc.start()
+    storage = InMemoryStorage(compact=compact)
+    mandates = storage.mandates
+    for i in range(n):
+        mandates[f"mandate-{i:08d}"] = _mandate(i)
+    after_mandates = tracemalloc.get_traced_memory()[0]
+
+    resolver = mandates.get if compact else None
+    gates = GateEngine(storage=storage, mandate_resolver=resolver)
+    n_gates = n // 10
+    for i in range(0, n, 10):
+        gates.create_gate(f"mandate-{i:08d}", ["human-admin"], mandates[f"mandate-{i:08d}"])
+    after_gates = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after_mandates / n, (after_gates - after_mandates) / max(n_gates, 1)
+
+
+def main(n=100_000):
+    print(f"{n:,} mandates, {n // 10:,} gates")
+    dict_m, dict_g = _measure(False, n)
+    rec_m, rec_g = _measure(True, n)
+    print(f"{'':18s} {'bytes/mandate':>14s} {'bytes/gate':>12s}")
+    print(f"{'plain dicts':18s} {dict_m:14,.0f} {dict_g:12,.0f}")
+    print(f"{'slotted records':18s} {rec_m:14,.0f} {rec_g:12,.0f}")
+    print(f"{'reduction':18s} {dict_m / rec_m:13.1f}x {dict_g / rec_g:11.1f}x")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+A day's worth of reputation events: ReputationIndex.ingest_event() per event vs one
+ingest_events() batch (NumPy rounds), checking both produce identical scores.
+
+Usage: python -m benchmarks.bench_reputation_batch [events] [actors]
+"""
+import random
+import sys
+import time
+
+from sdk.python.e4a_sdk.reputation_index import ReputationIndex
+
+EVENT_TYPES = ["positive_behavior", "negative_behavior", "infraction", "mandate_executed", "heartbeat"]
+
+
+def _events(events, actors):
+    rng = random.Random(11)
+    # skewed activity: a few busy actors produce most events, as gateways and schedulers do
+    ids = [f"did:ex:agent-{min(int(rng.paretovariate(1.2)) - 1, actors - 1)}" if i % 2 else
+           f"did:ex:agent-{rng.randrange(actors)}" for i in range(events)]
+    types = [rng.choice(EVENT_TYPES) for _ in range(events)]
+    weights = [rng.uniform(0.1, 2.0) for _ in range(events)]
+    return ids, types, weights
+
+
+def main(events=1_000_000, actors=10_000):
+    ids, types, weights = _events(events, actors)
+
+    def clock():
+        return 1_700_000_000.0  # one instant, so both paths stamp events alike
+
+    sequential = ReputationIndex(clock=clock)
+    start = time.perf_counter()
+    for a, t, w in zip(ids, types, weights):
+        sequential.ingest_event(a, t, w)
+    loop = time.perf_counter() - start
+
+    batched = ReputationIndex(clock=clock)
+    start = time.perf_counter()
+    batched.ingest_events(ids, types, weights)
+    batch = time.perf_counter() - start
+    assert batched.scores == sequential.scores
+
+    busiest = max(batched.history.values(), key=lambda h: h.total).total
+    print(f"{events:,} events over {len(batched.scores):,} actors (busiest: {busiest:,} events)")
+    print(f"  ingest_event() loop   {loop:8.2f}s  {events / loop:12,.0f} events/s")
+    print(f"  ingest_events() batch {batch:8.2f}s  {events / batch:12,.0f} events/s  ({loop / batch:.1f}x, "
+          f"identical scores)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Time-decayed reputation over N actors: lazy decay (ReputationIndex(half_life=...), applied when a
+score is read or updated) vs the alternative of a periodic sweep rewriting every score (in memory,
+and in a ReputationStore, where the sweep also rewrites every row), plus the
+cost of a scores_as_of() audit over all actors.
+
+Usage: python -m benchmarks.bench_reputation_decay [actors]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sdk.python.e4a_sdk.reputation_index import ReputationIndex
+from sdk.python.e4a_sdk.reputation_store import ReputationStore
+
+HALF_LIFE = 30 * 86400
+SWEEP_EVERY = 3600
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _sweep(scores, elapsed):
+    factor = 0.5 ** (elapsed / HALF_LIFE)
+    for actor, score in scores.items():
+        scores[actor] = 0.5 + (score - 0.5) * factor
+
+
+def main(actors=1_000_000):
+    clock = _Clock()
+    rep = ReputationIndex(half_life=HALF_LIFE, history_size=4, hourly_buckets=0, daily_buckets=0, clock=clock)
+    start = time.perf_counter()
+    for i in range(actors):
+        rep.record_action(f"did:ex:agent-{i}", 1.0 if i % 2 else -1.0)
+    populate = time.perf_counter() - start
+    clock.now += 7 * 86400
+
+    reads = 100_000
+    start = time.perf_counter()
+    for i in range(reads):
+        rep.get_score(f"did:ex:agent-{i * 7 % actors}")
+    lazy_read = (time.perf_counter() - start) / reads
+
+    scores = dict(rep.scores)
+    start = time.perf_counter()
+    _sweep(scores, SWEEP_EVERY)
+    sweep = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ReputationStore(os.path.join(tmp, "reputation.db"))
+        with store._lock:
+            store._conn.execute("BEGIN")
+            store._conn.executemany("INSERT INTO reputation VALUES (?, ?, NULL, 1, ?, NULL)",
+                                    ((actor, score, clock.now) for actor, score in scores.items()))
+            store._conn.execute("COMMIT")
+            start = time.perf_counter()
+            store._conn.execute("BEGIN IMMEDIATE")
+            store._conn.executemany("UPDATE reputation SET score = ?, updated_at = ? WHERE actor_id = ?",
+                                    ((score, clock.now, actor) for actor, score in scores.items()))
+            store._conn.execute("COMMIT")
+            store_sweep = time.perf_counter() - start
+        store.close()
+
+    start = time.perf_counter()
+    audit = rep.scores_as_of(clock.now)
+    audit_time = time.perf_counter() - start
+    assert len(audit) == actors
+
+    print(f"{actors:,} actors, half-life {HALF_LIFE // 86400} days (populated in {populate:.1f}s)")
+    print(f"  lazy decay: get_score()                 {lazy_read * 1e6:8.2f}us per read, 0 background work")
+    print(f"  periodic sweep of every score           {sweep:8.2f}s every {SWEEP_EVERY}s "
+          f"({sweep / SWEEP_EVERY * 100:.3f}% of a core, stale between sweeps)")
+    print(f"  periodic sweep rewriting the store      {store_sweep:8.2f}s every {SWEEP_EVERY}s (write lock held)")
+    print(f"  scores_as_of(now) audit, all actors     {audit_time:8.2f}s")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Memory footprint and get_all() cost of 1M reputation events: one dict per event (previous
+ReputationIndex.history) vs array-backed history, unbounded and with the default retention
+(1,000 raw events per actor plus hourly / daily aggregates).
+
+Usage: python -m benchmarks.bench_reputation_history [events] [actors]
+"""
+import sys
+import time
+import tracemalloc
+
+from sdk.python.e4a_sdk.reputation_index import ReputationIndex
+
+CONTEXTS = ["Mandate executed successfully", "Infraction detected", "Event: positive_behavior"]
+
+
+class _DictHistory(ReputationIndex):
+    """The previous storage: a list of dicts per actor, never trimmed."""
+
+    def record_action(self, actor_id, delta, context=""):
+        current = self.scores.get(actor_id, 0.5)
+        normalized = max(0.0, min(1.0, current + delta * 0.1))
+        self.scores[actor_id] = normalized
+        self.history.setdefault(actor_id, []).append({"delta": delta, "context": context, "new_score": normalized})
+        return normalized
+
+    def get_all(self):
+        return {"scores": dict(self.scores), "history": {a: list(e) for a, e in self.history.items()}}
+
+
+def _measure(make, events, actors):
+    clock = iter(range(1_700_000_000, 1_700_000_000 + events * 10, 10))
+    tracemalloc.start()
+    rep = make(lambda: next(clock))
+    for i in range(events):
+        # contexts are built per call, as ingest_from_scribe / the API produce them
+        rep.record_action(f"actor-{i % actors}", 0.5 if i % 3 else -1.0, "".join(CONTEXTS[i % 3]))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    start = time.perf_counter()
+    snapshot = rep.get_all()
+    elapsed = time.perf_counter() - start
+    returned = sum(len(h) for h in snapshot["history"].values())
+    return size, elapsed, returned
+
+
+def main(events=1_000_000, actors=1):
+    print(f"{events:,} events over {actors:,} actor(s)")
+    print("  storage                          memory     bytes/event   get_all()   events returned")
+    for name, make in (
+        ("dict per event (old)", lambda clock: _DictHistory()),
+        ("arrays, unbounded", lambda clock: ReputationIndex(history_size=None, clock=clock)),
+        ("arrays, 1,000 raw + aggregates", lambda clock: ReputationIndex(clock=clock)),
+    ):
+        size, elapsed, returned = _measure(make, events, actors)
+        print(f"  {name:30s} {size / 1e6:8.2f} MB  {size / events:10.1f}   {elapsed:8.3f}s   {returned:,}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Cost of one /reputation request as the scribe ledger grows: rescanning the whole ledger
+(previous ingest_from_scribe) vs the per-scribe cursor, with a few new entries per request.
+
+Usage: python -m benchmarks.bench_reputation_ingest [new_entries_per_request]
+"""
+import sys
+import time
+
+from sdk.python.e4a_sdk.reputation_index import ReputationIndex
+from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
+
+
+def _entry(i):
+    if i % 3 == 0:
+        return {"entry_type": "mandate_executed", "mandate_id": f"m-{i}", "executor": f"node-{i % 50}"}
+    return {"entry_type": "mandate_created", "mandate_id": f"m-{i}"}
+
+
+def _rescan(rep, scribe):
+    # what every request used to cost: match every entry of the ledger again
+    for entry in scribe.ledger:
+        event_type = entry.get("event", entry["entry_type"].replace("_", " "))
+        if "mandate executed" in event_type.lower():
+            rep.record_action(entry.get("executor", "api-node"), 1.0, "Mandate executed successfully")
+
+
+def main(new_per_request=10):
+    print(f"ms per request, {new_per_request} new entries per request")
+    print("  ledger size   full rescan (old)   cursor")
+    for size in (1_000, 10_000, 100_000, 1_000_000):
+        scribe = ScribeAgent()
+        scribe.append_entries([_entry(i) for i in range(size)])
+        cursor = ReputationIndex()
+        cursor.ingest_from_scribe(scribe)
+        requests = 20
+        rescan_requests = max(1, min(requests, 200_000 // size))
+        rescan_time = cursor_time = 0.0
+        for r in range(requests):
+            scribe.append_entries([_entry(size + r * new_per_request + k) for k in range(new_per_request)])
+            if r < rescan_requests:
+                start = time.perf_counter()
+                _rescan(ReputationIndex(), scribe)
+                rescan_time += time.perf_counter() - start
+            start = time.perf_counter()
+            cursor.ingest_from_scribe(scribe)
+            cursor_time += time.perf_counter() - start
+        print(f"  {size:11,d}   {rescan_time / rescan_requests * 1e3:17.2f}   {cursor_time / requests * 1e3:6.3f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
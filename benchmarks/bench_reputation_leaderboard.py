@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Leaderboard queries over N scored actors: ReputationIndex.top() / rank_of() /
+score_at_percentile() on the maintained order vs computing the same answers from the full
+score dict (what a /reputation client had to do), and the cost the order adds to
+record_action().
+
+Usage: python -m benchmarks.bench_reputation_leaderboard [actors]
+"""
+import heapq
+import random
+import sys
+import time
+
+from sdk.python.e4a_sdk.reputation_index import ReputationIndex
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _per_call(fn, calls):
+    start = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - start) / calls
+
+
+def main(actors=1_000_000):
+    rng = random.Random(1)
+    clock = _Clock()
+    start = time.perf_counter()
+    rep = ReputationIndex(half_life=30 * 86400, history_size=1, hourly_buckets=0, daily_buckets=0, clock=clock)
+    for i in range(actors):
+        clock.now += 1
+        rep.record_action(f"did:ex:agent-{i}", rng.uniform(-5, 5))
+    populate = time.perf_counter() - start
+    clock.now += 86400
+    ids = list(rep.scores)
+
+    top = _per_call(lambda i: rep.top(10, offset=i % 1000), 1000)
+    rank = _per_call(lambda i: rep.rank_of(ids[i * 7919 % actors]), 10_000)
+    pct = _per_call(lambda i: rep.score_at_percentile(i % 100), 1000)
+
+    now = clock()
+    start = time.perf_counter()
+    current = {a: rep._decay(a, s, rep.updated[a], now) for a, s in rep.scores.items()}
+    heapq.nlargest(10, current.items(), key=lambda pair: pair[1])
+    scan_top = time.perf_counter() - start
+    start = time.perf_counter()
+    sorted(current.values())
+    scan_sort = time.perf_counter() - start
+
+    update = _per_call(lambda i: rep.record_action(ids[i * 7919 % actors], 0.5), 100_000)
+    rep._rank = rep._unrank = lambda actor_id: None  # last: the same index without the order
+    plain_update = _per_call(lambda i: rep.record_action(ids[i * 7919 % actors], 0.5), 100_000)
+
+    print(f"{actors:,} actors with decaying scores (populated in {populate:.1f}s)")
+    print(f"  top(10, offset)             {top * 1e6:10.1f}us")
+    print(f"  rank_of(actor)              {rank * 1e6:10.1f}us")
+    print(f"  score_at_percentile(p)      {pct * 1e6:10.1f}us")
+    print(f"  full scan: decay + top 10   {scan_top * 1e3:10.1f}ms   (+ sort for ranks/percentiles "
+          f"{scan_sort * 1e3:.0f}ms)")
+    print(f"  record_action with order    {update * 1e6:10.1f}us   (without: {plain_update * 1e6:.1f}us)")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
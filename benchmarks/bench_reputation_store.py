@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+ReputationIndex startup with N actors: warm start from a ReputationStore vs rebuilding the
+scores by replaying a mission log through ingest_from_scribe, plus checkpoint cost.
+
+Usage: python -m benchmarks.bench_reputation_store [actors]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sdk.python.e4a_sdk.reputation_history import ActorHistory
+from sdk.python.e4a_sdk.reputation_index import ReputationIndex
+from sdk.python.e4a_sdk.reputation_store import ReputationStore
+from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
+
+EVENTS_PER_ACTOR = 3
+
+
+def _populate(path, actors):
+    history = ActorHistory()
+    for i in range(EVENTS_PER_ACTOR):
+        history.append(1_700_000_000 + i * 60, 1.0, 0.5 + 0.1 * (i + 1), 1)
+    blob = history.dump()
+    store = ReputationStore(path)
+    store.context_id("Mandate executed successfully")
+    with store._lock:
+        store._conn.execute("BEGIN")
+        store._conn.executemany("INSERT INTO reputation VALUES (?, ?, ?, 1, ?, NULL)",
+                                ((f"did:ex:agent-{i}", 0.8, blob, 1_700_000_120.0) for i in range(actors)))
+        store._conn.execute("INSERT INTO meta VALUES ('version', 1)")
+        store._conn.execute("COMMIT")
+    store.close()
+
+
+def main(actors=1_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "reputation.db")
+        _populate(path, actors)
+        print(f"{actors:,} actors, {EVENTS_PER_ACTOR} events each ({os.path.getsize(path) / 1e6:.0f} MB store)")
+
+        start = time.perf_counter()
+        rep = ReputationIndex(store=path)
+        warm = time.perf_counter() - start
+        assert len(rep.scores) == actors
+        start = time.perf_counter()
+        rep.history_of("did:ex:agent-7")
+        first_history = time.perf_counter() - start
+
+        scribe = ScribeAgent()
+        scribe.append_entries([{"entry_type": "mandate_executed", "executor": f"did:ex:agent-{i % actors}"}
+                               for i in range(actors * EVENTS_PER_ACTOR)])
+        start = time.perf_counter()
+        ReputationIndex().ingest_from_scribe(scribe)
+        replay = time.perf_counter() - start
+
+        for i in range(100_000):
+            rep.record_action(f"did:ex:agent-{i % 10_000}", 0.1, "Mandate executed successfully")
+        start = time.perf_counter()
+        written = rep.checkpoint()
+        checkpoint = time.perf_counter() - start
+        rep.close()
+
+        print(f"  warm start from store            {warm:8.2f}s")
+        print(f"  first history_of() (lazy load)   {first_history * 1e3:8.2f}ms")
+        print(f"  replay {actors * EVENTS_PER_ACTOR:,}-entry mission log   {replay:8.2f}s")
+        print(f"  checkpoint 100,000 actions / {written:,} actors  {checkpoint:6.2f}s")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
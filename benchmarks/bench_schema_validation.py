@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Validations per second: per-call schema load (previous behaviour) vs the shared
+compiled validator from schema_registry.
+
+Usage: python -m benchmarks.bench_schema_validation [iterations]
+"""
+import json
+import sys
+import time
+
+from jsonschema import validate
+
+from sdk.python.e4a_sdk import schema_registry
+
+SAMPLE = {
+    "mandate_id": "bench-1",
+    "issuer": "did:ex:alice",
+    "beneficiary": "did:ex:bob",
+    "amount": 50.0,
+    "currency": "USD",
+    "fee_distribution": {"protocol": 0.02, "validator": 0.01, "issuer": 0},
+    "intent": {
+        "goal": "benchmark validation",
+        "expected_outcome": "numbers",
+        "contextual_tone": "neutral",
+        "statistical_purpose": "measure throughput",
+    },
+}
+
+
+def _reload_and_validate(path):
+    # What MandateEngine.__init__ / E4A_A2A_Adapter._validate did: read + parse + validate.
+    with open(path, "r") as fh:
+        schema = json.load(fh)
+    validate(instance=SAMPLE, schema=schema)
+
+
+def _uncompiled(schema):
+    # Schema already parsed, but jsonschema.validate() re-checks and rebuilds the validator per call.
+    validate(instance=SAMPLE, schema=schema)
+
+
+def _registry():
+    schema_registry.validate(SAMPLE, "mandate_v2.json")
+
+
+def _rate(fn, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def main(iterations=5000):
+    path = f"{schema_registry.SPEC_DIR}/mandate_v2.json"
+    schema = schema_registry.get_schema("mandate_v2.json")
+    rows = [
+        ("reload from disk + validate", _rate(lambda: _reload_and_validate(path), iterations)),
+        ("jsonschema.validate (parsed)", _rate(lambda: _uncompiled(schema), iterations)),
+        ("schema_registry (compiled)", _rate(_registry, iterations)),
+    ]
+    base = rows[0][1]
+    for label, rate in rows:
+        print(f"{label:32s} {rate:12,.0f} validations/s  ({rate / base:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
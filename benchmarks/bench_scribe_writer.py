@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+ScribeAgent log throughput (entries/s) for each flush policy, against the previous writer that
+opened, appended to and closed log_path for every entry. The durable rows fsync: per entry
+(flush_policy='entry', fsync=True), per batch, and commit() after every entry from 8 threads,
+where concurrent commits share fsyncs.
+
+Usage: python -m benchmarks.bench_scribe_writer [entries]
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
+
+
+class _OpenPerEntry(ScribeAgent):
+    """The previous writer: open / append / close per entry."""
+
+    def _write(self, entries):
+        lines = "".join(json.dumps(entry) + "\n" for entry in entries)
+        with self._lock:
+            self.ledger.extend(entries)
+            with open(self.log_path, "a") as f:
+                f.write(lines)
+
+
+def _run(make, entries, threads=1, commit=False):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "ledger.jsonl")
+        scribe = make(path)
+
+        def work(worker):
+            for n in range(entries // threads):
+                scribe.append_entry({"entry_type": "event", "worker": worker, "n": n})
+                if commit:
+                    scribe.commit()
+
+        start = time.perf_counter()
+        if threads == 1:
+            work(0)
+        else:
+            pool = [threading.Thread(target=work, args=(w,)) for w in range(threads)]
+            for t in pool:
+                t.start()
+            for t in pool:
+                t.join()
+        scribe.close()
+        elapsed = time.perf_counter() - start
+        with open(path) as f:
+            assert sum(1 for _ in f) == entries // threads * threads
+    return entries / elapsed
+
+
+def main(entries=100_000):
+    durable = max(entries // 20, 800)
+    rows = [
+        ("open/append/close per entry (old)", lambda p: _OpenPerEntry(log_path=p), entries, {}),
+        ("entry", lambda p: ScribeAgent(log_path=p), entries, {}),
+        ("batch (256 entries / 50ms)", lambda p: ScribeAgent(log_path=p, flush_policy="batch"), entries, {}),
+        ("entry + fsync", lambda p: ScribeAgent(log_path=p, fsync=True), durable, {}),
+        ("batch + fsync", lambda p: ScribeAgent(log_path=p, flush_policy="batch", fsync=True), entries, {}),
+        ("entry + fsync, 8 threads", lambda p: ScribeAgent(log_path=p, fsync=True), durable, {"threads": 8}),
+        ("batch + commit() per entry, 8 threads", lambda p: ScribeAgent(log_path=p, flush_policy="batch"),
+         durable, {"threads": 8, "commit": True}),
+    ]
+    print("  policy                                   entries/s")
+    for name, make, count, kw in rows:
+        print(f"  {name:40s} {_run(make, count, **kw):10,.0f}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:2]))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+End-of-day fee settlement: per-mandate process_fees() loop vs MandateEngine.settle_fees().
+
+Usage: python -m benchmarks.bench_settlement [n_mandates]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from sdk.python.e4a_sdk.mandate_engine import MandateEngine
+from sdk.python.e4a_sdk.storage import SQLiteStorage
+
+
+def _populate(engine, n):
+    rnd = random.Random(7)
+    currencies = ["USD", "EUR", "JPY"]
+    with engine.storage.transaction():
+        _fill(engine, n, rnd, currencies)
+
+
+def _fill(engine, n, rnd, currencies):
+    for i in range(n):
+        mid = f"m-{i}"
+        engine.mandates[mid] = {
+            "mandate_id": mid,
+            "issuer": f"did:ex:issuer-{i % 1000}",
+            "beneficiary": f"did:ex:beneficiary-{i % 5000}",
+            "amount": round(rnd.uniform(1, 10_000), 2),
+            "currency": currencies[i % 3],
+            "fee_distribution": {"protocol": 0.01, "validator": 0.005, "issuer": 0.002},
+        }
+
+
+def _loop(engine):
+    totals = {}
+    for mid in list(engine.mandates):
+        mandate = engine.mandates[mid]
+        split = engine.process_fees(mid)
+        bucket = totals.setdefault(mandate["currency"], [0.0, 0.0, 0.0])
+        bucket[0] += split["protocol_amount"]
+        bucket[1] += split["validator_amount"]
+        bucket[2] += split["issuer_amount"]
+    return totals
+
+
+def _time(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def _run(label, engine, n):
+    print(f"-- {label}: {n:,} mandates")
+    _populate(engine, n)
+    rows = [
+        ("process_fees loop (float)", _time(lambda: _loop(engine))),
+        ("settle_fees (python ints)", _time(lambda: engine.settle_fees(use_numpy=False))),
+    ]
+    try:
+        rows.append(("settle_fees (numpy int64)", _time(lambda: engine.settle_fees(use_numpy=True))))
+    except RuntimeError:
+        print("numpy not installed; skipping vectorized run")
+    base = rows[0][1]
+    for label, secs in rows:
+        print(f"{label:28s} {secs:8.3f}s  {n / secs:12,.0f} mandates/s  ({base / secs:5.1f}x)")
+
+
+def main(n=1_000_000):
+    _run("in-memory storage", MandateEngine(), n)
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, "bench.db"))
+        _run("sqlite storage", MandateEngine(storage=storage), max(n // 10, 1))
+        storage.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+TrustGraph power iteration on a synthetic mandate graph: cold convergence, then incremental
+re-convergence after a batch of new mandates (warm start from the previous trust vector).
+
+Usage: python -m benchmarks.bench_trust_graph [actors] [edges]
+"""
+import sys
+import time
+
+import numpy as np
+
+from sdk.python.e4a_sdk.trust_graph import TrustGraph
+
+
+def _edges(rng, actors, edges):
+    # preferential attachment-like: beneficiaries skewed towards a few popular actors
+    src = rng.integers(0, actors, edges)
+    dst = np.minimum((rng.pareto(1.5, edges) * actors / 50).astype(np.int64), actors - 1)
+    return src, dst
+
+
+def main(actors=1_000_000, edges=5_000_000):
+    rng = np.random.default_rng(7)
+    names = [f"did:ex:agent-{i}" for i in range(actors)]
+    src, dst = _edges(rng, actors, edges)
+    graph = TrustGraph()
+
+    start = time.perf_counter()
+    graph.add_edges((names[i] for i in src.tolist()), (names[i] for i in dst.tolist()))
+    load = time.perf_counter() - start
+    start = time.perf_counter()
+    cold_steps = graph.converge()
+    cold = time.perf_counter() - start
+
+    src, dst = _edges(rng, actors, 10_000)
+    graph.add_edges((names[i] for i in src.tolist()), (names[i] for i in dst.tolist()))
+    start = time.perf_counter()
+    warm_steps = graph.converge()
+    warm = time.perf_counter() - start
+
+    print(f"{len(graph):,} actors, {graph.edges:,} mandate edges (loaded in {load:.1f}s)")
+    per_step = cold / cold_steps * 1e3
+    print(f"  cold converge                 {cold:7.2f}s  {cold_steps:4d} steps  ({per_step:.0f}ms/step)")
+    print(f"  +10,000 mandates, warm start  {warm:7.2f}s  {warm_steps:4d} steps")
+    print(f"  most trusted: {graph.top(1)[0]['actor_id']}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
@@ -6,12 +6,24 @@ __all__ = [
     'Config',
     'GateEngine',
     'GateEngineError',
+    'GateRecord',
     'GovernanceKernel',
+    'GovernanceSimulator',
     'MandateEngine',
     'MandateEngineError',
+    'MandateRecord',
+    'NonceIndex',
     'ReputationIndex',
+    'ReputationStore',
+    'TrustGraph',
     'ScribeAgent',
+    'InMemoryStorage',
+    'SQLiteStorage',
+    'StorageError',
+    'open_storage',
     'ValidatorRuntime',
+    'ExecutionPipeline',
+    'ExecutionQueueFull',
     'E4AClient',
     'E4AError'
 ]
@@ -19,8 +31,15 @@ __all__ = [
 from .config_loader import Config
 from .gate_engine import GateEngine, GateEngineError
 from .governance_kernel import GovernanceKernel
+from .governance_sim import GovernanceSimulator
 from .mandate_engine import MandateEngine, MandateEngineError
+from .nonce_index import NonceIndex
+from .records import GateRecord, MandateRecord
 from .reputation_index import ReputationIndex
+from .reputation_store import ReputationStore
 from .scribe_agent import ScribeAgent
+from .trust_graph import TrustGraph
+from .storage import InMemoryStorage, SQLiteStorage, StorageError, open_storage
 from .validator_runtime import ValidatorRuntime
+from .execution_pipeline import ExecutionPipeline, ExecutionQueueFull
 from .client import E4AClient, E4AError
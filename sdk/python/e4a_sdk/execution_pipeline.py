@@ -0,0 +1,222 @@
+"""
+Asynchronous mandate execution pipeline.
+
+Executions are queued per rail (e.g. 'eth', 'midnight', 'ap2') and drained by
+a fixed pool of asyncio workers per rail, so each rail has its own concurrency
+cap. Each rail queue is bounded: when it is full, submit() raises
+ExecutionQueueFull (backpressure) instead of queueing without limit.
+
+The pipeline owns an event loop running in a background thread, so it can be
+used from synchronous code (FastAPI sync endpoints, CLI). Blocking rail
+handlers run in a per-rail thread pool sized to the rail's limit, so a slow
+rail cannot starve the others; coroutine handlers are awaited directly.
+"""
+import asyncio
+import inspect
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, UTC
+
+
+class ExecutionPipelineError(Exception):
+    pass
+
+
+class ExecutionQueueFull(ExecutionPipelineError):
+    pass
+
+
+def _now():
+    return datetime.now(UTC).isoformat().replace('+00:00', 'Z')
+
+
+class ExecutionHandle:
+    """Status of one queued execution; wait on `future` or poll `status`."""
+
+    def __init__(self, execution_id, mandate_id, rail, executor_id):
+        self.execution_id = execution_id
+        self.mandate_id = mandate_id
+        self.rail = rail
+        self.executor_id = executor_id
+        self.status = 'queued'
+        self.result = None
+        self.error = None
+        self.submitted_at = _now()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+
+    def to_dict(self):
+        return {
+            'execution_id': self.execution_id,
+            'mandate_id': self.mandate_id,
+            'rail': self.rail,
+            'executor': self.executor_id,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+        }
+
+
+class ExecutionPipeline:
+    """
+    Args:
+        engine: MandateEngine used for the default handler (engine.execute_mandate).
+        rail_limits: rail name -> number of concurrent workers for that rail.
+        default_limit: worker count for rails not listed in rail_limits.
+        max_queue: maximum queued (not yet running) executions per rail.
+        handlers: rail name -> callable(mandate_id, executor_id) performing the execution,
+            sync or async. Rails without a handler use engine.execute_mandate.
+        max_retained: finished handles kept for status lookups (oldest dropped first).
+    """
+
+    def __init__(self, engine, rail_limits=None, default_limit=4, max_queue=1000, handlers=None,
+                 max_retained=10000):
+        self.engine = engine
+        self.rail_limits = dict(rail_limits or {})
+        self.default_limit = default_limit
+        self.max_queue = max_queue
+        self.handlers = dict(handlers or {})
+        self.max_retained = max_retained
+        self.executions = {}
+        self._finished = deque()
+        self._queues = {}
+        self._workers = {}
+        self._pools = {}
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # -- lifecycle -------------------------------------------------------
+    def start(self):
+        with self._lock:
+            if self._loop is not None:
+                return self
+            self._loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            self._thread = threading.Thread(target=self._run_loop, args=(ready,), name='e4a-exec-loop', daemon=True)
+            self._thread.start()
+            ready.wait()
+        return self
+
+    def _run_loop(self, ready):
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(ready.set)
+        self._loop.run_forever()
+
+    def stop(self, wait=True):
+        """Stop accepting work; with wait=True, let queued executions finish first."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if wait:
+            asyncio.run_coroutine_threadsafe(self._drain(), loop).result()
+        asyncio.run_coroutine_threadsafe(self._cancel_workers(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+        for pool in self._pools.values():
+            pool.shutdown(wait=wait)
+        self._queues.clear()
+        self._workers.clear()
+        self._pools.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    async def _drain(self):
+        for queue in list(self._queues.values()):
+            await queue.join()
+
+    async def _cancel_workers(self):
+        tasks = [t for workers in self._workers.values() for t in workers]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # -- submission ------------------------------------------------------
+    def submit(self, mandate_id, rail='default', executor_id='system') -> ExecutionHandle:
+        """Queue an execution and return its handle immediately."""
+        if self._loop is None:
+            self.start()
+        handle = ExecutionHandle(f'exec-{uuid.uuid4()}', mandate_id, rail, executor_id)
+        self.executions[handle.execution_id] = handle
+        try:
+            # raises ExecutionQueueFull when the rail is saturated
+            asyncio.run_coroutine_threadsafe(self._enqueue(handle), self._loop).result()
+        except ExecutionQueueFull:
+            self.executions.pop(handle.execution_id, None)
+            raise
+        return handle
+
+    def get(self, execution_id) -> ExecutionHandle:
+        handle = self.executions.get(execution_id)
+        if handle is None:
+            raise ExecutionPipelineError('Execution not found')
+        return handle
+
+    def queue_depths(self):
+        return {rail: q.qsize() for rail, q in self._queues.items()}
+
+    async def _enqueue(self, handle):
+        queue = self._queues.get(handle.rail)
+        if queue is None:
+            queue = self._queues[handle.rail] = asyncio.Queue(maxsize=self.max_queue)
+            limit = self.rail_limits.get(handle.rail, self.default_limit)
+            self._pools[handle.rail] = ThreadPoolExecutor(max_workers=limit,
+                                                          thread_name_prefix=f'e4a-exec-{handle.rail}')
+            self._workers[handle.rail] = [
+                asyncio.ensure_future(self._worker(queue)) for _ in range(limit)
+            ]
+        handle.future = asyncio.get_running_loop().create_future()
+        try:
+            queue.put_nowait(handle)
+        except asyncio.QueueFull:
+            raise ExecutionQueueFull(f"Rail '{handle.rail}' queue is full ({self.max_queue} pending)")
+
+    async def _worker(self, queue):
+        while True:
+            handle = await queue.get()
+            try:
+                await self._execute(handle)
+            finally:
+                queue.task_done()
+
+    async def _execute(self, handle):
+        handler = self.handlers.get(handle.rail, self.engine.execute_mandate)
+        handle.status = 'running'
+        handle.started_at = _now()
+        try:
+            if inspect.iscoroutinefunction(handler):
+                result = await handler(handle.mandate_id, handle.executor_id)
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._pools[handle.rail], handler, handle.mandate_id, handle.executor_id)
+            handle.result, handle.status = result, 'executed'
+        except Exception as e:
+            handle.error, handle.status = str(e), 'failed'
+        handle.finished_at = _now()
+        if not handle.future.done():
+            handle.future.set_result(handle)
+        self._retire(handle)
+
+    def _retire(self, handle):
+        self._finished.append(handle.execution_id)
+        while len(self._finished) > self.max_retained:
+            self.executions.pop(self._finished.popleft(), None)
+
+    def wait(self, execution_id, timeout=None) -> ExecutionHandle:
+        """Block until an execution finishes (for synchronous callers and tests)."""
+        handle = self.get(execution_id)
+        asyncio.run_coroutine_threadsafe(asyncio.wait_for(asyncio.shield(handle.future), timeout),
+                                         self._loop).result()
+        return handle
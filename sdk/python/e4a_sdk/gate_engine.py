@@ -1,35 +1,133 @@
-import json
-import os
+import heapq
+import threading
+import time
 import uuid
-from datetime import datetime, timedelta, UTC
-from jsonschema import validate, ValidationError
+from datetime import datetime, UTC
+from jsonschema import ValidationError
+from . import schema_registry
+from .locks import StripedLock
+from .storage import InMemoryStorage
 
-SPEC = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'specs', 'gate_v1.json')
+SPEC = 'gate_v1.json'
 
-with open(SPEC, 'r') as _f:
-    GATE_SCHEMA = json.load(_f)
+GATE_SCHEMA = schema_registry.get_schema(SPEC)
 
 
 class GateEngineError(Exception):
     pass
 
 
+def _epoch(ts: str) -> float:
+    return datetime.fromisoformat(ts.replace('Z', '+00:00')).timestamp()
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, UTC).isoformat().replace('+00:00', 'Z')
+
+
 class GateEngine:
-    def __init__(self):
-        self.gates = {}
+    def __init__(self, storage=None, mandate_resolver=None, scribe=None, clock=time.time):
+        self.storage = storage or InMemoryStorage()
+        self.scribe = scribe
+        # stored gates whose payload is their own mandate keep only a `payload_ref` (the mandate_id);
+        # mandate_resolver(mandate_id) -> mandate dict restores the payload on read
+        self.gates = self.storage.gates
+        self.mandate_resolver = mandate_resolver
+        # approve/reject are read-modify-write on one gate; serialize them per gate
+        self._gate_locks = StripedLock()
+        # in-process indexes over the stored gates (all gate writes go through this engine):
+        #   mandate_id -> gate_id, status -> {gate_id: None}, approver -> {gate_id: None}
+        # where an approver's inbox holds the pending gates still waiting for their approval.
+        # A persistent store may be shared with engines in other processes, whose writes these
+        # indexes never see, so lookups there go to the store's own indexes instead (_shared).
+        self._shared = self.storage.persistent
+        self._by_mandate = {}
+        self._by_status = {}
+        self._inbox = {}
+        self._index_lock = threading.Lock()
+        # expiry scheduler: min-heap of (deadline, gate_id) with deadlines as epoch seconds, plus
+        # gate_id -> deadline for pending gates; heap entries of resolved gates are skipped lazily
+        self._clock = clock
+        self._deadline_heap = []
+        self._deadlines = {}
+        self._expiry_cond = threading.Condition()
+        self._expiry_thread = None
+        self._expiry_stop = False
+        # status-transition subscribers: token -> (gate_id or None for all gates, callback);
+        # transitions are queued per thread and delivered once the gate's lock is released
+        self._subscribers = {}
+        self._next_token = 0
+        self._subscriber_lock = threading.Lock()
+        self._events = threading.local()
+        for stored in self.storage.find_gates():
+            self._index(stored)
+            if stored['status'] == 'pending' and stored.get('expires_at'):
+                self._schedule(stored['gate_id'], _epoch(stored['expires_at']))
+
+    def _compact(self, gate: dict) -> dict:
+        payload = gate.get('payload')
+        if self.mandate_resolver and isinstance(payload, dict) and payload.get('mandate_id') == gate['mandate_id']:
+            stored = {k: v for k, v in gate.items() if k != 'payload'}
+            stored['payload_ref'] = gate['mandate_id']
+            return stored
+        return gate
+
+    def _expand(self, stored: dict | None) -> dict | None:
+        if stored is None or 'payload_ref' not in stored:
+            return stored
+        gate = {k: v for k, v in stored.items() if k != 'payload_ref'}
+        mandate = self.mandate_resolver(stored['payload_ref']) if self.mandate_resolver else None
+        gate['payload'] = mandate if mandate is not None else {'mandate_id': stored['payload_ref']}
+        return gate
+
+    def _index(self, gate: dict, previous_status: str = None):
+        gate_id = gate['gate_id']
+        status = gate['status']
+        with self._index_lock:
+            if previous_status is None:
+                self._by_mandate.setdefault(gate['mandate_id'], gate_id)
+            elif previous_status != status:
+                self._by_status.get(previous_status, {}).pop(gate_id, None)
+            self._by_status.setdefault(status, {})[gate_id] = None
+            for approver in gate['required_approvers']:
+                if status == 'pending' and approver not in gate['approvals']:
+                    # setdefault keeps the gate's place in an inbox it is already in
+                    self._inbox.setdefault(approver, {}).setdefault(gate_id, None)
+                else:
+                    self._inbox.get(approver, {}).pop(gate_id, None)
+
+    def _save(self, gate: dict, previous_status: str = None):
+        self.gates[gate['gate_id']] = self._compact(gate)
+        self._index(gate, previous_status)
+        if gate['status'] != 'pending':
+            self._deadlines.pop(gate['gate_id'], None)
+        if previous_status is not None and previous_status != gate['status'] and self._subscribers:
+            queue = getattr(self._events, 'queue', None)
+            if queue is None:
+                queue = self._events.queue = []
+            queue.append((gate, previous_status))
+
+    def _load(self, gate_ids) -> list[dict]:
+        gates = []
+        for gate_id in gate_ids:
+            gate = self.gates.get(gate_id)
+            if gate is not None:
+                gates.append(self._expand(gate))
+        return gates
 
     def _validate_gate(self, gate):
         try:
-            validate(instance=gate, schema=GATE_SCHEMA)
+            schema_registry.validate(gate, SPEC)
         except ValidationError as e:
             raise GateEngineError(f"Gate validation error: {e.message}")
 
     def create_gate(self, mandate_id: str, required_approvers: list[str], payload: dict, expires_in_seconds: int = None) -> dict:
         gate_id = str(uuid.uuid4())
         created_at = datetime.now(UTC).isoformat().replace('+00:00', 'Z')
-        expires_at = None
+        expires_at = deadline = None
         if expires_in_seconds:
-            expires_at = (datetime.now(UTC) + timedelta(seconds=expires_in_seconds)).isoformat().replace('+00:00', 'Z')
+            deadline = self._clock() + expires_in_seconds
+            expires_at = _iso(deadline)
 
         gate = {
             'gate_id': gate_id,
@@ -43,31 +141,201 @@ class GateEngine:
             'payload': payload
         }
         self._validate_gate(gate)
-        self.gates[gate_id] = gate
+        self._save(gate)
+        if deadline is not None:
+            self._schedule(gate_id, deadline)
         return gate
 
     def get_gate_status(self, gate_id: str) -> dict:
+        self.expire_due()
         gate = self.gates.get(gate_id)
         if not gate:
             raise GateEngineError('Gate not found')
-        return gate
+        return self._expand(gate)
 
     def get_gate_by_mandate_id(self, mandate_id: str) -> dict | None:
-        for gate in self.gates.values():
-            if gate['mandate_id'] == mandate_id:
-                return gate
-        return None
+        self.expire_due()
+        if self._shared:
+            gates = self.storage.find_gates(mandate_id=mandate_id)
+            return self._expand(gates[0]) if gates else None
+        gate_id = self._by_mandate.get(mandate_id)
+        return self._expand(self.gates.get(gate_id)) if gate_id else None
+
+    def gates_by_status(self, status: str) -> list[dict]:
+        self.expire_due()
+        if self._shared:
+            return [self._expand(gate) for gate in self.storage.find_gates(status=status)]
+        with self._index_lock:
+            gate_ids = list(self._by_status.get(status, ()))
+        return self._load(gate_ids)
+
+    def pending_gates(self) -> list[dict]:
+        return self.gates_by_status('pending')
+
+    def _shared_inbox(self, approver_id: str) -> list[dict]:
+        return [gate for gate in self.storage.find_gates(status='pending')
+                if approver_id in gate['required_approvers'] and approver_id not in gate['approvals']]
+
+    def inbox(self, approver_id: str, limit: int = None) -> list[dict]:
+        """Pending gates that still need approver_id's approval, oldest first."""
+        self.expire_due()
+        if self._shared:
+            gates = self._shared_inbox(approver_id)
+            return [self._expand(gate) for gate in (gates[:limit] if limit is not None else gates)]
+        with self._index_lock:
+            gate_ids = list(self._inbox.get(approver_id, ()))
+        return self._load(gate_ids[:limit] if limit is not None else gate_ids)
+
+    def inbox_size(self, approver_id: str) -> int:
+        self.expire_due()
+        if self._shared:
+            return len(self._shared_inbox(approver_id))
+        return len(self._inbox.get(approver_id, ()))
+
+    # -- notifications ---------------------------------------------------
+    def subscribe(self, callback, gate_id: str = None) -> int:
+        """
+        Call callback(gate, previous_status) whenever a gate changes status (pending ->
+        approved / rejected / expired); pass gate_id to watch a single gate. Callbacks run in
+        the thread that made the change, after the gate's lock is released, and should not
+        block. Returns a token for unsubscribe().
+        """
+        with self._subscriber_lock:
+            self._next_token += 1
+            self._subscribers[self._next_token] = (gate_id, callback)
+            return self._next_token
+
+    def unsubscribe(self, token: int):
+        with self._subscriber_lock:
+            self._subscribers.pop(token, None)
+
+    def _dispatch(self):
+        queue = getattr(self._events, 'queue', None)
+        if not queue:
+            return
+        self._events.queue = []
+        with self._subscriber_lock:
+            subscribers = list(self._subscribers.values())
+        for gate, previous_status in queue:
+            for gate_id, callback in subscribers:
+                if gate_id is None or gate_id == gate['gate_id']:
+                    try:
+                        callback(gate, previous_status)
+                    except Exception as e:
+                        print(f"[GateEngine] Subscriber error: {e}")
 
-    def _check_resolution(self, gate_id: str):
-        gate = self.gates[gate_id]
+    def wait_for_resolution(self, gate_id: str, timeout: float = None) -> dict:
+        """Block until the gate leaves 'pending' (or timeout passes); returns its current state."""
+        resolved = threading.Event()
+        token = self.subscribe(lambda gate, previous: resolved.set(), gate_id=gate_id)
+        try:
+            gate = self.get_gate_status(gate_id)
+            if gate['status'] == 'pending':
+                deadline = self._deadlines.get(gate_id)
+                if deadline is not None:
+                    # wake for the gate's own expiry even if no sweep is running
+                    wait = max(deadline - self._clock(), 0) + 0.001
+                    timeout = wait if timeout is None else min(timeout, wait)
+                resolved.wait(timeout)
+                gate = self.get_gate_status(gate_id)
+            return gate
+        finally:
+            self.unsubscribe(token)
+
+    # -- expiry ----------------------------------------------------------
+    def _schedule(self, gate_id: str, deadline: float):
+        with self._expiry_cond:
+            self._deadlines[gate_id] = deadline
+            heapq.heappush(self._deadline_heap, (deadline, gate_id))
+            if len(self._deadline_heap) > 2 * len(self._deadlines) + 1024:
+                # mostly entries of gates resolved before their deadline; rebuild from the live ones
+                self._deadline_heap = [(d, g) for g, d in self._deadlines.items()]
+                heapq.heapify(self._deadline_heap)
+            if self._deadline_heap[0][1] == gate_id:
+                self._expiry_cond.notify()
+
+    def next_deadline(self) -> float | None:
+        """Epoch seconds of the earliest scheduled expiry, or None."""
+        with self._expiry_cond:
+            return self._deadline_heap[0][0] if self._deadline_heap else None
+
+    def expire_due(self, now: float = None) -> list[dict]:
+        """
+        Move every pending gate whose deadline has passed to 'expired' and record a
+        'gate_expired' scribe entry for each. Returns the expired gates.
+        Cheap when nothing is due (one heap peek), so reads call it to stay current.
+        """
+        now = self._clock() if now is None else now
+        due = []
+        with self._expiry_cond:
+            heap = self._deadline_heap
+            while heap and heap[0][0] <= now:
+                deadline, gate_id = heapq.heappop(heap)
+                if self._deadlines.get(gate_id) == deadline:
+                    due.append(gate_id)
+        expired = []
+        for gate_id in due:
+            with self._gate_locks(gate_id):
+                gate = self._expand(self.gates.get(gate_id))
+                if gate is None or gate['status'] != 'pending':
+                    self._deadlines.pop(gate_id, None)
+                    continue
+                gate['status'] = 'expired'
+                self._save(gate, 'pending')
+                expired.append(gate)
+        self._record_expired(expired)
+        self._dispatch()
+        return expired
+
+    def _record_expired(self, gates: list[dict]):
+        if self.scribe and gates:
+            self.scribe.append_entries([{
+                'entry_type': 'gate_expired',
+                'gate_id': gate['gate_id'],
+                'mandate_id': gate['mandate_id'],
+                'expires_at': gate['expires_at'],
+            } for gate in gates])
+
+    def start_expiry(self):
+        """Expire gates in a background thread that sleeps until the next deadline."""
+        with self._expiry_cond:
+            if self._expiry_thread is not None:
+                return self
+            self._expiry_stop = False
+            self._expiry_thread = threading.Thread(target=self._expiry_loop, name='e4a-gate-expiry', daemon=True)
+            self._expiry_thread.start()
+        return self
+
+    def stop_expiry(self):
+        with self._expiry_cond:
+            thread, self._expiry_thread = self._expiry_thread, None
+            self._expiry_stop = True
+            self._expiry_cond.notify()
+        if thread is not None:
+            thread.join()
+
+    def _expiry_loop(self):
+        while True:
+            with self._expiry_cond:
+                if self._expiry_stop:
+                    return
+                delay = self._deadline_heap[0][0] - self._clock() if self._deadline_heap else None
+                if delay is None or delay > 0:
+                    self._expiry_cond.wait(delay)
+                    continue
+            self.expire_due()
+
+    def _check_resolution(self, gate: dict):
         if gate['status'] != 'pending':
             return
 
-        # Check for expiration
+        # Check for expiration (the scheduler normally gets there first)
         if gate['expires_at']:
-            expires_dt = datetime.fromisoformat(gate['expires_at'].replace('Z', ''))
-            if datetime.now(UTC).replace(tzinfo=None) > expires_dt:
-                gate['status'] = 'rejected' # Or 'expired'
+            deadline = self._deadlines.get(gate['gate_id'])
+            if deadline is None:
+                deadline = _epoch(gate['expires_at'])
+            if self._clock() >= deadline:
+                gate['status'] = 'expired'
                 return
 
         # Check for approval
@@ -82,7 +350,14 @@ class GateEngine:
             return
 
     def approve_gate(self, gate_id: str, approver_id: str) -> dict:
-        gate = self.gates.get(gate_id)
+        try:
+            with self._gate_locks(gate_id):
+                return self._approve(gate_id, approver_id)
+        finally:
+            self._dispatch()
+
+    def _approve(self, gate_id: str, approver_id: str) -> dict:
+        gate = self._expand(self.gates.get(gate_id))
         if not gate:
             raise GateEngineError('Gate not found')
         if gate['status'] != 'pending':
@@ -97,11 +372,59 @@ class GateEngine:
         if approver_id in gate['rejections']:
             gate['rejections'].remove(approver_id)
 
-        self._check_resolution(gate_id)
+        self._check_resolution(gate)
+        self._save(gate, 'pending')
+        if gate['status'] == 'expired':
+            self._record_expired([gate])
         return gate
 
+    def approve_many(self, approver_id: str, gate_ids: list[str] = None, policy_tag: str = None) -> list[dict]:
+        """
+        Approve several gates in one operation, given explicit gate_ids or a filter.
+        policy_tag selects the gates in approver_id's inbox whose mandate carries that tag.
+
+        Returns one result per gate, in order:
+            {'gate_id': ..., 'status': 'applied', 'gate': {...}}
+            {'gate_id': ..., 'status': 'error', 'error': '...'}
+        """
+        return self._decide_many(self._approve, approver_id, gate_ids, policy_tag)
+
     def reject_gate(self, gate_id: str, rejector_id: str) -> dict:
-        gate = self.gates.get(gate_id)
+        try:
+            with self._gate_locks(gate_id):
+                return self._reject(gate_id, rejector_id)
+        finally:
+            self._dispatch()
+
+    def reject_many(self, rejector_id: str, gate_ids: list[str] = None, policy_tag: str = None) -> list[dict]:
+        """Reject several gates in one operation; same selection and results as approve_many()."""
+        return self._decide_many(self._reject, rejector_id, gate_ids, policy_tag)
+
+    def _select(self, actor_id: str, gate_ids, policy_tag) -> list[str]:
+        if gate_ids is not None:
+            return list(dict.fromkeys(gate_ids))
+        if policy_tag is None:
+            raise GateEngineError('Pass gate_ids or a filter (policy_tag)')
+        return [g['gate_id'] for g in self.inbox(actor_id)
+                if policy_tag in ((g.get('payload') or {}).get('policy_tags') or ())]
+
+    def _decide_many(self, decide, actor_id: str, gate_ids, policy_tag) -> list[dict]:
+        selected = self._select(actor_id, gate_ids, policy_tag)
+        results = []
+        # gate locks before the storage transaction, the same order single decisions use
+        try:
+            with self._gate_locks.held(selected), self.storage.transaction():
+                for gate_id in selected:
+                    try:
+                        results.append({'gate_id': gate_id, 'status': 'applied', 'gate': decide(gate_id, actor_id)})
+                    except GateEngineError as e:
+                        results.append({'gate_id': gate_id, 'status': 'error', 'error': str(e)})
+        finally:
+            self._dispatch()
+        return results
+
+    def _reject(self, gate_id: str, rejector_id: str) -> dict:
+        gate = self._expand(self.gates.get(gate_id))
         if not gate:
             raise GateEngineError('Gate not found')
         if gate['status'] != 'pending':
@@ -116,7 +439,10 @@ class GateEngine:
         if rejector_id in gate['approvals']:
             gate['approvals'].remove(rejector_id)
 
-        self._check_resolution(gate_id)
+        self._check_resolution(gate)
+        self._save(gate, 'pending')
+        if gate['status'] == 'expired':
+            self._record_expired([gate])
         return gate
 
 
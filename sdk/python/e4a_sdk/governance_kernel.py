@@ -4,99 +4,238 @@ Responsibilities:
 - register charters
 - submit proposals
 - simulate votes and enact proposals (mocked voting)
-- simple persistence in data/governance_state.json
+- persistence in data/governance_state.json (snapshot) + governance_state.json.journal
+  (append-only operation log, compacted into the snapshot periodically; see state_journal.py)
+- running reputation-weighted tallies per proposal, updated on each vote and on
+  reputation changes of the voters instead of being recomputed at enactment; the
+  weight source is a ReputationIndex, or anything with the same get_score() /
+  subscribe() / unsubscribe() (e.g. a TrustGraph over the mandate graph)
+- cost of reading a tally: O(1) when scores only change through events. When the
+  weight source decays (ReputationIndex with a half_life), scores drift without an
+  event, so tally(), tallies() and simulate_and_enact() re-weigh every voter of
+  each proposal they read: O(votes) per proposal, O(all votes) for tallies()
+- safe to share between processes (e.g. several uvicorn workers): every call takes the
+  journal's file lock and first applies operations journaled by other processes
 """
 import os
-import json
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from typing import Dict, Any
 from .reputation_index import ReputationIndex
+from .state_journal import StateJournal
 
 STATE_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'governance_state.json')
 
+# tallies are kept in integer units of 1e-9 reputation so incremental updates never drift
+WEIGHT_SCALE = 1_000_000_000
+YES_VOTES = ('yes', 'y', 'approve')
+NO_VOTES = ('no', 'n', 'reject')
 
-def _ensure():
-    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
-    if not os.path.exists(STATE_PATH):
-        with open(STATE_PATH, 'w') as fh:
-            json.dump({'charters': {}, 'proposals': {}}, fh)
 
+def _side(vote: str):
+    vote = vote.lower()
+    if vote in YES_VOTES:
+        return 0
+    if vote in NO_VOTES:
+        return 1
+    return None  # abstain: counts towards quorum only
 
-def _load():
-    _ensure()
-    with open(STATE_PATH, 'r') as fh:
-        return json.load(fh)
 
+def _empty_state():
+    return {'charters': {}, 'proposals': {}}
 
-def _save(state):
-    with open(STATE_PATH, 'w') as fh:
-        json.dump(state, fh, indent=2, default=str)
+
+def _apply(state, op):
+    """Apply one journaled operation to the state; used for live writes and for replay."""
+    kind = op['op']
+    if kind == 'register_charter':
+        state['charters'][op['charter_id']] = {
+            'charter_id': op['charter_id'],
+            'doc': op['doc'],
+            'registered_at': op['at']
+        }
+    elif kind == 'submit_proposal':
+        state['proposals'][op['proposal_id']] = {
+            'proposal_id': op['proposal_id'],
+            'charter_id': op['charter_id'],
+            'proposal': op['proposal'],
+            'created_at': op['at'],
+            'votes': {}
+        }
+    elif kind == 'vote':
+        state['proposals'][op['proposal_id']]['votes'][op['voter_id']] = op['vote']
+    elif kind == 'resolve':
+        prop = state['proposals'][op['proposal_id']]
+        if op['status'] == 'enacted':
+            prop['enacted_at'] = op['at']
+        prop['status'] = op['status']
+    else:
+        raise ValueError(f'unknown governance operation: {kind}')
 
 
 class GovernanceKernel:
-    def __init__(self, reputation_index: ReputationIndex = None):
-        _ensure()
-        self.state = _load()
+    def __init__(self, reputation_index: ReputationIndex = None, state_path: str = None,
+                 fsync: str = 'always', snapshot_every: int = 1000):
+        self.journal = StateJournal(state_path or STATE_PATH, _apply, initial=_empty_state,
+                                    snapshot_every=snapshot_every, fsync=fsync)
         self.reputation_index = reputation_index or ReputationIndex()
+        self._lock = threading.RLock()
+        with self.journal.locked():
+            self._reload()
+        self._reputation_token = self.reputation_index.subscribe(self._on_reputation_change)
+
+    def _reload(self):
+        self.state = self.journal.load()
+        # proposal_id -> [yes_units, no_units]; proposal_id -> {voter_id: (side, units)};
+        # voter_id -> {proposal_id: None} so a reputation change touches only that voter's proposals
+        self._tallies = {}
+        self._contributions = {}
+        self._voted = {}
+        for proposal_id, prop in self.state['proposals'].items():
+            self._tallies[proposal_id] = [0, 0]
+            self._contributions[proposal_id] = {}
+            for voter_id, vote in prop.get('votes', {}).items():
+                self._count(proposal_id, voter_id, vote)
+
+    @contextmanager
+    def _locked(self, shared=False):
+        """Thread lock + cross-process journal lock, with this process caught up on the journal."""
+        with self._lock, self.journal.locked(shared=shared):
+            applied = self.journal.catch_up(self.state)
+            if applied is None:  # another process compacted; its snapshot has everything
+                self._reload()
+            else:
+                for op in applied:
+                    self._track(op)
+            yield
+
+    def _commit(self, op):
+        # journal first, then apply: state never holds an operation that is not on disk
+        op = self.journal.append(op)
+        _apply(self.state, op)
+        self._track(op)
+        if self.journal.should_compact():
+            self.journal.compact(self.state)
+
+    # -- tallies -----------------------------------------------------------
+    def _weight(self, voter_id):
+        return round(self.reputation_index.get_score(voter_id) * WEIGHT_SCALE)
+
+    def _track(self, op):
+        if op['op'] == 'submit_proposal':
+            # (re)submission starts with no votes
+            for voter_id in self._contributions.get(op['proposal_id'], ()):
+                self._voted.get(voter_id, {}).pop(op['proposal_id'], None)
+            self._tallies[op['proposal_id']] = [0, 0]
+            self._contributions[op['proposal_id']] = {}
+        elif op['op'] == 'vote':
+            self._count(op['proposal_id'], op['voter_id'], op['vote'])
+
+    def _count(self, proposal_id, voter_id, vote):
+        tally = self._tallies[proposal_id]
+        contributions = self._contributions[proposal_id]
+        old = contributions.get(voter_id)
+        if old is not None and old[0] is not None:
+            tally[old[0]] -= old[1]
+        side = _side(vote)
+        units = self._weight(voter_id) if side is not None else 0
+        if side is not None:
+            tally[side] += units
+        contributions[voter_id] = (side, units)
+        self._voted.setdefault(voter_id, {})[proposal_id] = None
+
+    def _on_reputation_change(self, voter_id, old_score, new_score):
+        with self._lock:
+            units = self._weight(voter_id)
+            for proposal_id in self._voted.get(voter_id, ()):
+                side, old_units = self._contributions[proposal_id][voter_id]
+                if side is not None and old_units != units:
+                    self._tallies[proposal_id][side] += units - old_units
+                    self._contributions[proposal_id][voter_id] = (side, units)
+
+    def _tally(self, proposal_id):
+        if getattr(self.reputation_index, 'decays', False):
+            # decaying scores move without any event to listen to: re-weigh this proposal's voters
+            tally, contributions = self._tallies[proposal_id], self._contributions[proposal_id]
+            for voter_id, (side, units) in contributions.items():
+                if side is not None:
+                    weight = self._weight(voter_id)
+                    tally[side] += weight - units
+                    contributions[voter_id] = (side, weight)
+        yes, no = self._tallies[proposal_id]
+        return {'yes': yes / WEIGHT_SCALE, 'no': no / WEIGHT_SCALE,
+                'votes': len(self._contributions[proposal_id])}
+
+    def tally(self, proposal_id: str) -> Dict[str, Any]:
+        """
+        Current reputation-weighted totals for a proposal: O(1) without decay, O(votes) when
+        the weight source decays (see the module docstring).
+        """
+        with self._locked(shared=True):
+            if proposal_id not in self._tallies:
+                raise ValueError('proposal not found')
+            return self._tally(proposal_id)
+
+    def tallies(self, open_only: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Tallies of every proposal (only those not yet enacted or rejected by default); re-weighs
+        every vote of those proposals when the weight source decays.
+        """
+        with self._locked(shared=True):
+            proposals = self.state['proposals']
+            return {pid: self._tally(pid) for pid in self._tallies
+                    if not open_only or 'status' not in proposals[pid]}
+
+    def refresh(self):
+        """Apply operations other processes journaled since this kernel last looked."""
+        with self._locked(shared=True):
+            return self.state
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot now."""
+        with self._locked():
+            self.journal.compact(self.state)
+
+    def close(self):
+        self.reputation_index.unsubscribe(self._reputation_token)
+        with self._lock:
+            self.journal.close()
 
     def register_charter(self, charter_id: str, charter_doc: Dict[str, Any]):
-        self.state = _load()
-        self.state['charters'][charter_id] = {
-            'charter_id': charter_id,
-            'doc': charter_doc,
-            'registered_at': datetime.now(timezone.utc).isoformat()
-        }
-        _save(self.state)
-        return self.state['charters'][charter_id]
+        with self._locked():
+            self._commit({'op': 'register_charter', 'charter_id': charter_id, 'doc': charter_doc,
+                          'at': datetime.now(timezone.utc).isoformat()})
+            return self.state['charters'][charter_id]
 
     def submit_proposal(self, charter_id: str, proposal_id: str, proposal: Dict[str, Any]):
-        self.state = _load()
-        if charter_id not in self.state['charters']:
-            raise ValueError('charter not registered')
-        self.state['proposals'][proposal_id] = {
-            'proposal_id': proposal_id,
-            'charter_id': charter_id,
-            'proposal': proposal,
-            'created_at': datetime.now(timezone.utc).isoformat(),
-            'votes': {}
-        }
-        _save(self.state)
-        return self.state['proposals'][proposal_id]
+        with self._locked():
+            if charter_id not in self.state['charters']:
+                raise ValueError('charter not registered')
+            self._commit({'op': 'submit_proposal', 'charter_id': charter_id, 'proposal_id': proposal_id,
+                          'proposal': proposal, 'at': datetime.now(timezone.utc).isoformat()})
+            return self.state['proposals'][proposal_id]
 
     def vote(self, proposal_id: str, voter_id: str, vote: str):
-        self.state = _load()
-        if proposal_id not in self.state['proposals']:
-            raise ValueError('proposal not found')
-        self.state['proposals'][proposal_id]['votes'][voter_id] = vote
-        _save(self.state)
-        return self.state['proposals'][proposal_id]
+        with self._locked():
+            if proposal_id not in self.state['proposals']:
+                raise ValueError('proposal not found')
+            self._commit({'op': 'vote', 'proposal_id': proposal_id, 'voter_id': voter_id, 'vote': vote})
+            return self.state['proposals'][proposal_id]
 
     def simulate_and_enact(self, proposal_id: str, quorum: int = 1):
         """Simple simulation: enact if number of votes >= quorum and majority 'yes'."""
-        self.state = _load()
-        prop = self.state['proposals'].get(proposal_id)
-        if not prop:
-            raise ValueError('proposal not found')
-        votes = prop.get('votes', {})
-        if len(votes) < quorum:
-            return {'status': 'rejected', 'reason': 'quorum_not_met', 'votes': votes}
-
-        weighted_yes = 0.0
-        weighted_no = 0.0
-
-        for voter_id, vote in votes.items():
-            reputation_score = self.reputation_index.get_score(voter_id) # Default to 1.0 if no score
-            if vote.lower() in ('yes', 'y', 'approve'):
-                weighted_yes += reputation_score
-            elif vote.lower() in ('no', 'n', 'reject'):
-                weighted_no += reputation_score
-
-        if weighted_yes > weighted_no:
-            prop['enacted_at'] = datetime.now(timezone.utc).isoformat()
-            prop['status'] = 'enacted'
-            _save(self.state)
-            return {'status': 'enacted', 'proposal': prop, 'weighted_votes': {'yes': weighted_yes, 'no': weighted_no}}
-        else:
-            prop['status'] = 'rejected'
-            _save(self.state)
-            return {'status': 'rejected', 'proposal': prop, 'weighted_votes': {'yes': weighted_yes, 'no': weighted_no}}
+        with self._locked():
+            prop = self.state['proposals'].get(proposal_id)
+            if not prop:
+                raise ValueError('proposal not found')
+            votes = prop.get('votes', {})
+            if len(votes) < quorum:
+                return {'status': 'rejected', 'reason': 'quorum_not_met', 'votes': votes}
+
+            tally = self._tally(proposal_id)
+            weighted_yes, weighted_no = tally['yes'], tally['no']
+            status = 'enacted' if weighted_yes > weighted_no else 'rejected'
+            self._commit({'op': 'resolve', 'proposal_id': proposal_id, 'status': status,
+                          'at': datetime.now(timezone.utc).isoformat()})
+            return {'status': status, 'proposal': prop, 'weighted_votes': {'yes': weighted_yes, 'no': weighted_no}}
@@ -0,0 +1,232 @@
+"""
+Monte Carlo governance simulator.
+
+Evaluates the voting rules in governance/voting_rules.yaml against synthetic
+electorates, so charter authors can tune quorum and threshold settings before
+deployment instead of replaying votes through GovernanceKernel.vote().
+
+Each trial draws a fresh population: reputation scores from the configured
+distribution, a turnout and a support rate for the trial (Beta-distributed
+around their means), then every voter's participation, abstention and yes/no
+choice. A rule enacts when the participating share reaches its quorum_fraction
+and the weighted yes share of decisive votes exceeds its threshold - the same
+test GovernanceKernel.simulate_and_enact() applies with a majority threshold.
+The kernel's quorum is a vote count, not a fraction; quorum_votes() converts
+one to the other for a given electorate.
+
+All voters of a block of trials are drawn as one NumPy array. A trial reduces
+to (turnout, weighted yes share), so evaluating more quorum / threshold settings
+on the same trials costs a sort and a binary search, not a new simulation;
+sweep() scores thousands of settings on common random numbers in seconds.
+
+Requires NumPy (the `perf` extra).
+"""
+import math
+import os
+from typing import Any, Dict, Iterable
+
+import yaml
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+RULES_PATH = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'governance', 'voting_rules.yaml')
+WEIGHTINGS = ('reputation', 'equal')
+DEFAULT_RULE = {'quorum_fraction': 0.2, 'threshold': 0.5, 'weighting': 'reputation'}
+DEFAULT_POPULATION = {
+    'voters': 200,
+    'reputation': {'distribution': 'beta', 'a': 5, 'b': 5},
+    'turnout': {'mean': 0.35, 'concentration': 20},
+    'support': {'mean': 0.55, 'concentration': 30},
+    'abstain': 0.05,
+    'reputation_tilt': 0.0,
+}
+# voters drawn per block of trials; bounds peak memory at a few tens of MB
+_BLOCK_CELLS = 2_000_000
+_EPS = 1e-9
+
+
+class GovernanceSimError(Exception):
+    pass
+
+
+def quorum_votes(quorum_fraction: float, eligible: int) -> int:
+    """The vote count to pass as GovernanceKernel.simulate_and_enact(quorum=...) for this many eligible voters."""
+    return max(0, math.ceil(quorum_fraction * eligible - _EPS))
+
+
+def _check_rule(name, rule):
+    if 'quorum' in rule:
+        raise GovernanceSimError(f'rule {name}: use quorum_fraction (a fraction of voters), not quorum')
+    if not 0 <= rule['quorum_fraction'] <= 1:
+        raise GovernanceSimError(f'rule {name}: quorum_fraction must be in [0, 1]')
+    if not 0 <= rule['threshold'] < 1:
+        raise GovernanceSimError(f'rule {name}: threshold must be in [0, 1)')
+    if rule['weighting'] not in WEIGHTINGS:
+        raise GovernanceSimError(f'rule {name}: weighting must be one of {WEIGHTINGS}')
+    return rule
+
+
+def load_voting_rules(path: str = None) -> Dict[str, Any]:
+    """
+    Read voting_rules.yaml: {'rules': {name: rule}, 'populations': {name: population}},
+    with `defaults` merged into every rule.
+    """
+    with open(path or RULES_PATH) as fh:
+        data = yaml.safe_load(fh) or {}
+    defaults = {**DEFAULT_RULE, **(data.get('defaults') or {})}
+    rules = {name: _check_rule(name, {**defaults, **(rule or {})})
+             for name, rule in (data.get('rules') or {'standard': {}}).items()}
+    populations = {name: {**DEFAULT_POPULATION, **(pop or {})}
+                   for name, pop in (data.get('populations') or {'default': {}}).items()}
+    return {'rules': rules, 'populations': populations}
+
+
+def _rates(rng, spec, n):
+    """Per-trial rate drawn from a Beta with the given mean and concentration."""
+    mean = float(spec['mean'])
+    concentration = spec.get('concentration')
+    if not concentration or mean <= 0 or mean >= 1:
+        return np.full(n, min(max(mean, 0.0), 1.0))
+    return rng.beta(mean * concentration, (1 - mean) * concentration, n)
+
+
+def _reputations(rng, spec, shape):
+    kind = spec.get('distribution', 'beta')
+    if kind == 'beta':
+        return rng.beta(spec['a'], spec['b'], shape)
+    if kind == 'uniform':
+        return rng.uniform(spec.get('low', 0.0), spec.get('high', 1.0), shape)
+    if kind == 'fixed':
+        return np.full(shape, float(spec['value']))
+    raise GovernanceSimError(f'unknown reputation distribution: {kind}')
+
+
+class GovernanceSimulator:
+    """
+    Args:
+        rules_path: voting rules file (default governance/voting_rules.yaml).
+        rules: an already loaded {'rules': ..., 'populations': ...} dict instead of a file.
+    """
+
+    def __init__(self, rules_path: str = None, rules: Dict[str, Any] = None):
+        if np is None:
+            raise GovernanceSimError('GovernanceSimulator requires NumPy (pip install e4a-sdk[perf])')
+        config = rules if rules is not None else load_voting_rules(rules_path)
+        self.rules = config['rules']
+        self.populations = config['populations']
+
+    def rule(self, rule) -> Dict[str, Any]:
+        """A rule by name, or a dict of overrides on top of the defaults."""
+        if isinstance(rule, dict):
+            return _check_rule('<inline>', {**DEFAULT_RULE, **rule})
+        if rule not in self.rules:
+            raise GovernanceSimError(f'unknown voting rule: {rule}')
+        return self.rules[rule]
+
+    def population(self, population) -> Dict[str, Any]:
+        if isinstance(population, dict):
+            return {**DEFAULT_POPULATION, **population}
+        if population not in self.populations:
+            raise GovernanceSimError(f'unknown population: {population}')
+        return self.populations[population]
+
+    # -- trials ------------------------------------------------------------
+    def run_trials(self, population='default', trials: int = 10_000, seed=None, weighting: str = 'reputation'):
+        """
+        Simulate `trials` elections; returns (turnout, yes_share) float arrays, one entry per trial.
+        yes_share is the weighted yes share of decisive votes (0 when nobody voted yes or no).
+        """
+        if weighting not in WEIGHTINGS:
+            raise GovernanceSimError(f'weighting must be one of {WEIGHTINGS}')
+        pop = self.population(population)
+        voters = int(pop['voters'])
+        if voters < 1 or trials < 1:
+            raise GovernanceSimError('voters and trials must be >= 1')
+        rng = np.random.default_rng(seed)
+        turnout = np.empty(trials)
+        share = np.empty(trials)
+        block = max(1, _BLOCK_CELLS // voters)
+        for start in range(0, trials, block):
+            n = min(block, trials - start)
+            rep = _reputations(rng, pop['reputation'], (n, voters))
+            takes_part = rng.random((n, voters)) < _rates(rng, pop['turnout'], n)[:, None]
+            decisive = takes_part & (rng.random((n, voters)) >= pop['abstain'])
+            support = _rates(rng, pop['support'], n)[:, None]
+            if pop['reputation_tilt']:
+                support = np.clip(support + pop['reputation_tilt'] * (rep - rep.mean(axis=1, keepdims=True)), 0, 1)
+            yes = rng.random((n, voters)) < support
+            weight = rep if weighting == 'reputation' else 1.0
+            yes_w = np.where(decisive & yes, weight, 0.0).sum(axis=1)
+            no_w = np.where(decisive & ~yes, weight, 0.0).sum(axis=1)
+            total = yes_w + no_w
+            turnout[start:start + n] = takes_part.sum(axis=1) / voters
+            share[start:start + n] = np.divide(yes_w, total, out=np.zeros(n), where=total > 0)
+        return turnout, share
+
+    @staticmethod
+    def enact_probabilities(turnout, share, quorum_fractions: Iterable[float], thresholds: Iterable[float]):
+        """
+        Share of trials enacted for every (quorum_fraction, threshold) pair, as a
+        len(quorum_fractions) x len(thresholds) array.
+        """
+        thresholds = np.asarray(list(thresholds), dtype=float)
+        quorum_fractions = list(quorum_fractions)
+        out = np.empty((len(quorum_fractions), len(thresholds)))
+        for i, quorum_fraction in enumerate(quorum_fractions):
+            passing = np.sort(share[turnout >= quorum_fraction - _EPS])
+            out[i] = (len(passing) - np.searchsorted(passing, thresholds, side='right')) / len(share)
+        return out
+
+    # -- reports -----------------------------------------------------------
+    def simulate(self, rule='standard', population='default', trials: int = 10_000, seed=None,
+                 step: float = 0.05) -> Dict[str, Any]:
+        """
+        Enactment probability of one rule for one population, with its sensitivity: the change in
+        probability per unit of quorum_fraction / threshold (central difference over +-step).
+        """
+        r = self.rule(rule)
+        turnout, share = self.run_trials(population, trials, seed, r['weighting'])
+        q, t = r['quorum_fraction'], r['threshold']
+        qs = [max(q - step, 0.0), q, min(q + step, 1.0)]
+        ts = [max(t - step, 0.0), t, min(t + step, 1 - _EPS)]
+        grid = self.enact_probabilities(turnout, share, qs, ts)
+        p = float(grid[1, 1])
+        return {
+            'rule': r,
+            'trials': trials,
+            'enact_probability': p,
+            'stderr': float(np.sqrt(p * (1 - p) / trials)),
+            'quorum_met_probability': float(np.mean(turnout >= q - _EPS)),
+            'mean_turnout': float(turnout.mean()),
+            'mean_yes_share': float(share.mean()),
+            'sensitivity': {
+                'quorum_fraction': float((grid[2, 1] - grid[0, 1]) / (qs[2] - qs[0])),
+                'threshold': float((grid[1, 2] - grid[1, 0]) / (ts[2] - ts[0])),
+            },
+        }
+
+    def sweep(self, population='default', quorum_fractions: Iterable[float] = None,
+              thresholds: Iterable[float] = None, trials: int = 10_000, seed=None,
+              weighting: str = 'reputation') -> Dict[str, Any]:
+        """
+        Enactment probability over a quorum_fraction x threshold grid (default 0.0-1.0 and
+        0.5-0.95 in steps of 0.01), every setting scored on the same simulated trials.
+        """
+        if quorum_fractions is None:
+            quorum_fractions = np.arange(0, 1.001, 0.01)
+        if thresholds is None:
+            thresholds = np.arange(0.5, 0.951, 0.01)
+        quorum_fractions = [float(round(x, 4)) for x in quorum_fractions]
+        thresholds = [float(round(x, 4)) for x in thresholds]
+        turnout, share = self.run_trials(population, trials, seed, weighting)
+        grid = self.enact_probabilities(turnout, share, quorum_fractions, thresholds)
+        return {'quorum_fractions': quorum_fractions, 'thresholds': thresholds, 'trials': trials,
+                'weighting': weighting, 'enact_probability': grid.tolist()}
+
+    def report(self, trials: int = 10_000, seed=None) -> Dict[str, Dict[str, Any]]:
+        """simulate() for every configured rule against every configured population."""
+        return {name: {pop: self.simulate(name, pop, trials, seed) for pop in self.populations}
+                for name in self.rules}
@@ -0,0 +1,36 @@
+"""
+Lock helpers for the engines.
+
+The FastAPI app serves sync endpoints from a threadpool, so engine methods run
+concurrently. Engines guard their read-modify-write sequences with:
+
+- StripedLock: a fixed array of locks selected by key hash, so operations on
+  different gates / mandates / nonces rarely contend while operations on the
+  same key are serialized
+- a plain RLock for small shared indexes (nonce index, tree index, ledger)
+"""
+import threading
+from contextlib import ExitStack, contextmanager
+
+
+class StripedLock:
+    def __init__(self, stripes: int = 64):
+        if stripes < 1:
+            raise ValueError('stripes must be >= 1')
+        self._locks = tuple(threading.RLock() for _ in range(stripes))
+
+    def __len__(self):
+        return len(self._locks)
+
+    def __call__(self, key):
+        """The lock guarding key; use as `with striped(key): ...`."""
+        return self._locks[hash(key) % len(self._locks)]
+
+    @contextmanager
+    def held(self, keys):
+        """Hold the locks for several keys at once (acquired in stripe order, so no deadlocks)."""
+        stripes = sorted({hash(k) % len(self._locks) for k in keys})
+        with ExitStack() as stack:
+            for i in stripes:
+                stack.enter_context(self._locks[i])
+            yield
@@ -8,67 +8,195 @@ Responsibilities:
 - compute protocol/validator/issuer fee splits
 """
 
-import json
-import os
+import threading
 import uuid
+from collections import OrderedDict, deque
 from datetime import datetime, UTC
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
+from . import schema_registry
 from .gate_engine import GateEngine, GateEngineError
+from . import settlement
+from .locks import StripedLock
+from .nonce_index import NonceIndex
+from .storage import InMemoryStorage
 
-SPEC = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'specs', 'mandate_v2.json')
+SPEC = 'mandate_v2.json'
 
-with open(SPEC, 'r') as _f:
-    MANDATE_SCHEMA = json.load(_f)
+MANDATE_SCHEMA = schema_registry.get_schema(SPEC)
 
 
 class MandateEngineError(Exception):
     pass
 
 
+def _epoch(ts):
+    """
+    Epoch seconds of a datetime / ISO-8601 string (naive means UTC), or None if absent or
+    unparseable. ISO strings do not sort by time across offsets or with and without
+    fractional seconds, so created_at ranges are compared as numbers.
+    """
+    if ts is None:
+        return None
+    if isinstance(ts, str):
+        try:
+            ts = datetime.fromisoformat(ts.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    return ts.timestamp()
+
+
+def _bound(name, ts):
+    """_epoch() for a caller-supplied range bound: unparseable values raise instead of widening the range."""
+    if ts is None:
+        return None
+    if not isinstance(ts, (str, datetime)) or _epoch(ts) is None:
+        raise MandateEngineError(f'Invalid {name} for fee settlement: {ts!r}')
+    return _epoch(ts)
+
+
 class MandateEngine:
-    def __init__(self, scribe=None):
-        # Reload schema to ensure latest version is always used in tests
-        global MANDATE_SCHEMA
-        with open(SPEC, 'r') as _f:
-            MANDATE_SCHEMA = json.load(_f)
-
-        # in-memory store for Phase 1 (replace with persistence later)
-        self.mandates = {}
+    def __init__(self, scribe=None, nonce_max_entries=None, nonce_max_age_seconds=None, storage=None,
+                 gate_expiry_seconds=None, auto_execute=False, auto_execution_max_entries=10_000):
+        # in-memory by default; pass a SQLiteStorage (see storage.open_storage) for durability
+        self.storage = storage or InMemoryStorage()
+        self.mandates = self.storage.mandates
         self.scribe = scribe
-        self.gate_engine = GateEngine()
+        # replay_nonce -> mandate_id; retention bounds memory on long-running nodes
+        self.nonce_index = NonceIndex(max_entries=nonce_max_entries, max_age_seconds=nonce_max_age_seconds)
+        self.gate_engine = GateEngine(storage=self.storage, mandate_resolver=self.mandates.get, scribe=scribe)
+        # approval gates opened by execute_mandate expire after this long (None: never)
+        self.gate_expiry_seconds = gate_expiry_seconds
+        self._auto_executor = None
+        self._auto_token = None
+        # mandate_id -> outcome of the execution its gate approval triggered, oldest first;
+        # only the latest auto_execution_max_entries are kept so long-running nodes stay bounded
+        self.auto_executions = OrderedDict()
+        self.auto_execution_max_entries = auto_execution_max_entries
+        self._auto_lock = threading.Lock()
+        if auto_execute:
+            self.enable_auto_execute()
+        # parent_mandate_id -> {child_id: None} (insertion-ordered set), rebuilt from storage on start
+        self.children = {}
+        # create_mandate's replay check-then-store is serialized per nonce, gate creation in
+        # execute_mandate per mandate; _tree_lock guards `children`
+        self._nonce_locks = StripedLock()
+        self._mandate_locks = StripedLock()
+        self._tree_lock = threading.Lock()
+        for child_id, parent_id in self.storage.iter_child_links():
+            self.children.setdefault(parent_id, {})[child_id] = None
 
     def validate_mandate(self, mandate):
         try:
-            validate(instance=mandate, schema=MANDATE_SCHEMA)
+            schema_registry.validate(mandate, SPEC)
         except ValidationError as e:
             raise MandateEngineError(f"Mandate validation error: {e.message}")
 
-    def create_mandate(self, mandate):
+    def _prepare(self, mandate):
         mandate = dict(mandate)
         if not mandate.get('mandate_id'):
             mandate['mandate_id'] = str(uuid.uuid4())
         mandate.setdefault('created_at', datetime.now(UTC).isoformat().replace('+00:00', 'Z'))
+        return mandate
+
+    def _replayed(self, replay):
+        original_id = self.nonce_index.get(replay)
+        if original_id is not None:
+            return self.mandates.get(original_id)
+        if self.storage.persistent:
+            # the index is a bounded cache in front of the store's own replay_nonce index
+            found = self.storage.find_mandates(replay_nonce=replay)
+            if found:
+                self.nonce_index.add(replay, found[0]['mandate_id'])
+                return found[0]
+        return None
+
+    def _store(self, mandate):
+        self.mandates[mandate['mandate_id']] = mandate
+        if mandate.get('replay_nonce'):
+            self.nonce_index.add(mandate['replay_nonce'], mandate['mandate_id'])
+        if mandate.get('parent_mandate_id'):
+            with self._tree_lock:
+                self.children.setdefault(mandate['parent_mandate_id'], {})[mandate['mandate_id']] = None
+
+    @staticmethod
+    def _created_entry(mandate):
+        return {
+            'entry_type': 'mandate_created',
+            'mandate_id': mandate['mandate_id'],
+            'payload': mandate
+        }
+
+    def create_mandate(self, mandate):
+        mandate = self._prepare(mandate)
 
         # validate
         self.validate_mandate(mandate)
 
-        # idempotency via replay_nonce (phase 1: simple scan)
+        # idempotency via replay_nonce
         replay = mandate.get('replay_nonce')
         if replay:
-            for m in self.mandates.values():
-                if m.get('replay_nonce') == replay:
-                    return m
-
-        self.mandates[mandate['mandate_id']] = mandate
+            with self._nonce_locks(replay):
+                original = self._replayed(replay)
+                if original is not None:
+                    return original
+                self._store(mandate)
+        else:
+            self._store(mandate)
 
         if self.scribe:
-            self.scribe.append_entry({
-                'entry_type': 'mandate_created',
-                'mandate_id': mandate['mandate_id'],
-                'payload': mandate
-            })
+            self.scribe.append_entry(self._created_entry(mandate))
         return mandate
 
+    def create_mandates(self, mandates):
+        """
+        Create a batch of mandates as one unit.
+
+        Every item is validated and de-duplicated by replay_nonce (against stored mandates and
+        earlier items in the same batch) before anything is stored; the accepted mandates are
+        then stored together and written to the scribe as a single grouped append. Invalid
+        items do not abort the batch.
+
+        Returns one result per input item, in order:
+            {'index': i, 'status': 'created' | 'duplicate', 'mandate': {...}}
+            {'index': i, 'status': 'error', 'error': '...'}
+        """
+        results = []
+        valid = []
+        for index, payload in enumerate(mandates):
+            try:
+                mandate = self._prepare(payload)
+                self.validate_mandate(mandate)
+            except (MandateEngineError, TypeError, ValueError) as e:
+                results.append({'index': index, 'status': 'error', 'error': str(e)})
+                continue
+            result = {'index': index, 'status': 'created', 'mandate': mandate}
+            results.append(result)
+            valid.append(result)
+
+        accepted = []
+        batch_nonces = {}
+        nonces = [r['mandate']['replay_nonce'] for r in valid if r['mandate'].get('replay_nonce')]
+        with self._nonce_locks.held(nonces):
+            for result in valid:
+                mandate = result['mandate']
+                replay = mandate.get('replay_nonce')
+                if replay:
+                    original = batch_nonces.get(replay) or self._replayed(replay)
+                    if original is not None:
+                        result['status'], result['mandate'] = 'duplicate', original
+                        continue
+                    batch_nonces[replay] = mandate
+                accepted.append(mandate)
+
+            with self.storage.transaction():
+                for mandate in accepted:
+                    self._store(mandate)
+        if self.scribe and accepted:
+            self.scribe.append_entries([self._created_entry(m) for m in accepted])
+        return results
+
     def create_submandate(self, parent_id, subpayload):
         parent = self.mandates.get(parent_id)
         if not parent:
@@ -84,10 +212,63 @@ class MandateEngine:
 
         return self.create_mandate(sub)
 
-    def process_fees(self, mandate_id):
-        mandate = self.mandates.get(mandate_id)
-        if not mandate:
-            raise MandateEngineError('Mandate not found for fee processing')
+    def get_children(self, mandate_id):
+        """Direct sub-mandate IDs of mandate_id, in creation order."""
+        with self._tree_lock:
+            return list(self.children.get(mandate_id, ()))
+
+    def iter_descendants(self, mandate_id, include_self=False):
+        """
+        Yield (mandate_id, depth) for every mandate below mandate_id, breadth-first.
+        Iterative, so delegation chains thousands of levels deep are fine.
+        """
+        if mandate_id not in self.mandates:
+            raise MandateEngineError('Mandate not found')
+        if include_self:
+            yield mandate_id, 0
+        queue = deque([(mandate_id, 0)])
+        seen = {mandate_id}
+        while queue:
+            node, depth = queue.popleft()
+            for child in self.get_children(node):
+                if child not in seen:
+                    seen.add(child)
+                    yield child, depth + 1
+                    queue.append((child, depth + 1))
+
+    def list_descendants(self, mandate_id):
+        return [mid for mid, _ in self.iter_descendants(mandate_id)]
+
+    def subtree_stats(self, mandate_id):
+        """Size (mandates including the root) and depth (edges on the longest path) of a subtree."""
+        size, depth = 0, 0
+        for _, d in self.iter_descendants(mandate_id, include_self=True):
+            size += 1
+            depth = max(depth, d)
+        return {'mandate_id': mandate_id, 'size': size, 'depth': depth}
+
+    def rollup_fees(self, mandate_id):
+        """
+        Aggregate process_fees() over a whole delegation tree in a single walk.
+        Totals are kept per currency so mixed-currency trees are not summed together.
+        """
+        totals = {}
+        size, depth = 0, 0
+        for mid, d in self.iter_descendants(mandate_id, include_self=True):
+            mandate = self.mandates[mid]
+            split = self._fee_split(mandate)
+            bucket = totals.setdefault(mandate.get('currency', 'USD'), {
+                'amount': 0.0, 'protocol_amount': 0.0, 'validator_amount': 0.0, 'issuer_amount': 0.0,
+            })
+            bucket['amount'] += mandate.get('amount', 0.0)
+            for key, value in split.items():
+                bucket[key] += value
+            size += 1
+            depth = max(depth, d)
+        return {'mandate_id': mandate_id, 'size': size, 'depth': depth, 'totals': totals}
+
+    @staticmethod
+    def _fee_split(mandate):
         total = mandate.get('amount', 0.0)
         fees = mandate.get('fee_distribution', {})
         protocol_share = fees.get('protocol', 0.0)
@@ -99,6 +280,89 @@ class MandateEngine:
             'issuer_amount': issuer_share * total
         }
 
+    def process_fees(self, mandate_id):
+        mandate = self.mandates.get(mandate_id)
+        if not mandate:
+            raise MandateEngineError('Mandate not found for fee processing')
+        return self._fee_split(mandate)
+
+    def settle_fees(self, mandate_ids=None, currency=None, issuer=None, since=None, until=None, use_numpy=None):
+        """
+        Bulk fee settlement over many mandates (see settlement.settle for the result shape).
+
+        Select mandates either by explicit mandate_ids or by filter: currency, issuer and a
+        created_at range [since, until) given as datetimes or ISO-8601 strings; a bound that
+        cannot be parsed raises MandateEngineError. Mandates whose created_at cannot be parsed
+        are left out of a ranged selection.
+        Amounts are returned as exact integer minor units.
+        """
+        if mandate_ids is not None:
+            selected = []
+            for mid in mandate_ids:
+                mandate = self.mandates.get(mid)
+                if not mandate:
+                    raise MandateEngineError(f'Mandate not found for fee processing: {mid}')
+                selected.append(mandate)
+        else:
+            selected = self.storage.find_mandates(issuer=issuer) if issuer else list(self.storage.iter_mandates())
+            if currency is not None or since is not None or until is not None:
+                since, until = _bound('since', since), _bound('until', until)
+                ranged = since is not None or until is not None
+
+                def in_range(created):
+                    created = _epoch(created) if ranged else None
+                    return not ranged or (created is not None and (since is None or created >= since)
+                                          and (until is None or created < until))
+
+                selected = [
+                    m for m in selected
+                    if (currency is None or m.get('currency', 'USD') == currency) and in_range(m.get('created_at'))
+                ]
+        return settlement.settle(selected, use_numpy=use_numpy)
+
+    def enable_auto_execute(self, executor=None):
+        """
+        Execute a mandate as soon as its approval gate is approved, instead of waiting for the
+        caller to retry. executor(mandate_id) defaults to execute_mandate; the API passes its
+        ExecutionPipeline so the execution runs in the background. What the executor returned
+        (or the error it raised) is kept in auto_executions under the mandate_id; see
+        auto_execution().
+        """
+        self._auto_executor = executor or self.execute_mandate
+        if self._auto_token is None:
+            self._auto_token = self.gate_engine.subscribe(self._on_gate_transition)
+
+    def disable_auto_execute(self):
+        if self._auto_token is not None:
+            self.gate_engine.unsubscribe(self._auto_token)
+        self._auto_token = self._auto_executor = None
+
+    def _on_gate_transition(self, gate, previous_status):
+        executor = self._auto_executor
+        mandate_id = gate['mandate_id']
+        if not executor or gate['status'] != 'approved' or mandate_id not in self.mandates:
+            return
+        try:
+            result = executor(mandate_id)
+        except Exception as e:
+            print(f"[MandateEngine] Auto-execution of {mandate_id} failed: {e}")
+            self._record_auto_execution(mandate_id, {'gate_id': gate['gate_id'], 'status': 'failed', 'error': str(e)})
+            return
+        self._record_auto_execution(mandate_id, {'gate_id': gate['gate_id'], 'status': 'started', 'result': result})
+
+    def _record_auto_execution(self, mandate_id, outcome):
+        with self._auto_lock:
+            self.auto_executions.pop(mandate_id, None)
+            self.auto_executions[mandate_id] = outcome
+            if self.auto_execution_max_entries is not None:
+                while len(self.auto_executions) > self.auto_execution_max_entries:
+                    self.auto_executions.popitem(last=False)
+
+    def auto_execution(self, mandate_id):
+        """Outcome of the execution the mandate's gate approval started, or None (never, or evicted)."""
+        with self._auto_lock:
+            return self.auto_executions.get(mandate_id)
+
     def execute_mandate(self, mandate_id, executor_id='system'):
         mandate = self.mandates.get(mandate_id)
         if not mandate:
@@ -107,16 +371,20 @@ class MandateEngine:
         # Check for human approval if required
         required_approvers = mandate.get('intent', {}).get('requires_approval', [])
         if required_approvers:
-            gate = self.gate_engine.get_gate_by_mandate_id(mandate_id)
-            if gate:
-                if gate['status'] == 'pending':
-                    raise MandateEngineError(f"Mandate {mandate_id} requires human approval and is pending. Gate ID: {gate['gate_id']}")
-                elif gate['status'] == 'rejected':
-                    raise MandateEngineError(f"Mandate {mandate_id} was rejected by human approvers. Gate ID: {gate['gate_id']}")
-                # If approved, proceed
-            else: # Gate not found, create it
-                gate = self.gate_engine.create_gate(mandate_id, required_approvers, mandate)
-                raise MandateEngineError(f"Mandate {mandate_id} requires human approval. A new gate (ID: {gate['gate_id']}) has been created and is pending.")
+            # one lookup-or-create at a time per mandate, so concurrent executions share one gate
+            with self._mandate_locks(mandate_id):
+                gate = self.gate_engine.get_gate_by_mandate_id(mandate_id)
+                if not gate:
+                    gate = self.gate_engine.create_gate(mandate_id, required_approvers, mandate,
+                                                        expires_in_seconds=self.gate_expiry_seconds)
+                    raise MandateEngineError(f"Mandate {mandate_id} requires human approval. A new gate (ID: {gate['gate_id']}) has been created and is pending.")
+            if gate['status'] == 'pending':
+                raise MandateEngineError(f"Mandate {mandate_id} requires human approval and is pending. Gate ID: {gate['gate_id']}")
+            elif gate['status'] == 'rejected':
+                raise MandateEngineError(f"Mandate {mandate_id} was rejected by human approvers. Gate ID: {gate['gate_id']}")
+            elif gate['status'] == 'expired':
+                raise MandateEngineError(f"Mandate {mandate_id} approval gate expired before it was resolved. Gate ID: {gate['gate_id']}")
+            # If approved, proceed
 
         # Phase 1: mock execution — record action and compute fees
         result = {
@@ -0,0 +1,77 @@
+"""
+Replay-nonce index for mandate idempotency.
+
+Maps replay_nonce -> mandate_id in insertion order so lookups are O(1) and the
+oldest entries can be evicted cheaply. Retention is bounded by count
+(max_entries) and/or age (max_age_seconds); once a nonce is evicted a replay
+with that nonce is treated as a new mandate. Safe to share between threads.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+
+class NonceIndex:
+    def __init__(self, max_entries: int = None, max_age_seconds: float = None, clock=time.monotonic):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError('max_entries must be >= 1')
+        if max_age_seconds is not None and max_age_seconds <= 0:
+            raise ValueError('max_age_seconds must be > 0')
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self._clock = clock
+        # nonce -> (mandate_id, inserted_at); oldest first
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, nonce):
+        return self.get(nonce) is not None
+
+    def get(self, nonce):
+        """Return the mandate_id recorded for nonce, or None if unknown or expired."""
+        with self._lock:
+            hit = self._entries.get(nonce)
+            if hit is None:
+                return None
+            if self.max_age_seconds is not None and self._clock() - hit[1] > self.max_age_seconds:
+                self.evict_expired()
+                return None
+            return hit[0]
+
+    def add(self, nonce, mandate_id):
+        """Record nonce -> mandate_id, evicting the oldest entries past the retention limits."""
+        with self._lock:
+            if nonce in self._entries:
+                return
+            self._entries[nonce] = (mandate_id, self._clock())
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            if self.max_age_seconds is not None:
+                self.evict_expired()
+
+    def discard(self, nonce):
+        with self._lock:
+            self._entries.pop(nonce, None)
+
+    def evict_expired(self) -> int:
+        """Drop entries older than max_age_seconds; returns how many were evicted."""
+        if self.max_age_seconds is None:
+            return 0
+        with self._lock:
+            cutoff = self._clock() - self.max_age_seconds
+            evicted = 0
+            while self._entries:
+                nonce, (_, inserted_at) = next(iter(self._entries.items()))
+                if inserted_at >= cutoff:
+                    break
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
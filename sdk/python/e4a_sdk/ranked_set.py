@@ -0,0 +1,152 @@
+"""
+Order-statistics set for the reputation leaderboard.
+
+RankedSet keeps distinct, comparable items sorted with O(log n) add / remove,
+rank (how many items sort below one) and positional access. Items live in
+sorted chunks of at most 2 * load items (so an insert moves a few hundred
+pointers, not n) and a Fenwick tree over the chunk lengths turns a position
+into (chunk, offset) in O(log n). Not thread-safe; ReputationIndex guards it
+with its own lock.
+"""
+from bisect import bisect_left, insort
+
+
+class RankedSet:
+    def __init__(self, items=(), load: int = 512):
+        if load < 1:
+            raise ValueError('load must be >= 1')
+        self._load = load
+        items = sorted(items)
+        self._chunks = [items[i:i + load] for i in range(0, len(items), load)]
+        self._maxes = [chunk[-1] for chunk in self._chunks]
+        self._len = len(items)
+        self._rebuild()
+
+    def __len__(self):
+        return self._len
+
+    def __contains__(self, item):
+        k = bisect_left(self._maxes, item)
+        if k == len(self._maxes):
+            return False
+        chunk = self._chunks[k]
+        return chunk[bisect_left(chunk, item)] == item
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            yield from chunk
+
+    # -- Fenwick tree over chunk lengths -------------------------------------
+    def _rebuild(self):
+        tree = [len(chunk) for chunk in self._chunks]
+        for i in range(len(tree)):
+            j = i | (i + 1)
+            if j < len(tree):
+                tree[j] += tree[i]
+        self._tree = tree
+
+    def _grow(self, k, delta):
+        tree = self._tree
+        while k < len(tree):
+            tree[k] += delta
+            k |= k + 1
+
+    def _before(self, k):
+        """Items in chunks[:k]."""
+        tree, total = self._tree, 0
+        while k > 0:
+            total += tree[k - 1]
+            k &= k - 1
+        return total
+
+    def _locate(self, pos):
+        """(chunk, offset) of the item at position pos."""
+        tree, k = self._tree, 0
+        step = 1 << len(tree).bit_length()
+        while step:
+            j = k + step
+            if j <= len(tree) and tree[j - 1] <= pos:
+                pos -= tree[j - 1]
+                k = j
+            step >>= 1
+        return k, pos
+
+    # -- updates -------------------------------------------------------------
+    def add(self, item):
+        """Insert item (which must not already be present)."""
+        chunks, maxes = self._chunks, self._maxes
+        self._len += 1
+        if not chunks:
+            chunks.append([item])
+            maxes.append(item)
+            self._rebuild()
+            return
+        k = bisect_left(maxes, item)
+        if k == len(maxes):
+            k -= 1
+            chunks[k].append(item)
+            maxes[k] = item
+        else:
+            insort(chunks[k], item)
+        chunk = chunks[k]
+        if len(chunk) > 2 * self._load:
+            half = len(chunk) // 2
+            chunks[k:k + 1] = [chunk[:half], chunk[half:]]
+            maxes[k:k + 1] = [chunk[half - 1], chunk[-1]]
+            self._rebuild()
+        else:
+            self._grow(k, 1)
+
+    def remove(self, item):
+        """Remove item; KeyError if absent."""
+        chunks, maxes = self._chunks, self._maxes
+        k = bisect_left(maxes, item)
+        if k == len(maxes):
+            raise KeyError(item)
+        chunk = chunks[k]
+        i = bisect_left(chunk, item)
+        if chunk[i] != item:
+            raise KeyError(item)
+        del chunk[i]
+        self._len -= 1
+        if not chunk:
+            del chunks[k], maxes[k]
+            self._rebuild()
+            return
+        if i == len(chunk):
+            maxes[k] = chunk[-1]
+        self._grow(k, -1)
+
+    # -- queries -------------------------------------------------------------
+    def rank(self, item) -> int:
+        """Number of items that sort before item (present or not)."""
+        k = bisect_left(self._maxes, item)
+        if k == len(self._maxes):
+            return self._len
+        return self._before(k) + bisect_left(self._chunks[k], item)
+
+    def __getitem__(self, pos: int):
+        if pos < 0:
+            pos += self._len
+        if not 0 <= pos < self._len:
+            raise IndexError('RankedSet index out of range')
+        k, i = self._locate(pos)
+        return self._chunks[k][i]
+
+    def walk(self, pos: int = 0, reverse: bool = False):
+        """Items from position pos upwards (or, with reverse, downwards). Do not modify while walking."""
+        if not 0 <= pos < self._len:
+            return
+        k, i = self._locate(pos)
+        chunks = self._chunks
+        if reverse:
+            while k >= 0:
+                chunk = chunks[k]
+                for j in range(i, -1, -1):
+                    yield chunk[j]
+                k -= 1
+                i = len(chunks[k]) - 1 if k >= 0 else 0
+        else:
+            while k < len(chunks):
+                yield from chunks[k][i:] if i else chunks[k]
+                k, i = k + 1, 0
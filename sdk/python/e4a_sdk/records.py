@@ -0,0 +1,228 @@
+"""
+Compact record types for stored mandates and gates.
+
+Stored mandates and gates were full nested dicts. These slotted dataclasses
+hold the same data with far less overhead:
+
+- known fields live in __slots__; anything else is kept in `extra`
+- DIDs, currencies, tones and other repeated strings are interned
+- identical fee_distribution dicts share one immutable tuple
+- list fields are stored as tuples
+
+to_dict() / from_dict() round-trip JSON-shaped documents losslessly:
+from_dict(d).to_dict() == d (absent keys stay absent, explicit None stays None).
+Sequences come back as lists, so a tuple in d returns as a list. Nested dicts
+with no compact form (a gate's payload, unknown keys in `extra`) are copied in
+and out, so neither the caller's document nor a returned one aliases the record.
+"""
+import copy
+import sys
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+    def __bool__(self):
+        return False
+
+
+MISSING = _Missing()
+
+# fee_distribution interning: keyed by (name, type, value) so 0 / 0.0 / False stay distinct;
+# once full, further distinct fee dicts are simply not shared
+_FEE_CACHE: Dict[tuple, tuple] = {}
+_FEE_CACHE_SIZE = 4096
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _tuple_of(value, intern=True):
+    if type(value) is list:
+        return tuple(_intern(v) for v in value) if intern else tuple(value)
+    return value
+
+
+def _list_of(value):
+    return list(value) if type(value) is tuple else value
+
+
+def _fees(value):
+    if type(value) is not dict:
+        return value
+    items = tuple(value.items())
+    try:
+        key = tuple((k, type(v), v) for k, v in items)
+        shared = _FEE_CACHE.get(key)
+    except TypeError:  # unhashable values; keep a private copy
+        return dict(value)
+    if shared is None:
+        if len(_FEE_CACHE) >= _FEE_CACHE_SIZE:
+            return items
+        shared = _FEE_CACHE.setdefault(key, items)
+    return shared
+
+
+def _split(cls, data: dict):
+    names = cls._field_set
+    known, extra = {}, None
+    for key, value in data.items():
+        if key in names:
+            known[key] = value
+        else:
+            if extra is None:
+                extra = {}
+            extra[key] = copy.deepcopy(value)
+    return known, extra
+
+
+def _get(record, key, default, converters):
+    if key in record._field_set:
+        value = getattr(record, key)
+        if value is MISSING:
+            return default
+        conv = converters.get(key)
+        return conv(value) if conv else value
+    if record.extra:
+        return record.extra.get(key, default)
+    return default
+
+
+def _emit(record, converters) -> dict:
+    out = {}
+    for name in record._field_names:
+        value = getattr(record, name)
+        if value is not MISSING:
+            conv = converters.get(name)
+            out[name] = conv(value) if conv else value
+    if record.extra:
+        out.update(copy.deepcopy(record.extra))
+    return out
+
+
+@dataclass(slots=True)
+class IntentRecord:
+    goal: Any = MISSING
+    expected_outcome: Any = MISSING
+    contextual_tone: Any = MISSING
+    statistical_purpose: Any = MISSING
+    requires_approval: Any = MISSING
+    extra: Optional[dict] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'IntentRecord':
+        known, extra = _split(cls, data)
+        if 'contextual_tone' in known:
+            known['contextual_tone'] = _intern(known['contextual_tone'])
+        if 'requires_approval' in known:
+            known['requires_approval'] = _tuple_of(known['requires_approval'])
+        return cls(extra=extra, **known)
+
+    def to_dict(self) -> dict:
+        return _emit(self, _INTENT_CONVERTERS)
+
+    def get(self, key, default=None):
+        return _get(self, key, default, _INTENT_CONVERTERS)
+
+
+_INTENT_CONVERTERS = {'requires_approval': _list_of}
+
+
+@dataclass(slots=True)
+class MandateRecord:
+    mandate_id: Any = MISSING
+    parent_mandate_id: Any = MISSING
+    issuer: Any = MISSING
+    beneficiary: Any = MISSING
+    amount: Any = MISSING
+    currency: Any = MISSING
+    created_at: Any = MISSING
+    validator_ref: Any = MISSING
+    replay_nonce: Any = MISSING
+    fee_distribution: Any = MISSING
+    policy_tags: Any = MISSING
+    intent: Any = MISSING
+    extra: Optional[dict] = None
+
+    _INTERNED = ('issuer', 'beneficiary', 'currency', 'validator_ref', 'parent_mandate_id')
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'MandateRecord':
+        known, extra = _split(cls, data)
+        for name in cls._INTERNED:
+            if name in known:
+                known[name] = _intern(known[name])
+        if 'fee_distribution' in known:
+            known['fee_distribution'] = _fees(known['fee_distribution'])
+        if 'policy_tags' in known:
+            known['policy_tags'] = _tuple_of(known['policy_tags'])
+        if type(known.get('intent')) is dict:
+            known['intent'] = IntentRecord.from_dict(known['intent'])
+        return cls(extra=extra, **known)
+
+    def to_dict(self) -> dict:
+        return _emit(self, _MANDATE_CONVERTERS)
+
+    def get(self, key, default=None):
+        """dict.get() equivalent, so read-only code can use a record in place of its dict."""
+        return _get(self, key, default, _MANDATE_CONVERTERS)
+
+
+def _fees_dict(value):
+    return dict(value) if type(value) is tuple else value
+
+
+def _intent_dict(value):
+    return value.to_dict() if type(value) is IntentRecord else value
+
+
+_MANDATE_CONVERTERS = {'fee_distribution': _fees_dict, 'policy_tags': _list_of, 'intent': _intent_dict}
+
+
+@dataclass(slots=True)
+class GateRecord:
+    gate_id: Any = MISSING
+    mandate_id: Any = MISSING
+    status: Any = MISSING
+    required_approvers: Any = MISSING
+    approvals: Any = MISSING
+    rejections: Any = MISSING
+    created_at: Any = MISSING
+    expires_at: Any = MISSING
+    payload: Any = MISSING
+    # set instead of payload when the gate's payload is its own mandate (see GateEngine)
+    payload_ref: Any = MISSING
+    extra: Optional[dict] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'GateRecord':
+        known, extra = _split(cls, data)
+        for name in ('status', 'mandate_id', 'payload_ref'):
+            if name in known:
+                known[name] = _intern(known[name])
+        for name in ('required_approvers', 'approvals', 'rejections'):
+            if name in known:
+                known[name] = _tuple_of(known[name])
+        if 'payload' in known:
+            known['payload'] = copy.deepcopy(known['payload'])
+        return cls(extra=extra, **known)
+
+    def to_dict(self) -> dict:
+        return _emit(self, _GATE_CONVERTERS)
+
+    def get(self, key, default=None):
+        return _get(self, key, default, _GATE_CONVERTERS)
+
+
+_GATE_CONVERTERS = {'required_approvers': _list_of, 'approvals': _list_of, 'rejections': _list_of,
+                    'payload': copy.deepcopy}
+
+for _cls in (IntentRecord, MandateRecord, GateRecord):
+    _cls._field_names = tuple(f.name for f in fields(_cls) if f.name != 'extra')
+    _cls._field_set = frozenset(_cls._field_names)
@@ -0,0 +1,277 @@
+"""
+Compact, bounded per-actor reputation history.
+
+ReputationIndex used to keep one dict per event per actor, forever. ActorHistory
+keeps instead:
+
+- a ring buffer of the most recent raw events as parallel typed arrays
+  (timestamp, delta, resulting score, interned context id), so an event costs
+  ~28 bytes instead of a dict of boxed floats and a string
+- hourly and daily aggregates (count, summed delta, min / max / last score) for
+  a configurable number of buckets, so older activity is still summarized after
+  its raw events have rotated out
+
+Contexts are interned in a ContextTable shared by all actors of an index.
+ActorHistory.dump() / load() convert a history to and from one compact blob
+(see reputation_store.py).
+"""
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, UTC
+
+HOUR = 3600
+DAY = 86400
+# format version, raw events, ring head, total events, hourly rows, daily rows
+_HEADER = struct.Struct('<BIIQII')
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, UTC).isoformat().replace('+00:00', 'Z')
+
+
+class ContextTable:
+    """
+    Interns context strings: each distinct context is stored once and referenced by id.
+    With a shared store, allocate(context) / lookup(id) give ids that every process agrees on.
+    """
+    __slots__ = ('names', '_ids', '_allocate', '_lookup')
+
+    def __init__(self, allocate=None, lookup=None):
+        self.names = {}
+        self._ids = {}
+        self._allocate = allocate
+        self._lookup = lookup
+
+    def add(self, i: int, context: str):
+        self.names[i] = context
+        self._ids[context] = i
+
+    def id(self, context: str) -> int:
+        i = self._ids.get(context)
+        if i is None:
+            i = self._allocate(context) if self._allocate else len(self.names)
+            self.add(i, context)
+        return i
+
+    def __getitem__(self, i: int) -> str:
+        name = self.names.get(i)
+        if name is None and self._lookup:
+            name = self._lookup(i)
+            self.add(i, name)
+        return name
+
+    def __len__(self):
+        return len(self.names)
+
+
+class Buckets:
+    """Aggregates per `width`-second bucket, oldest first, keeping at most `keep` buckets."""
+    __slots__ = ('width', 'keep', 'start', 'count', 'delta', 'low', 'high', 'last')
+
+    def __init__(self, width: int, keep: int):
+        self.width = width
+        self.keep = keep
+        self.start = array('q')
+        self.count = array('I')
+        self.delta = array('d')
+        self.low = array('d')
+        self.high = array('d')
+        self.last = array('d')
+
+    def _columns(self):
+        return self.start, self.count, self.delta, self.low, self.high, self.last
+
+    def add(self, ts: float, delta: float, score: float):
+        i = self._slot(ts, score)
+        if i is None:
+            return
+        self.count[i] += 1
+        self.delta[i] += delta
+        self.low[i] = min(self.low[i], score)
+        self.high[i] = max(self.high[i], score)
+        self.last[i] = score
+
+    def extend(self, ts: float, deltas: list, scores: list):
+        """add() for several events at the same `ts`, with the same result."""
+        i = self._slot(ts, scores[0]) if deltas else None
+        if i is None:
+            return
+        self.count[i] += len(deltas)
+        total = self.delta[i]
+        for delta in deltas:  # summed in order, as successive add() calls would
+            total += delta
+        self.delta[i] = total
+        self.low[i] = min(self.low[i], min(scores))
+        self.high[i] = max(self.high[i], max(scores))
+        self.last[i] = scores[-1]
+
+    def _slot(self, ts: float, score: float):
+        """Index of the bucket holding `ts` (created seeded with `score` if needed), or None."""
+        if not self.keep:
+            return None
+        bucket = int(ts // self.width) * self.width
+        start = self.start
+        if start and start[-1] == bucket:
+            i = len(start) - 1
+        elif not start or bucket > start[-1]:
+            for col, value in zip(self._columns(), (bucket, 0, 0.0, score, score, score)):
+                col.append(value)
+            if len(start) > self.keep:
+                for col in self._columns():
+                    del col[0]
+            i = len(start) - 1
+        else:  # late event for an older bucket
+            i = bisect_left(start, bucket)
+            if start[i] != bucket:
+                if len(start) >= self.keep and i == 0:
+                    return None  # older than anything retained
+                for col, value in zip(self._columns(), (bucket, 0, 0.0, score, score, score)):
+                    col.insert(i, value)
+                if len(start) > self.keep:
+                    for col in self._columns():
+                        del col[0]
+                    i -= 1
+        return i
+
+    def score_at(self, ts: float):
+        """(last score, bucket end) of the newest bucket closed by `ts`, or None."""
+        i = bisect_right(self.start, ts - self.width) - 1
+        if i < 0:
+            return None
+        return self.last[i], self.start[i] + self.width
+
+    def _trim(self):
+        extra = len(self.start) - self.keep
+        if extra > 0:
+            for col in self._columns():
+                del col[:extra]
+
+    def rows(self) -> list:
+        return [{'start': _iso(s), 'count': c, 'delta': d, 'min_score': lo, 'max_score': hi, 'last_score': la}
+                for s, c, d, lo, hi, la in zip(*self._columns())]
+
+    def __len__(self):
+        return len(self.start)
+
+
+class ActorHistory:
+    """
+    Args:
+        capacity: raw events kept (oldest are overwritten); None keeps every event.
+        hourly_buckets / daily_buckets: aggregate buckets kept at each resolution (0 disables).
+    """
+    __slots__ = ('capacity', 'total', '_head', 'ts', 'delta', 'score', 'context', 'hourly', 'daily')
+
+    def __init__(self, capacity: int = 1000, hourly_buckets: int = 168, daily_buckets: int = 365):
+        self.capacity = capacity
+        self.total = 0  # events ever recorded, including rotated-out ones
+        self._head = 0  # next slot to overwrite once the ring is full
+        self.ts = array('d')
+        self.delta = array('d')
+        self.score = array('d')
+        self.context = array('I')
+        self.hourly = Buckets(HOUR, hourly_buckets)
+        self.daily = Buckets(DAY, daily_buckets)
+
+    def append(self, ts: float, delta: float, score: float, context_id: int):
+        if self.capacity is None or len(self.ts) < self.capacity:
+            self.ts.append(ts)
+            self.delta.append(delta)
+            self.score.append(score)
+            self.context.append(context_id)
+        elif self.capacity:
+            i = self._head
+            self.ts[i], self.delta[i], self.score[i], self.context[i] = ts, delta, score, context_id
+            self._head = (i + 1) % self.capacity
+        self.total += 1
+        self.hourly.add(ts, delta, score)
+        self.daily.add(ts, delta, score)
+
+    def extend(self, ts: float, deltas: list, scores: list, context_ids: list):
+        """Append several events recorded at `ts`, oldest first; same result as append() for each."""
+        n = len(deltas)
+        if self.capacity is None or len(self.ts) + n <= self.capacity:
+            self.ts.extend([ts] * n)
+            self.delta.extend(deltas)
+            self.score.extend(scores)
+            self.context.extend(context_ids)
+        elif self.capacity:
+            self._linearize()
+            for col, values in ((self.ts, [ts] * n), (self.delta, deltas), (self.score, scores),
+                                (self.context, context_ids)):
+                col.extend(values[-self.capacity:])
+                del col[:len(col) - self.capacity]
+        self.total += n
+        self.hourly.extend(ts, deltas, scores)
+        self.daily.extend(ts, deltas, scores)
+
+    def __len__(self):
+        return len(self.ts)
+
+    def _order(self):
+        n = len(self.ts)
+        return range(self._head, self._head + n) if self._head else range(n)
+
+    def score_at(self, ts: float):
+        """(score, timestamp) of the newest retained event at or before `ts`, or None."""
+        n = len(self.ts)
+        times, head = self.ts, self._head
+        i = bisect_right(self._order(), ts, key=lambda k: times[k % n]) - 1
+        if i < 0:
+            return None
+        i = (head + i) % n
+        return self.score[i], times[i]
+
+    def _linearize(self):
+        """Reorder the ring oldest-first (head back at 0)."""
+        if self._head:
+            for col in (self.ts, self.delta, self.score, self.context):
+                col[:] = col[self._head:] + col[:self._head]
+            self._head = 0
+
+    def dump(self) -> bytes:
+        parts = [_HEADER.pack(1, len(self.ts), self._head, self.total, len(self.hourly), len(self.daily))]
+        parts += [col.tobytes() for col in (self.ts, self.delta, self.score, self.context,
+                                            *self.hourly._columns(), *self.daily._columns())]
+        return b''.join(parts)
+
+    @classmethod
+    def load(cls, blob: bytes, capacity: int = 1000, hourly_buckets: int = 168,
+             daily_buckets: int = 365) -> 'ActorHistory':
+        """Rebuild a dumped history under (possibly different) retention settings."""
+        history = cls(capacity, hourly_buckets, daily_buckets)
+        version, n, head, history.total, n_hourly, n_daily = _HEADER.unpack_from(blob)
+        if version != 1:
+            raise ValueError(f'unknown reputation history format: {version}')
+        offset = _HEADER.size
+        counts = [n] * 4 + [n_hourly] * 6 + [n_daily] * 6
+        cols = (history.ts, history.delta, history.score, history.context,
+                *history.hourly._columns(), *history.daily._columns())
+        for col, count in zip(cols, counts):
+            size = col.itemsize * count
+            col.frombytes(blob[offset:offset + size])
+            offset += size
+        history._head = head
+        if (head and n != capacity) or (capacity is not None and n > capacity):
+            history._linearize()
+            if capacity is not None:
+                for col in cols[:4]:
+                    del col[:max(0, n - capacity)]
+        history.hourly._trim()
+        history.daily._trim()
+        return history
+
+    def events(self, contexts: ContextTable, timestamps: bool = True) -> list:
+        """
+        Retained raw events, oldest first, in the dict shape ReputationIndex always returned
+        plus an ISO `timestamp` (formatting it dominates the cost; pass timestamps=False to skip).
+        """
+        n = len(self.ts)
+        delta, score, context = self.delta, self.score, self.context
+        if not timestamps:
+            return [{'delta': delta[i % n], 'context': contexts[context[i % n]], 'new_score': score[i % n]}
+                    for i in self._order()]
+        return [{'delta': delta[i % n], 'context': contexts[context[i % n]], 'new_score': score[i % n],
+                 'timestamp': _iso(self.ts[i % n])}
+                for i in self._order()]
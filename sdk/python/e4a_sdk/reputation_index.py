@@ -1,67 +1,621 @@
-from typing import Dict, List
+import heapq
+import math
+import threading
+import time
+import weakref
+from itertools import islice
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from .ranked_set import RankedSet
+from .reputation_history import ActorHistory, ContextTable
+from .reputation_store import ReputationStore
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+# How scribe entries move reputation, keyed by entry_type (or, for legacy entries, by their
+# free-text `event` lower-cased with spaces as underscores):
+#   delta    passed to record_action (scaled by the weight in ingest_event)
+#   actor    entry field naming the actor; falls back to the entry's `actor`, then 'api-node'
+#   context  history note
+DEFAULT_EVENT_RULES = {
+    'mandate_executed': {'delta': 1.0, 'actor': 'executor', 'context': 'Mandate executed successfully'},
+    'infraction': {'delta': -1.0, 'context': 'Infraction detected'},
+    'positive_behavior': {'delta': 1.0},
+    'negative_behavior': {'delta': -1.0},
+}
+# ingest_events() finishes in plain Python once fewer actors than this still have events left
+_BATCH_TAIL = 32
+# keeps leaderboard keys of decaying scores positive above 0.5 and negative below (log2 of the
+# smallest float is -1074)
+_RANK_OFFSET = 2048.0
+
+
+def _epoch(value: Union[float, str]) -> float:
+    """Epoch seconds from a number or an ISO 8601 string (naive means UTC)."""
+    if isinstance(value, str):
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    return float(value)
+
+
+def _later(since: Optional[float], ts: float) -> float:
+    # a late event (e.g. ingested out of order) does not move an actor's update time backwards
+    return ts if since is None else max(since, ts)
 
 
 class ReputationIndex:
-    def __init__(self):
+    def __init__(self, event_rules: Dict[str, Dict] = None, history_size: int = 1000,
+                 hourly_buckets: int = 168, daily_buckets: int = 365, clock=time.time, store=None,
+                 half_life: Optional[float] = None):
+        """
+        event_rules: entries merged over DEFAULT_EVENT_RULES (a None value drops a default rule),
+        e.g. the `reputation.event_rules` section of config.yaml.
+        history_size: raw events kept per actor (None: all); older ones survive only in the
+        hourly_buckets / daily_buckets aggregates (see reputation_history.py).
+        store: a ReputationStore (or a path to one) to warm-start from and checkpoint to.
+        half_life: seconds over which a score's distance from the neutral 0.5 halves while the
+        actor is inactive (None: scores never decay); set_half_life() overrides it per actor.
+        """
         # Initialize reputation storage
         self.scores: Dict[str, float] = {}
-        self.history: Dict[str, List[Dict]] = {}
+        # scores[actor] is the score as of updated[actor]; decay is applied when it is read
+        # or next updated, so idle actors cost nothing
+        self.updated: Dict[str, float] = {}
+        self.half_life = half_life
+        self._half_lives: Dict[str, Optional[float]] = {}
+        self._any_half_life = False
+        # every scored actor, in score order (see _rank_key), except those with their own
+        # half-life, whose order relative to the rest changes over time: they are merged in per query
+        self._ranking = RankedSet()
+        self._unranked = set()
+        # histories in memory; with a store, only those of actors touched by this process
+        self.history: Dict[str, ActorHistory] = {}
+        self.contexts = ContextTable()
+        self.history_size = history_size
+        self.hourly_buckets = hourly_buckets
+        self.daily_buckets = daily_buckets
+        self.clock = clock
+        # record_action is read-modify-write on a score; one lock keeps concurrent updates exact
+        self._lock = threading.RLock()
+        self._listeners = {}
+        self._next_token = 0
+        rules = {**DEFAULT_EVENT_RULES, **(event_rules or {})}
+        self.event_rules = {name: rule for name, rule in rules.items() if rule is not None}
+        # scribe -> number of its ledger entries already ingested
+        self._cursors = weakref.WeakKeyDictionary()
+        self._ingest_lock = threading.Lock()
+        # actor_id -> [(timestamp, delta, context_id)] applied here but not yet checkpointed
+        self._pending = {}
+        self._version = 0
+        self._checkpoint_lock = threading.Lock()
+        self._checkpoint_stop = threading.Event()
+        self._checkpointer = None
+        self.store = ReputationStore(store) if isinstance(store, str) else store
+        if self.store is not None:
+            self.contexts = ContextTable(self.store.context_id, self.store.context_text)
+            for context_id, text in self.store.load_contexts():
+                self.contexts.add(context_id, text)
+            rows, self._version = self.store.load_scores()
+            for actor_id, score, updated_at, half_life in rows:
+                self.scores[actor_id] = score
+                if updated_at is not None:
+                    self.updated[actor_id] = updated_at
+                if half_life is not None:
+                    self._half_lives[actor_id] = half_life
+                    self._any_half_life = True
+            self._unranked = {actor_id for actor_id in self.scores if not self._rankable(actor_id)}
+            self._ranking = RankedSet(self._rank_key(actor_id) for actor_id in self.scores
+                                      if actor_id not in self._unranked)
+
+    @property
+    def decays(self) -> bool:
+        """Whether any score decays over time."""
+        return self.half_life is not None or self._any_half_life
+
+    def set_half_life(self, actor_id: str, half_life: Optional[float]):
+        """Override the decay half-life (seconds) of one actor; None reverts to the index default."""
+        with self._lock:
+            now = self.clock()
+            scored = actor_id in self.scores
+            if scored:  # settle the decay accrued under the old half-life
+                self._unrank(actor_id)
+                self.scores[actor_id] = self._decay(actor_id, self.scores[actor_id], self.updated.get(actor_id), now)
+                self.updated[actor_id] = now
+            self._half_lives[actor_id] = half_life
+            self._any_half_life = self._any_half_life or half_life is not None
+            if scored:
+                self._rank(actor_id)
+            if self.store is not None:
+                self._pending.setdefault(actor_id, [])
+
+    def _decay(self, actor_id: str, score: float, since: Optional[float], at: float) -> float:
+        """`score`, set at `since`, decayed towards 0.5 until `at`."""
+        half_life = self._half_lives.get(actor_id)
+        if half_life is None:
+            half_life = self.half_life
+        if not half_life or since is None or at <= since:
+            return score
+        return 0.5 + (score - 0.5) * 0.5 ** ((at - since) / half_life)
+
+    @staticmethod
+    def _step(current: float, delta: float) -> float:
+        # Scale delta for gradual adjustment, clamped between 0–1
+        return max(0.0, min(1.0, current + (delta * 0.1)))
+
+    def _new_history(self, blob=None) -> ActorHistory:
+        if blob:
+            return ActorHistory.load(blob, self.history_size, self.hourly_buckets, self.daily_buckets)
+        return ActorHistory(self.history_size, self.hourly_buckets, self.daily_buckets)
+
+    # -- leaderboard ---------------------------------------------------------
+    def _rankable(self, actor_id: str) -> bool:
+        return self._half_lives.get(actor_id) is None and (not self.half_life or actor_id in self.updated)
+
+    def _rank_key(self, actor_id: str, score: float = None, since: float = None):
+        """
+        Sort key of an actor's score that stays valid while it decays. Under a shared half-life h,
+        0.5 + d * 2 ** (-(t - since) / h) sorts like sign(d) * (log2|d| + since / h), for every t.
+        """
+        if score is None:
+            score, since = self.scores[actor_id], self.updated.get(actor_id)
+        if not self.half_life:
+            return score, actor_id
+        d = score - 0.5
+        if not d:
+            return 0.0, actor_id
+        key = math.log2(abs(d)) + since / self.half_life + _RANK_OFFSET
+        return (key if d > 0 else -key), actor_id
+
+    def _unrank(self, actor_id: str):
+        # before a scored actor's score, update time or half-life changes
+        if actor_id in self._unranked:
+            self._unranked.discard(actor_id)
+        else:
+            self._ranking.remove(self._rank_key(actor_id))
+
+    def _rank(self, actor_id: str):
+        if self._rankable(actor_id):
+            self._ranking.add(self._rank_key(actor_id))
+        else:
+            self._unranked.add(actor_id)
+
+    def _current(self, actor_id: str, now: float) -> float:
+        return self._decay(actor_id, self.scores[actor_id], self.updated.get(actor_id), now)
+
+    def _ordered(self, start: int, reverse: bool, now: float):
+        """(actor_id, score) pairs from position `start` of the ascending (or, reversed, descending) order."""
+        ranking = self._ranking
+        if not self._unranked:
+            pos = len(ranking) - 1 - start if reverse else start
+            return ((actor_id, self._current(actor_id, now)) for _, actor_id in ranking.walk(pos, reverse))
+        ranked = ((actor_id, self._current(actor_id, now))
+                  for _, actor_id in ranking.walk(len(ranking) - 1 if reverse else 0, reverse))
+        own = sorted(((actor_id, self._current(actor_id, now)) for actor_id in self._unranked),
+                     key=lambda pair: (pair[1], pair[0]), reverse=reverse)
+        merged = heapq.merge(ranked, own, key=lambda pair: (pair[1], pair[0]), reverse=reverse)
+        return islice(merged, start, None)
+
+    def _page(self, reverse: bool, limit: int, offset: int, bound: Optional[float]) -> List[Dict]:
+        if limit < 0 or offset < 0:
+            raise ValueError("limit and offset must be >= 0")
+        with self._lock:
+            total, page = len(self.scores), []
+            for i, (actor_id, score) in enumerate(islice(self._ordered(offset, reverse, self.clock()), limit)):
+                if bound is not None and (score < bound if reverse else score > bound):
+                    break
+                rank = offset + i + 1 if reverse else total - offset - i
+                page.append({"actor_id": actor_id, "score": score, "rank": rank})
+            return page
+
+    def top(self, limit: int = 10, offset: int = 0, min_score: float = None) -> List[Dict]:
+        """
+        The highest current scores, best first: [{actor_id, score, rank}], rank 1 being the best.
+        Paginate with offset; min_score stops the page at the first score below it. O(log n + limit).
+        """
+        return self._page(True, limit, offset, min_score)
+
+    def bottom(self, limit: int = 10, offset: int = 0, max_score: float = None) -> List[Dict]:
+        """The lowest current scores, worst first (see top()); max_score stops at the first score above it."""
+        return self._page(False, limit, offset, max_score)
+
+    def rank_of(self, actor_id: str) -> Optional[int]:
+        """
+        1-based position of the actor from the top (equal scores ordered by actor_id, descending),
+        or None if unscored.
+        """
+        with self._lock:
+            if actor_id not in self.scores:
+                return None
+            now = self.clock()
+            if actor_id in self._unranked:
+                score = self._current(actor_id, now)
+                below = self._ranking.rank(self._rank_key(actor_id, score, now))
+            else:
+                score = None
+                below = self._ranking.rank(self._rank_key(actor_id))
+            if self._unranked:
+                score = self._current(actor_id, now) if score is None else score
+                below += sum(1 for other in self._unranked
+                             if (self._current(other, now), other) < (score, actor_id))
+            return len(self.scores) - below
+
+    def percentile(self, actor_id: str) -> Optional[float]:
+        """Share of the other actors scoring below this one, 0-100 (100: the top), or None if unscored."""
+        with self._lock:
+            rank = self.rank_of(actor_id)
+            if rank is None:
+                return None
+            total = len(self.scores)
+            return 100.0 if total == 1 else 100.0 * (total - rank) / (total - 1)
+
+    def score_at_percentile(self, p: float) -> Optional[float]:
+        """The current score at percentile p (0: the lowest, 100: the highest), or None if nobody is scored."""
+        if not 0 <= p <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+        with self._lock:
+            if not self.scores:
+                return None
+            pos = round(p / 100 * (len(self.scores) - 1))
+            return next(self._ordered(pos, False, self.clock()))[1]
+
+    def _history_for(self, actor_id: str) -> ActorHistory:
+        """The actor's history, loaded from the store (plus not yet checkpointed events) on first use."""
+        history = self.history.get(actor_id)
+        if history is None:
+            row = self.store.load_actor(actor_id) if self.store is not None else None
+            history = self._new_history(row[1] if row else None)
+            score, since = (row[0], row[2]) if row else (0.5, None)
+            for ts, delta, context_id in self._pending.get(actor_id, ()):
+                score = self._step(self._decay(actor_id, score, since, ts), delta)
+                since = _later(since, ts)
+                history.append(ts, delta, score, context_id)
+            self.history[actor_id] = history
+        return history
 
-    def record_action(self, actor_id: str, delta: float, context: str = ""):
+    def record_action(self, actor_id: str, delta: float, context: str = "", ts: float = None):
         """
         Record an action's effect on reputation.
         Positive deltas increase trust; negative ones decrease it.
+        ts: when the action happened (epoch seconds; default: now), e.g. the time a scribe
+        entry was logged, so decay and scores_as_of() do not depend on when it was ingested.
         """
-        # Default starting point
-        current = self.scores.get(actor_id, 0.5)
+        with self._lock:
+            # Default starting point, decayed since the actor's last update
+            ts = self.clock() if ts is None else ts
+            current = self._decay(actor_id, self.scores.get(actor_id, 0.5), self.updated.get(actor_id), ts)
+            normalized = self._step(current, delta)
 
-        # Scale delta for gradual adjustment
-        updated = current + (delta * 0.1)
-        normalized = max(0.0, min(1.0, updated))  # Clamp between 0–1
-
-        # Store
-        self.scores[actor_id] = normalized
-        self.history.setdefault(actor_id, []).append(
-            {"delta": delta, "context": context, "new_score": normalized}
-        )
+            # Store
+            if actor_id in self.scores:
+                self._unrank(actor_id)
+            self.scores[actor_id] = normalized
+            self.updated[actor_id] = _later(self.updated.get(actor_id), ts)
+            self._rank(actor_id)
+            context_id = self.contexts.id(context)
+            self._history_for(actor_id).append(ts, delta, normalized, context_id)
+            if self.store is not None:
+                self._pending.setdefault(actor_id, []).append((ts, delta, context_id))
+            listeners = list(self._listeners.values()) if normalized != current else ()
+        # outside the lock, so listeners may read scores or take their own locks
+        for listener in listeners:
+            listener(actor_id, current, normalized)
         return normalized
 
+    def subscribe(self, listener) -> int:
+        """Call listener(actor_id, old_score, new_score) whenever a score changes; returns a token."""
+        with self._lock:
+            self._next_token += 1
+            self._listeners[self._next_token] = listener
+            return self._next_token
+
+    def unsubscribe(self, token: int):
+        with self._lock:
+            self._listeners.pop(token, None)
+
     def get_score(self, actor_id: str) -> float:
         """Return normalized reputation between 0.0 and 1.0."""
-        return self.scores.get(actor_id, 0.5)
+        score = self.scores.get(actor_id, 0.5)
+        if not self.decays:
+            return score
+        return self._decay(actor_id, score, self.updated.get(actor_id), self.clock())
+
+    def scores_as_of(self, at: Union[float, str], actor_ids: Iterable[str] = None) -> Dict[str, Optional[float]]:
+        """
+        Scores at time `at` (epoch seconds or ISO 8601), for audits: every known actor, or
+        `actor_ids`. A past time is answered from the actor's retained raw events, then from
+        its hourly / daily aggregates (decayed from the end of the last bucket closed by then);
+        None when `at` predates everything retained. Actors with no action by then score 0.5.
+        """
+        at = _epoch(at)
+        with self._lock:
+            result = {}
+            for actor_id in (self.scores if actor_ids is None else actor_ids):
+                since = self.updated.get(actor_id)
+                if actor_id not in self.scores:
+                    result[actor_id] = 0.5
+                elif since is None or at >= since:
+                    result[actor_id] = self._decay(actor_id, self.scores[actor_id], since, at)
+                else:
+                    result[actor_id] = self._score_from_history(actor_id, at)
+            return result
+
+    def _score_from_history(self, actor_id: str, at: float) -> Optional[float]:
+        history = self._history_for(actor_id)
+        found = history.score_at(at)
+        if found is None and history.total == len(history):
+            return 0.5  # nothing rotated out: `at` precedes the actor's first action
+        for source in (history.hourly, history.daily):
+            if found is not None:
+                break
+            found = source.score_at(at)
+        return None if found is None else self._decay(actor_id, found[0], found[1], at)
 
     def ingest_event(self, actor_id: str, event_type: str, weight: float = 1.0):
         """
-        Adjust reputation based on an event type.
+        Adjust reputation based on an event type (see event_rules).
         """
-        if event_type in ("positive_behavior", "mandate_executed"):
-            return self.record_action(actor_id, abs(weight), f"Event: {event_type}")
-        elif event_type in ("infraction", "negative_behavior"):
-            return self.record_action(actor_id, -abs(weight), f"Event: {event_type}")
-        else:
-            return self.record_action(actor_id, 0.0, f"Neutral event: {event_type}")
+        rule = self.event_rules.get(event_type)
+        if rule and rule.get("delta"):
+            return self.record_action(actor_id, rule["delta"] * abs(weight), f"Event: {event_type}")
+        return self.record_action(actor_id, 0.0, f"Neutral event: {event_type}")
 
-    def ingest_from_scribe(self, scribe):
+    def ingest_events(self, actor_ids: Sequence[str], event_types: Sequence[str], weights: Sequence[float] = None):
         """
-        Scan ScribeAgent entries for relevant reputation updates.
+        ingest_event() for parallel sequences of events, applied in order and all stamped with
+        one clock reading: scores and histories come out exactly as from calling ingest_event()
+        for each event at that instant. Listeners hear once per actor whose score moved (score
+        before the batch, score after). Returns a list of each event's resulting score in input order.
+
+        Actors are mapped to dense indices and the clamped steps applied with NumPy, one round per
+        event rank within an actor (an actor's 1st events, then 2nd, ...) so each actor's updates
+        stay in order. Without NumPy this is a loop over ingest_event().
         """
+        n = len(actor_ids)
+        if len(event_types) != n or (weights is not None and len(weights) != n):
+            raise ValueError("actor_ids, event_types and weights must have the same length")
+        if np is None:
+            weights = [1.0] * n if weights is None else weights
+            return [self.ingest_event(actor_id, event_type, weight)
+                    for actor_id, event_type, weight in zip(actor_ids, event_types, weights)]
+        index, kinds = {}, {}
+        actors = np.fromiter((index.setdefault(a, len(index)) for a in actor_ids), dtype=np.intp, count=n)
+        kind = np.fromiter((kinds.setdefault(t, len(kinds)) for t in event_types), dtype=np.intp, count=n)
+        rule_deltas, contexts = [], []
+        for event_type in kinds:
+            rule = self.event_rules.get(event_type)
+            if rule and rule.get("delta"):
+                rule_deltas.append(rule["delta"])
+                contexts.append(f"Event: {event_type}")
+            else:
+                rule_deltas.append(0.0)
+                contexts.append(f"Neutral event: {event_type}")
+        deltas = np.asarray(rule_deltas, dtype=float)[kind]
+        if weights is not None:
+            deltas *= np.abs(np.asarray(weights, dtype=float))
+        return self._record_batch(list(index), actors, deltas, kind, contexts)
+
+    def _record_batch(self, names, actors, deltas, kind, contexts):
+        n = len(actors)
+        counts = np.bincount(actors, minlength=len(names))
+        order = np.argsort(actors, kind="stable")  # events grouped by actor, in input order
+        ends = np.cumsum(counts)
+        rank = np.empty(n, dtype=np.intp)  # how many earlier events the same actor has in the batch
+        rank[order] = np.arange(n) - np.repeat(ends - counts, counts)
+        by_round = np.argsort(rank, kind="stable")
+        round_ends = np.cumsum(np.bincount(rank))
+        notify = []
+        with self._lock:
+            ts = self.clock()
+            before = [self._decay(actor_id, self.scores.get(actor_id, 0.5), self.updated.get(actor_id), ts)
+                      for actor_id in names]
+            current = np.array(before, dtype=float)
+            after = np.empty(n)
+            steps = deltas * 0.1
+            start = 0
+            for end in round_ends.tolist():
+                if end - start < _BATCH_TAIL:
+                    break
+                events = by_round[start:end]
+                who = actors[events]  # distinct within a round
+                current[who] = after[events] = np.maximum(0.0, np.minimum(1.0, current[who] + steps[events]))
+                start = end
+            if start < n:  # few actors left with many events each: step them one by one
+                values, tail_actors, tail_steps = current.tolist(), actors.tolist(), steps.tolist()
+                for event in np.sort(by_round[start:]).tolist():
+                    a = tail_actors[event]
+                    values[a] = after[event] = max(0.0, min(1.0, values[a] + tail_steps[event]))
+
+            context_ids = np.array([self.contexts.id(c) for c in contexts], dtype=np.int64)
+            scores, steps_in, ctx = after[order].tolist(), deltas[order].tolist(), context_ids[kind[order]].tolist()
+            lo = 0
+            for actor_id, old, hi in zip(names, before, ends.tolist()):
+                new = scores[hi - 1]
+                if actor_id in self.scores:
+                    self._unrank(actor_id)
+                self.scores[actor_id] = new
+                self.updated[actor_id] = ts
+                self._rank(actor_id)
+                self._history_for(actor_id).extend(ts, steps_in[lo:hi], scores[lo:hi], ctx[lo:hi])
+                if self.store is not None:
+                    self._pending.setdefault(actor_id, []).extend(
+                        (ts, delta, context_id) for delta, context_id in zip(steps_in[lo:hi], ctx[lo:hi]))
+                if new != old:
+                    notify.append((actor_id, old, new))
+                lo = hi
+            listeners = list(self._listeners.values()) if notify else ()
+        for listener in listeners:
+            for change in notify:
+                listener(*change)
+        return after.tolist()
+
+    def _rule_for(self, entry):
+        rule = self.event_rules.get(entry.get("entry_type"))
+        if rule is None and isinstance(entry.get("event"), str):
+            rule = self.event_rules.get(entry["event"].strip().lower().replace(" ", "_"))
+        return rule
+
+    def _entry_time(self, entry) -> Optional[float]:
         try:
-            entries = getattr(scribe, "entries", [])
+            return _epoch(entry["timestamp"]) if entry.get("timestamp") else None
+        except (TypeError, ValueError):
+            return None  # unparseable: treat as happening now
+
+    def ingest_from_scribe(self, scribe) -> int:
+        """
+        Apply event_rules to the scribe entries not ingested yet; returns how many moved a score.
+        A cursor per scribe remembers how far its ledger has been read, so a call costs
+        O(new entries) and no entry is applied twice. Actions are dated by the entries' own
+        `timestamp`, not by when they are ingested.
+        """
+        with self._ingest_lock:
+            offset = self._cursors.get(scribe, 0)
+            if hasattr(scribe, "entries_since"):
+                entries, end = scribe.entries_since(offset)
+            else:  # duck-typed scribe exposing an append-only list
+                entries = getattr(scribe, "ledger", getattr(scribe, "entries", []))[offset:]
+                end = offset + len(entries)
+            applied = 0
             for entry in entries:
-                actor = entry.get("actor", "api-node")
-                event_type = entry.get("event", "")
-                if "mandate executed" in event_type.lower():
-                    self.record_action(actor, 1.0, "Mandate executed successfully")
-                elif "infraction" in event_type.lower():
-                    self.record_action(actor, -1.0, "Infraction detected")
-        except Exception as e:
-            print(f"[ReputationIndex] Ingest error: {e}")
+                try:
+                    rule = self._rule_for(entry)
+                    if rule and rule.get("delta"):
+                        actor = entry.get(rule.get("actor", "actor")) or entry.get("actor", "api-node")
+                        context = rule.get("context") or f"Event: {entry.get('entry_type') or entry.get('event')}"
+                        self.record_action(actor, rule["delta"], context, self._entry_time(entry))
+                        applied += 1
+                except Exception as e:
+                    print(f"[ReputationIndex] Ingest error: {e}")
+            self._cursors[scribe] = end
+            return applied
+
+    def history_of(self, actor_id: str, resolution: str = "raw") -> List[Dict]:
+        """
+        An actor's history, oldest first: the retained raw events ("raw") or the
+        "hourly" / "daily" aggregates.
+        """
+        with self._lock:
+            if actor_id not in self.scores:
+                return []
+            history = self._history_for(actor_id)
+            if resolution == "raw":
+                return history.events(self.contexts)
+            if resolution in ("hourly", "daily"):
+                return getattr(history, resolution).rows()
+            raise ValueError(f"unknown history resolution: {resolution}")
 
     def get_all(self) -> Dict[str, float]:
         """
-        Return all reputation scores and history for inspection or API output.
+        Return all reputation scores and the retained raw history for inspection or API output
+        (use history_of() for timestamps and aggregates). With a store, the history covers the
+        actors loaded by this process.
         """
-        return {
-            "scores": self.scores,
-            "history": self.history,
-        }
+        with self._lock:
+            if self.decays:
+                now = self.clock()
+                scores = {actor: self._decay(actor, score, self.updated.get(actor), now)
+                          for actor, score in self.scores.items()}
+            else:
+                scores = dict(self.scores)
+            return {
+                "scores": scores,
+                "history": {actor: h.events(self.contexts, timestamps=False) for actor, h in self.history.items()},
+            }
+
+    # -- persistence -------------------------------------------------------
+    def _merge(self, actor_id, row, events):
+        # runs inside the store transaction: replay this process's queued actions on the stored row
+        score, blob, since, half_life = row or (0.5, None, None, None)
+        half_life = self._half_lives.get(actor_id, half_life)
+        history = self._new_history(blob)
+        for ts, delta, context_id in events:
+            score = self._step(self._decay(actor_id, score, since, ts), delta)
+            since = _later(since, ts)
+            history.append(ts, delta, score, context_id)
+        return score, since, half_life, history.dump()
+
+    def checkpoint(self) -> int:
+        """
+        Write the actors changed since the last checkpoint to the store and pick up scores
+        other processes wrote meanwhile; returns the number of actors written.
+        """
+        if self.store is None:
+            return 0
+        with self._checkpoint_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            try:
+                written, changed, version = self.store.checkpoint(pending, self._merge, self._version)
+            except BaseException:
+                with self._lock:  # requeue ahead of anything recorded meanwhile
+                    for actor_id, events in pending.items():
+                        self._pending[actor_id] = events + self._pending.get(actor_id, [])
+                raise
+            notify = []
+            with self._lock:
+                self._version = version
+                for actor_id, (score, since, half_life) in {**changed, **written}.items():
+                    scored = actor_id in self.scores
+                    if scored:
+                        self._unrank(actor_id)
+                    if actor_id in self._pending:
+                        pass  # a set_half_life() made meanwhile wins until the next checkpoint
+                    elif half_life is not None:
+                        self._half_lives[actor_id] = half_life
+                        self._any_half_life = True
+                    else:
+                        self._half_lives.pop(actor_id, None)
+                    for ts, delta, _ in self._pending.get(actor_id, ()):
+                        score = self._step(self._decay(actor_id, score, since, ts), delta)
+                        since = _later(since, ts)
+                    current = self.scores.get(actor_id, 0.5)
+                    if score != current or since != self.updated.get(actor_id):
+                        # another process acted on this actor too; reload its merged history lazily
+                        self.scores[actor_id] = score
+                        if since is not None:
+                            self.updated[actor_id] = since
+                        self.history.pop(actor_id, None)
+                        if score != current:
+                            notify.append((actor_id, current, score))
+                    if scored or actor_id in self.scores:
+                        self._rank(actor_id)
+                listeners = list(self._listeners.values()) if notify else ()
+            for listener in listeners:
+                for change in notify:
+                    listener(*change)
+            return len(written)
+
+    def start_checkpoints(self, interval: float = 5.0):
+        """Checkpoint to the store every `interval` seconds in a background thread."""
+        if self.store is None or self._checkpointer is not None:
+            return self
+        self._checkpoint_stop.clear()
+        self._checkpointer = threading.Thread(target=self._checkpoint_loop, args=(interval,),
+                                              name='e4a-reputation-checkpoint', daemon=True)
+        self._checkpointer.start()
+        return self
+
+    def _checkpoint_loop(self, interval):
+        while not self._checkpoint_stop.wait(interval):
+            try:
+                self.checkpoint()
+            except Exception as e:
+                print(f"[ReputationIndex] Checkpoint error: {e}")
+
+    def stop_checkpoints(self):
+        if self._checkpointer is not None:
+            self._checkpoint_stop.set()
+            self._checkpointer.join()
+            self._checkpointer = None
+
+    def close(self):
+        """Stop background checkpoints, write what is left and close the store."""
+        self.stop_checkpoints()
+        if self.store is not None:
+            self.checkpoint()
+            self.store.close()
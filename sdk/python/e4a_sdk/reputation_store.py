@@ -0,0 +1,148 @@
+"""
+Persistent store for ReputationIndex.
+
+One SQLite (WAL) file holds every actor's score (as of its last update, for
+time decay), half-life override and compacted history (an ActorHistory blob),
+plus the interned contexts:
+
+    reputation(actor_id, score, history, version, updated_at, half_life)
+    contexts(id, text)
+    meta(key, value)          -- 'version': bumped by every checkpoint
+
+A ReputationIndex backed by a store loads all scores at startup (one indexed
+scan, no ledger replay) and each history only when that actor is touched.
+Actions are applied in memory and queued per actor; checkpoint() writes the
+dirty actors in one IMMEDIATE transaction. Several processes may share a
+store: a checkpoint re-applies the queued deltas on top of the score currently
+stored (so updates made by other processes are kept, not overwritten) and reads
+back every row other processes changed since this process last synced.
+"""
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Tuple
+
+
+class ReputationStoreError(Exception):
+    pass
+
+
+class ReputationStore:
+    _SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS reputation (
+               actor_id TEXT PRIMARY KEY,
+               score REAL NOT NULL,
+               history BLOB,
+               version INTEGER NOT NULL,
+               updated_at REAL,
+               half_life REAL)""",
+        'CREATE INDEX IF NOT EXISTS idx_reputation_version ON reputation (version)',
+        'CREATE TABLE IF NOT EXISTS contexts (id INTEGER PRIMARY KEY, text TEXT NOT NULL UNIQUE)',
+        'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)',
+    ]
+
+    def __init__(self, path: str, synchronous: str = 'NORMAL', timeout: float = 30.0):
+        self.path = path
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.RLock()
+        # autocommit; checkpoint() opens its own IMMEDIATE transaction
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=timeout)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(f'PRAGMA synchronous={synchronous}')
+        for stmt in self._SCHEMA:
+            self._conn.execute(stmt)
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(reputation)')}
+        for column in ('updated_at', 'half_life'):  # stores created before time decay
+            if column not in columns:
+                self._conn.execute(f'ALTER TABLE reputation ADD COLUMN {column} REAL')
+
+    # -- reads ---------------------------------------------------------------
+    def load_scores(self) -> Tuple[list, int]:
+        """(actor_id, score, updated_at, half_life) of every actor, and the version they reflect."""
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                rows = self._conn.execute('SELECT actor_id, score, updated_at, half_life FROM reputation').fetchall()
+                version = self._version()
+            finally:
+                self._conn.execute('COMMIT')
+        return rows, version
+
+    def load_actor(self, actor_id: str):
+        """(score, history blob, updated_at, half_life) of one actor, or None."""
+        with self._lock:
+            return self._conn.execute('SELECT score, history, updated_at, half_life FROM reputation '
+                                      'WHERE actor_id = ?', (actor_id,)).fetchone()
+
+    def load_contexts(self) -> List[Tuple[int, str]]:
+        with self._lock:
+            return self._conn.execute('SELECT id, text FROM contexts').fetchall()
+
+    def context_id(self, text: str) -> int:
+        with self._lock:
+            self._conn.execute('INSERT OR IGNORE INTO contexts (text) VALUES (?)', (text,))
+            return self._conn.execute('SELECT id FROM contexts WHERE text = ?', (text,)).fetchone()[0]
+
+    def context_text(self, context_id: int) -> str:
+        with self._lock:
+            row = self._conn.execute('SELECT text FROM contexts WHERE id = ?', (context_id,)).fetchone()
+        if row is None:
+            raise ReputationStoreError(f'unknown context id: {context_id}')
+        return row[0]
+
+    def _version(self) -> int:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return row[0] if row else 0
+
+    # -- writes --------------------------------------------------------------
+    def checkpoint(self, pending: Dict[str, list], merge: Callable, since: int):
+        """
+        In one transaction: for each actor, merge(actor_id, row, events) -> (score, updated_at,
+        half_life, history_blob) over the currently stored row (as load_actor(); None if absent),
+        and write the result.
+
+        Returns (written, changed_elsewhere, new version): written and changed_elsewhere map
+        actor_id -> (score, updated_at, half_life), the latter for rows other processes wrote
+        after version `since`.
+        """
+        with self._lock:
+            if not pending:  # nothing to write: only pick up other processes' changes
+                self._conn.execute('BEGIN')
+                try:
+                    version = self._version()
+                    changed = self._changed('version > ?', (since,))
+                finally:
+                    self._conn.execute('COMMIT')
+                return {}, changed, version
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                version = self._version() + 1
+                written = {}
+                for actor_id, events in pending.items():
+                    row = self.load_actor(actor_id)
+                    score, updated_at, half_life, blob = merge(actor_id, row, events)
+                    self._conn.execute(
+                        'INSERT INTO reputation (actor_id, score, history, version, updated_at, half_life) '
+                        'VALUES (?, ?, ?, ?, ?, ?) '
+                        'ON CONFLICT (actor_id) DO UPDATE SET score = excluded.score, history = excluded.history, '
+                        'version = excluded.version, updated_at = excluded.updated_at, half_life = excluded.half_life',
+                        (actor_id, score, blob, version, updated_at, half_life))
+                    written[actor_id] = (score, updated_at, half_life)
+                changed = self._changed('version > ? AND version < ?', (since, version))
+                self._conn.execute("INSERT INTO meta (key, value) VALUES ('version', ?) "
+                                   'ON CONFLICT (key) DO UPDATE SET value = excluded.value', (version,))
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+        return written, changed, version
+
+    def _changed(self, where, params):
+        rows = self._conn.execute(f'SELECT actor_id, score, updated_at, half_life FROM reputation WHERE {where}',
+                                  params)
+        return {actor_id: (score, updated_at, half_life) for actor_id, score, updated_at, half_life in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,83 @@
+"""
+Process-wide registry of compiled JSON Schema validators.
+
+Each schema file (by default those in specs/) is read and parsed once, checked,
+and compiled into the validator class named by its "$schema" keyword
+(Draft 7 or 2020-12). Every engine, adapter and tool shares the same compiled
+validator instead of re-reading the spec on each call.
+"""
+import json
+import os
+import threading
+from typing import Any, Dict
+
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+
+SPEC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'specs'))
+
+_lock = threading.Lock()
+_validators: Dict[str, Any] = {}
+
+
+def _resolve(name_or_path: str) -> str:
+    """Bare spec names (e.g. 'mandate_v2.json') resolve against SPEC_DIR; paths are used as given."""
+    if os.path.dirname(name_or_path):
+        return os.path.abspath(name_or_path)
+    return os.path.join(SPEC_DIR, name_or_path)
+
+
+def _load(path: str):
+    with _lock:
+        validator = _validators.get(path)
+        if validator is not None:
+            return validator
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Schema not found: {path}")
+        with open(path, 'r') as fh:
+            schema = json.load(fh)
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        validator = cls(schema)
+        _validators[path] = validator
+        return validator
+
+
+def get_validator(name_or_path: str):
+    """Return the shared compiled validator for a spec name or schema file path."""
+    path = _resolve(name_or_path)
+    validator = _validators.get(path)
+    if validator is None:
+        validator = _load(path)
+    return validator
+
+
+def get_schema(name_or_path: str) -> Dict[str, Any]:
+    """Return the parsed schema document backing get_validator()."""
+    return get_validator(name_or_path).schema
+
+
+def validate(instance: Any, name_or_path: str):
+    """
+    Validate an instance against a registered schema.
+
+    Raises the same ValidationError that jsonschema.validate() would (the best
+    match among all errors), so existing error messages are unchanged.
+    """
+    error = best_match(get_validator(name_or_path).iter_errors(instance))
+    if error is not None:
+        raise error
+
+
+def preload(spec_dir: str = None):
+    """Compile every *.json schema in spec_dir (defaults to SPEC_DIR) up front."""
+    spec_dir = spec_dir or SPEC_DIR
+    for fname in sorted(os.listdir(spec_dir)):
+        if fname.endswith('.json'):
+            get_validator(os.path.join(spec_dir, fname))
+
+
+def clear():
+    """Drop all cached schemas so the next lookup re-reads them from disk."""
+    with _lock:
+        _validators.clear()
@@ -1,20 +1,57 @@
 # core/scribe_agent.py
 from datetime import datetime, timezone
+import atexit
 import json
+import os
+import threading
+import time
 import uuid
 from pathlib import Path
 
+# how appended entries reach log_path:
+# - 'entry'  written through on every append (the file stays open; one write per append)
+# - 'batch'  buffered, written every `flush_every` entries or `flush_interval` seconds
+#            after the oldest buffered entry, whichever comes first
+FLUSH_POLICIES = ('entry', 'batch')
+
 
 class ScribeAgent:
     """
     The ScribeAgent records events, mandates, and audits to a persistent or in-memory mission log.
     Backward compatible with legacy tests that used 'log_path' and both styles of append_entry().
+    Appends are serialized, so the ledger and the log file keep the same order under concurrent writers.
+
+    The log file is kept open; flush_policy (see FLUSH_POLICIES) decides when entries are written
+    to it, and fsync=True also fsyncs every write. Independently, commit() makes everything
+    appended so far durable (concurrent commits share one fsync), and flush() / close() / leaving
+    a `with` block write out and fsync whatever is still buffered.
     """
 
-    def __init__(self, node_id: str = None, log_path: str = None):
+    def __init__(self, node_id: str = None, log_path: str = None, flush_policy: str = 'entry',
+                 flush_every: int = 256, flush_interval: float = 0.05, fsync: bool = False):
+        if flush_policy not in FLUSH_POLICIES:
+            raise ValueError(f"flush_policy must be one of {FLUSH_POLICIES}")
+        if flush_every < 1 or flush_interval <= 0:
+            raise ValueError("flush_every must be >= 1 and flush_interval > 0")
         self.node_id = node_id or f"scribe-{uuid.uuid4().hex[:8]}"
         self.ledger = []
         self.log_path = Path(log_path) if log_path else None
+        self.flush_policy = flush_policy
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._lock = threading.RLock()
+        # serializes writes of buffered entries (taken before _lock), so batches land in order
+        self._flush_lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._fh = None
+        self._buffer = []        # JSON lines not yet written ('batch')
+        self._buffered = 0       # entries in _buffer
+        self._buffered_at = 0.0  # monotonic time of the oldest of them
+        self._appended = 0       # entries appended to the log so far
+        self._synced = 0         # ... of which known to be fsynced
+        self._flusher = None
+        self._closing = False
 
         # Prepare log file if needed
         if self.log_path:
@@ -32,11 +69,7 @@ class ScribeAgent:
             "narrative_summary": summary,
         }
 
-        self.ledger.append(entry)
-        if self.log_path:
-            with open(self.log_path, "a") as f:
-                f.write(json.dumps(entry) + "\n")
-
+        self._write([entry])
         return entry
 
     # ✅ Fully backward-compatible append_entry()
@@ -49,15 +82,8 @@ class ScribeAgent:
         """
         # Case 1: single dict-style call
         if len(args) == 1 and isinstance(args[0], dict):
-            entry = args[0]
-            # Ensure required keys
-            entry.setdefault("entry_id", f"entry-{int(datetime.now(timezone.utc).timestamp())}")
-            entry.setdefault("timestamp", datetime.now(timezone.utc).isoformat())
-            entry.setdefault("node_id", self.node_id)
-            self.ledger.append(entry)
-            if self.log_path:
-                with open(self.log_path, "a") as f:
-                    f.write(json.dumps(entry) + "\n")
+            entry = self._stamp(args[0])
+            self._write([entry])
             return entry
 
         # Case 2: modern call pattern
@@ -71,13 +97,152 @@ class ScribeAgent:
         else:
             raise TypeError("append_entry() must be called with either (dict) or (entry_type, payload, summary)")
 
+    def append_entries(self, entries):
+        """
+        Append several dict-style entries as one group: they land in the ledger together and
+        are written to log_path with a single open/write instead of one per entry.
+        """
+        entries = [self._stamp(entry) for entry in entries]
+        if not entries:
+            return entries
+        self._write(entries)
+        return entries
+
+    def _write(self, entries):
+        lines = "".join(json.dumps(entry) + "\n" for entry in entries) if self.log_path else None
+        with self._lock:
+            self.ledger.extend(entries)
+            if not self.log_path:
+                return
+            self._appended += len(entries)
+            if self.flush_policy == 'entry':
+                fh = self._file()
+                fh.write(lines)
+                fh.flush()
+                if self.fsync:
+                    os.fsync(fh.fileno())
+                    self._synced = self._appended
+                return
+            if not self._buffer:
+                self._buffered_at = time.monotonic()
+                self._start_flusher()
+            self._buffer.append(lines)
+            self._buffered += len(entries)
+            due = self._buffered >= self.flush_every
+        if due:  # outside _lock: flushing takes _flush_lock first
+            self.flush()
+
+    def _file(self):
+        if self._fh is None:
+            self._fh = open(self.log_path, "a", encoding="utf-8")
+        return self._fh
+
+    def _flush_locked(self, fsync):
+        # caller holds _flush_lock
+        with self._lock:
+            lines, self._buffer, self._buffered = self._buffer, [], 0
+            upto = self._appended
+            fh = self._file()
+        if lines:
+            fh.write("".join(lines))
+        fh.flush()
+        if fsync:
+            os.fsync(fh.fileno())
+            self._synced = max(self._synced, upto)
+
+    def flush(self, fsync: bool = None):
+        """Write buffered entries to log_path; fsync them too if fsync (default: the fsync setting)."""
+        if self.log_path:
+            with self._flush_lock:
+                self._flush_locked(self.fsync if fsync is None else fsync)
+
+    def commit(self):
+        """
+        Make every entry appended so far durable (written and fsynced). A commit that finds its
+        entries already fsynced by a concurrent one returns at once, so N committing threads
+        share a handful of fsyncs instead of N (group commit).
+        """
+        if not self.log_path:
+            return
+        with self._lock:
+            target = self._appended
+        with self._flush_lock:
+            if self._synced < target:
+                self._flush_locked(True)
+
+    def close(self):
+        """Stop the background flusher, write and fsync everything buffered, and close the log file."""
+        with self._lock:
+            self._closing = True
+            self._cond.notify_all()
+            flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            flusher.join()
+            atexit.unregister(self.close)
+        with self._flush_lock:
+            if self.log_path:
+                self._flush_locked(True)
+            with self._lock:
+                fh, self._fh = self._fh, None
+                self._closing = False
+            if fh is not None:
+                fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _start_flusher(self):
+        # caller holds _lock; one daemon thread per batching scribe, closed at exit if not before
+        if self._flusher is None and not self._closing:
+            self._flusher = threading.Thread(target=self._flush_loop, name='e4a-scribe-flush', daemon=True)
+            self._flusher.start()
+            atexit.register(self.close)
+        self._cond.notify_all()
+
+    def _flush_loop(self):
+        while True:
+            with self._cond:
+                while not self._closing and not self._buffer:
+                    self._cond.wait()
+                if self._closing:
+                    return
+                remaining = self._buffered_at + self.flush_interval - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue  # re-check: the buffer may have been flushed meanwhile
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[ScribeAgent] Flush error: {e}")
+
+    def _stamp(self, entry: dict) -> dict:
+        # Ensure required keys
+        entry.setdefault("entry_id", f"entry-{int(datetime.now(timezone.utc).timestamp())}")
+        entry.setdefault("timestamp", datetime.now(timezone.utc).isoformat())
+        entry.setdefault("node_id", self.node_id)
+        return entry
+
     def get_entries(self, entry_type: str = None):
         if entry_type:
-            return [e for e in self.ledger if e["entry_type"] == entry_type]
+            with self._lock:
+                return [e for e in self.ledger if e["entry_type"] == entry_type]
         return self.ledger
 
+    def entries_since(self, offset: int = 0):
+        """
+        Entries appended after the first `offset` ones, and the offset to pass next time.
+        The ledger is append-only, so a reader can follow it incrementally with this cursor.
+        """
+        with self._lock:
+            return self.ledger[offset:], len(self.ledger)
+
     def dump_json(self, path=None):
         path = Path(path or self.log_path or "scribe_ledger.json")
+        with self._lock:
+            ledger = list(self.ledger)
         with open(path, "w") as f:
-            json.dump(self.ledger, f, indent=2)
+            json.dump(ledger, f, indent=2)
         return str(path)
@@ -0,0 +1,262 @@
+"""
+Append-only operation journal with snapshot compaction.
+
+State lives in two files:
+- <path>          JSON snapshot of the full state plus the sequence number it covers
+- <path>.journal  one JSON operation per line, each with an increasing `seq`
+
+A write appends one line to the journal (O(size of the operation), not of the
+state). Every `snapshot_every` operations the state is compacted: a new snapshot
+is written to a temp file, fsynced and atomically renamed over the old one,
+then the journal is reset the same way. Cold start loads the snapshot and
+replays journal records with a newer seq; a torn last line from a crash is
+ignored.
+
+Several processes may share one journal. Mutations run under an exclusive
+advisory lock on <path>.lock (fcntl; msvcrt on Windows), which also records
+the seq of the current snapshot. Inside the lock a process first catches up on
+records other processes appended (or reloads after another process compacted),
+and append() refuses to write unless the journal still ends where this process
+last saw it, i.e. right after the seq it is about to extend (compare-and-swap).
+
+fsync policy for journal appends:
+- 'always'   fsync after every append (default; survives power loss)
+- 'interval' fsync at most every `fsync_interval` seconds
+- 'never'    leave flushing to the OS (survives process crashes only)
+"""
+import json
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+
+class StateJournalError(Exception):
+    pass
+
+
+def _fsync_dir(path):
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:  # e.g. Windows: directories cannot be opened
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path, data, fsync=True):
+    """Write JSON to a temp file and rename it over path, so readers never see a partial file."""
+    tmp = f'{path}.tmp.{os.getpid()}'
+    with open(tmp, 'w') as fh:
+        json.dump(data, fh, default=str)
+        fh.flush()
+        if fsync:
+            os.fsync(fh.fileno())
+    os.replace(tmp, path)
+    if fsync:
+        _fsync_dir(path)
+
+
+class StateJournal:
+    """
+    Args:
+        path: snapshot file; the journal is written next to it as <path>.journal.
+        apply: apply(state, op) -> None, mutates state in place for one journal record.
+        initial: factory for the empty state.
+        snapshot_every: compact after this many journaled operations (None: only on demand).
+    """
+
+    def __init__(self, path, apply, initial=dict, snapshot_every=1000, fsync='always', fsync_interval=1.0):
+        if fsync not in FSYNC_POLICIES:
+            raise StateJournalError(f'fsync must be one of {FSYNC_POLICIES}')
+        self.path = path
+        self.journal_path = f'{path}.journal'
+        self.lock_path = f'{path}.lock'
+        self._apply = apply
+        self._initial = initial
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.seq = 0
+        self.snapshot_seq = 0
+        self._last_fsync = 0.0
+        self._fh = None
+        self._offset = 0  # bytes of the journal this process has read or written
+        self._lock_fd = None
+        self._lock_shared = False
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    @property
+    def pending(self) -> int:
+        """Operations journaled since the last snapshot."""
+        return self.seq - self.snapshot_seq
+
+    # -- cross-process lock -------------------------------------------------
+    @contextmanager
+    def locked(self, shared: bool = False):
+        """
+        Hold the advisory file lock (re-entrant within this object; callers serialize
+        their own threads). Use shared=True for read-only sections.
+        """
+        if self._lock_fd is not None:
+            if self._lock_shared and not shared:
+                raise StateJournalError('cannot upgrade a shared journal lock')
+            yield self
+            return
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            else:
+                shared = False  # msvcrt only has exclusive locks
+                while True:  # LK_LOCK gives up after ~10s; keep waiting
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        pass
+            self._lock_fd, self._lock_shared = fd, shared
+            try:
+                yield self
+            finally:
+                self._lock_fd = None
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)
+
+    def _generation(self):
+        """Snapshot seq recorded in the lock file by the last compaction (None if unset)."""
+        os.lseek(self._lock_fd, 0, os.SEEK_SET)
+        raw = os.read(self._lock_fd, 32)
+        return int(raw) if raw.strip() else None
+
+    def _set_generation(self):
+        os.lseek(self._lock_fd, 0, os.SEEK_SET)
+        os.ftruncate(self._lock_fd, 0)
+        os.write(self._lock_fd, str(self.snapshot_seq).encode())
+
+    # -- reading -----------------------------------------------------------
+    def load(self) -> dict:
+        """Latest snapshot plus the journal tail replayed on top of it."""
+        self._close_journal()
+        state, self.seq = self._initial(), 0
+        if os.path.exists(self.path):
+            with open(self.path) as fh:
+                snapshot = json.load(fh)
+            self.seq = snapshot.pop('seq', 0)
+            state.update(snapshot)
+        self.snapshot_seq = self.seq
+        self._offset = 0
+        self._replay(state)
+        if self._lock_fd is not None and not self._lock_shared and self._generation() != self.snapshot_seq:
+            self._set_generation()
+        return state
+
+    def catch_up(self, state) -> list | None:
+        """
+        Under locked(): apply the records other processes appended since this process last
+        looked and return them. Returns None when another process compacted in the
+        meantime; the caller must then load() afresh.
+        """
+        generation = self._generation()
+        if generation is not None and generation != self.snapshot_seq:
+            return None
+        try:
+            size = os.stat(self.journal_path).st_size
+        except FileNotFoundError:
+            size = 0
+        if size == self._offset:
+            return []
+        if size < self._offset:
+            return None
+        return self._replay(state)
+
+    def _replay(self, state) -> list:
+        if not os.path.exists(self.journal_path):
+            return []
+        applied = []
+        with open(self.journal_path, 'rb') as fh:
+            size = os.fstat(fh.fileno()).st_size
+            fh.seek(self._offset)
+            good = self._offset
+            for line in fh:
+                if not line.endswith(b'\n'):
+                    break  # torn write from a crash; the operation never completed
+                good += len(line)
+                op = json.loads(line)
+                if op['seq'] <= self.seq:
+                    continue  # already in the snapshot (crash between snapshot and journal reset)
+                if op['seq'] != self.seq + 1:
+                    raise StateJournalError(f"journal gap: expected seq {self.seq + 1}, found {op['seq']}")
+                self._apply(state, op)
+                self.seq = op['seq']
+                applied.append(op)
+        self._offset = good
+        if good != size and not (self._lock_fd is not None and self._lock_shared):
+            # drop the torn tail so the next append starts on a clean line
+            with open(self.journal_path, 'r+b') as fh:
+                fh.truncate(good)
+        return applied
+
+    # -- writing -----------------------------------------------------------
+    def append(self, op: dict) -> dict:
+        """
+        Assign the next seq to op and journal it; the caller applies it to its state.
+        Must run under locked() after catch_up(), so the journal ends at this process's seq.
+        """
+        if self._fh is None:
+            self._fh = open(self.journal_path, 'ab')
+        if os.fstat(self._fh.fileno()).st_size != self._offset:
+            raise StateJournalError(f'journal moved past seq {self.seq}; catch up before appending')
+        op = {'seq': self.seq + 1, **op}
+        line = json.dumps(op, default=str).encode() + b'\n'
+        self._fh.write(line)
+        self._fh.flush()
+        now = time.monotonic()
+        if self.fsync == 'always' or (self.fsync == 'interval' and now - self._last_fsync >= self.fsync_interval):
+            os.fsync(self._fh.fileno())
+            self._last_fsync = now
+        self.seq += 1
+        self._offset += len(line)
+        return op
+
+    def should_compact(self) -> bool:
+        return self.snapshot_every is not None and self.pending >= self.snapshot_every
+
+    def compact(self, state: dict):
+        """Snapshot state (which must include every journaled op) and start an empty journal."""
+        atomic_write_json(self.path, {**state, 'seq': self.seq}, fsync=self.fsync != 'never')
+        self._close_journal()
+        # the snapshot already covers these records, so a crash before this rename is harmless
+        tmp = f'{self.journal_path}.tmp.{os.getpid()}'
+        open(tmp, 'wb').close()
+        os.replace(tmp, self.journal_path)
+        self.snapshot_seq = self.seq
+        self._offset = 0
+        if self._lock_fd is not None:
+            self._set_generation()
+
+    def _close_journal(self):
+        if self._fh is not None:
+            if self.fsync != 'never':
+                os.fsync(self._fh.fileno())
+            self._fh.close()
+            self._fh = None
+
+    def close(self):
+        self._close_journal()
@@ -0,0 +1,304 @@
+"""
+Storage backends for MandateEngine and GateEngine.
+
+A Storage exposes two dict-like collections, `mandates` (keyed by mandate_id)
+and `gates` (keyed by gate_id), plus indexed lookups. Documents are plain
+dicts; callers that mutate a document must write it back (`store.gates[id] = gate`)
+for the change to persist.
+
+Backends:
+- InMemoryStorage: in-process collections of compact slotted records (see
+  records.py); compact=False keeps plain dicts. Nothing survives a restart.
+- SQLiteStorage: a single SQLite file in WAL mode with secondary indexes on
+  issuer, beneficiary, parent_mandate_id, replay_nonce and gate mandate_id/status
+
+Select one from the `db` section of config.yaml via open_storage().
+"""
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+
+from .records import GateRecord, MandateRecord
+
+
+class StorageError(Exception):
+    pass
+
+
+class Storage(ABC):
+    """Interface shared by all backends."""
+
+    persistent = False
+
+    def __init__(self):
+        self.mandates = {}
+        self.gates = {}
+
+    @abstractmethod
+    def find_mandates(self, issuer: str = None, beneficiary: str = None,
+                      parent_mandate_id: str = None, replay_nonce: str = None) -> list:
+        """Mandates matching every given criterion."""
+
+    @abstractmethod
+    def find_gates(self, mandate_id: str = None, status: str = None) -> list:
+        """Gates matching every given criterion."""
+
+    @abstractmethod
+    def iter_child_links(self):
+        """Yield (mandate_id, parent_mandate_id) for every mandate that has a parent."""
+
+    def iter_mandates(self):
+        """Read-only iteration over stored mandates; items support .get() like dicts."""
+        return iter(self.mandates.values())
+
+    @contextmanager
+    def transaction(self):
+        """Group several writes; backends without transactions just run the block."""
+        yield self
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _scan(table, criteria):
+    criteria = [(k, v) for k, v in criteria.items() if v is not None]
+    # list() snapshots the values in one step, so concurrent inserts cannot break the scan
+    if isinstance(table, _RecordTable):
+        return [r.to_dict() for r in list(table.records()) if all(r.get(k) == v for k, v in criteria)]
+    return [d for d in list(table.values()) if all(d.get(k) == v for k, v in criteria)]
+
+
+class _RecordTable(MutableMapping):
+    """MutableMapping that stores slotted records and hands out dicts (fresh copies)."""
+
+    def __init__(self, record_cls):
+        self._record_cls = record_cls
+        self._records = {}
+
+    def __getitem__(self, key):
+        return self._records[key].to_dict()
+
+    def __setitem__(self, key, doc):
+        self._records[key] = self._record_cls.from_dict(doc)
+
+    def __delitem__(self, key):
+        del self._records[key]
+
+    def __contains__(self, key):
+        return key in self._records
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def records(self):
+        """The stored records themselves (read-only use; no dict conversion)."""
+        return self._records.values()
+
+
+class InMemoryStorage(Storage):
+    """
+    In-process store; lookups other than by primary key scan a snapshot of the collection,
+    so they are safe alongside writes from other threads.
+    """
+
+    def __init__(self, compact: bool = True):
+        super().__init__()
+        if compact:
+            self.mandates = _RecordTable(MandateRecord)
+            self.gates = _RecordTable(GateRecord)
+
+    def find_mandates(self, issuer=None, beneficiary=None, parent_mandate_id=None, replay_nonce=None):
+        criteria = {'issuer': issuer, 'beneficiary': beneficiary,
+                    'parent_mandate_id': parent_mandate_id, 'replay_nonce': replay_nonce}
+        return _scan(self.mandates, criteria)
+
+    def find_gates(self, mandate_id=None, status=None):
+        return _scan(self.gates, {'mandate_id': mandate_id, 'status': status})
+
+    def iter_child_links(self):
+        for m in self.iter_mandates():
+            if m.get('parent_mandate_id'):
+                yield m.get('mandate_id'), m.get('parent_mandate_id')
+
+    def iter_mandates(self):
+        if isinstance(self.mandates, _RecordTable):
+            return iter(list(self.mandates.records()))
+        return iter(list(self.mandates.values()))
+
+
+class _SQLiteTable(MutableMapping):
+    """MutableMapping over one table: key column, indexed columns and the JSON document."""
+
+    def __init__(self, storage, table, key, columns):
+        self._storage = storage
+        self._table = table
+        self._key = key
+        self._columns = columns
+        cols = ', '.join((key,) + columns + ('doc',))
+        marks = ', '.join('?' * (len(columns) + 2))
+        updates = ', '.join(f'{c} = excluded.{c}' for c in columns + ('doc',))
+        # upsert keeps the rowid, so iteration stays in insertion order like a dict
+        self._upsert_sql = (f'INSERT INTO {table} ({cols}) VALUES ({marks}) '
+                            f'ON CONFLICT({key}) DO UPDATE SET {updates}')
+
+    def _execute(self, sql, params=()):
+        return self._storage._execute(sql, params)
+
+    def _fetchall(self, sql, params=()):
+        return self._storage._fetchall(sql, params)
+
+    def __getitem__(self, key):
+        rows = self._fetchall(f'SELECT doc FROM {self._table} WHERE {self._key} = ?', (key,))
+        if not rows:
+            raise KeyError(key)
+        return json.loads(rows[0][0])
+
+    def __setitem__(self, key, doc):
+        params = (key,) + tuple(doc.get(c) for c in self._columns) + (json.dumps(doc),)
+        self._execute(self._upsert_sql, params)
+
+    def __delitem__(self, key):
+        if self._execute(f'DELETE FROM {self._table} WHERE {self._key} = ?', (key,)) == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return bool(self._fetchall(f'SELECT 1 FROM {self._table} WHERE {self._key} = ?', (key,)))
+
+    def __iter__(self):
+        rows = self._fetchall(f'SELECT {self._key} FROM {self._table} ORDER BY rowid')
+        return iter(r[0] for r in rows)
+
+    def __len__(self):
+        return self._fetchall(f'SELECT COUNT(*) FROM {self._table}')[0][0]
+
+    def values(self):
+        rows = self._fetchall(f'SELECT doc FROM {self._table} ORDER BY rowid')
+        return [json.loads(r[0]) for r in rows]
+
+    def items(self):
+        rows = self._fetchall(f'SELECT {self._key}, doc FROM {self._table} ORDER BY rowid')
+        return [(r[0], json.loads(r[1])) for r in rows]
+
+    def where(self, **criteria):
+        criteria = {k: v for k, v in criteria.items() if v is not None}
+        clause = ' AND '.join(f'{k} = ?' for k in criteria) or '1'
+        rows = self._fetchall(f'SELECT doc FROM {self._table} WHERE {clause} ORDER BY rowid',
+                              tuple(criteria.values()))
+        return [json.loads(r[0]) for r in rows]
+
+
+class SQLiteStorage(Storage):
+    """SQLite (WAL) store; safe to share between threads of one process."""
+
+    persistent = True
+
+    _SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS mandates (
+               mandate_id TEXT PRIMARY KEY,
+               issuer TEXT,
+               beneficiary TEXT,
+               parent_mandate_id TEXT,
+               replay_nonce TEXT,
+               doc TEXT NOT NULL)""",
+        'CREATE INDEX IF NOT EXISTS idx_mandates_issuer ON mandates (issuer)',
+        'CREATE INDEX IF NOT EXISTS idx_mandates_beneficiary ON mandates (beneficiary)',
+        'CREATE INDEX IF NOT EXISTS idx_mandates_parent ON mandates (parent_mandate_id)',
+        'CREATE INDEX IF NOT EXISTS idx_mandates_replay_nonce ON mandates (replay_nonce)',
+        """CREATE TABLE IF NOT EXISTS gates (
+               gate_id TEXT PRIMARY KEY,
+               mandate_id TEXT,
+               status TEXT,
+               doc TEXT NOT NULL)""",
+        'CREATE INDEX IF NOT EXISTS idx_gates_mandate ON gates (mandate_id)',
+        'CREATE INDEX IF NOT EXISTS idx_gates_status ON gates (status)',
+    ]
+
+    def __init__(self, path: str, synchronous: str = 'NORMAL'):
+        self.path = path
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.RLock()
+        self._depth = 0
+        # autocommit; transaction() opens explicit transactions for grouped writes
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(f'PRAGMA synchronous={synchronous}')
+        for stmt in self._SCHEMA:
+            self._conn.execute(stmt)
+        self.mandates = _SQLiteTable(self, 'mandates', 'mandate_id',
+                                     ('issuer', 'beneficiary', 'parent_mandate_id', 'replay_nonce'))
+        self.gates = _SQLiteTable(self, 'gates', 'gate_id', ('mandate_id', 'status'))
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    def _fetchall(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def find_mandates(self, issuer=None, beneficiary=None, parent_mandate_id=None, replay_nonce=None):
+        return self.mandates.where(issuer=issuer, beneficiary=beneficiary,
+                                   parent_mandate_id=parent_mandate_id, replay_nonce=replay_nonce)
+
+    def find_gates(self, mandate_id=None, status=None):
+        return self.gates.where(mandate_id=mandate_id, status=status)
+
+    def iter_child_links(self):
+        rows = self._fetchall('SELECT mandate_id, parent_mandate_id FROM mandates '
+                              'WHERE parent_mandate_id IS NOT NULL ORDER BY rowid')
+        return iter(rows)
+
+    @contextmanager
+    def transaction(self):
+        with self._lock:
+            outer = self._depth == 0
+            if outer:
+                self._conn.execute('BEGIN IMMEDIATE')
+            self._depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._depth -= 1
+                if outer:
+                    self._conn.execute('ROLLBACK')
+                raise
+            self._depth -= 1
+            if outer:
+                self._conn.execute('COMMIT')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_storage(db_config=None) -> Storage:
+    """
+    Build a Storage from the `db` section of config.yaml (or a Config object).
+
+        db: {type: memory}                       # default; legacy "json" maps here too
+        db: {type: sqlite, path: data/e4a.db}
+    """
+    if hasattr(db_config, 'get') and not isinstance(db_config, dict):
+        db_config = db_config.get('db')
+    db_config = db_config or {}
+    kind = (db_config.get('type') or 'memory').lower()
+    if kind in ('memory', 'json'):
+        return InMemoryStorage()
+    if kind == 'sqlite':
+        path = db_config.get('path') or 'data/e4a.db'
+        return SQLiteStorage(path, synchronous=db_config.get('synchronous', 'NORMAL'))
+    raise StorageError(f'Unknown db type: {kind}')
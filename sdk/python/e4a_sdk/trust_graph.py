@@ -0,0 +1,233 @@
+"""
+Graph-based trust over the mandate graph (EigenTrust / PageRank style).
+
+Every mandate is an issuer -> beneficiary edge: the issuer extends trust to the
+beneficiary. Each actor's outgoing edge weights are normalized to sum to 1
+(local trust C), and global trust t is the fixed point of
+
+    t = (1 - alpha) * C^T t + alpha * p
+
+where p is the pre-trusted distribution (uniform over pre_trusted actors, or
+over everyone); actors with no outgoing edges hand their trust to p. Edges are
+kept as flat NumPy arrays and each power-iteration step is one gather and one
+bincount over them, O(edges). converge() starts from the previous vector, so
+after a batch of new mandates it re-converges in a few steps instead of
+starting over.
+
+get_score() scales trust so the most trusted actor scores 1.0. With
+subscribe() / unsubscribe() a TrustGraph can replace a ReputationIndex as
+GovernanceKernel's vote weight source. Listeners are told about get_score()
+changes, not trust() changes: when the most trusted actor's share moves,
+every actor's score is rescaled and every actor is reported, even those whose
+own trust did not change. That is what lets GovernanceKernel keep its tallies
+equal to the current scores.
+"""
+import threading
+import weakref
+from typing import Dict, Iterable, List
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+# score changes below this are not reported to listeners
+_NOTIFY_EPSILON = 1e-12
+
+
+class TrustGraphError(Exception):
+    pass
+
+
+class TrustGraph:
+    def __init__(self, alpha: float = 0.15, pre_trusted: Iterable[str] = (), amount_weighted: bool = False,
+                 tol: float = 1e-10, max_iter: int = 200, default_score: float = 0.0):
+        """
+        alpha: probability mass returned to the pre-trusted actors at each step.
+        pre_trusted: actors trusted a priori (e.g. founding members); none means everyone equally.
+        amount_weighted: weight edges by mandate amount instead of counting mandates.
+        tol / max_iter: stop once the L1 change of t drops below tol, or after max_iter steps.
+        default_score: get_score() of actors not in the graph.
+        """
+        if np is None:
+            raise TrustGraphError('TrustGraph requires NumPy (pip install e4a-sdk[perf])')
+        if not 0 < alpha <= 1:
+            raise ValueError('alpha must be in (0, 1]')
+        self.alpha = alpha
+        self.pre_trusted = set(pre_trusted)
+        self.amount_weighted = amount_weighted
+        self.tol = tol
+        self.max_iter = max_iter
+        self.default_score = default_score
+        self.actors: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._src = np.empty(1024, dtype=np.int64)
+        self._dst = np.empty(1024, dtype=np.int64)
+        self._weight = np.empty(1024)
+        self._edges = 0
+        self._trust = np.empty(0)   # last converged t, over the actors known then
+        self._scores = np.empty(0)  # t / max(t)
+        self._dirty = False
+        self.iterations = 0  # power-iteration steps of the last converge()
+        self._lock = threading.RLock()
+        self._listeners = {}
+        self._next_token = 0
+        # scribe -> number of its ledger entries already ingested
+        self._cursors = weakref.WeakKeyDictionary()
+
+    def __len__(self):
+        return len(self.actors)
+
+    @property
+    def edges(self) -> int:
+        return self._edges
+
+    # -- graph ---------------------------------------------------------------
+    def _id(self, actor_id: str) -> int:
+        i = self._ids.get(actor_id)
+        if i is None:
+            i = self._ids[actor_id] = len(self.actors)
+            self.actors.append(actor_id)
+        return i
+
+    def add_edges(self, issuers: Iterable[str], beneficiaries: Iterable[str], weights: Iterable[float] = None) -> int:
+        """Record issuer -> beneficiary trust edges (self-edges and non-positive weights are skipped)."""
+        with self._lock:
+            src = np.fromiter((self._id(a) for a in issuers), dtype=np.int64)
+            dst = np.fromiter((self._id(b) for b in beneficiaries), dtype=np.int64)
+            if len(src) != len(dst):
+                raise ValueError('issuers and beneficiaries must have the same length')
+            weight = np.ones(len(src)) if weights is None else np.asarray(list(weights), dtype=float)
+            if len(weight) != len(src):
+                raise ValueError('weights must match the edges')
+            keep = (src != dst) & (weight > 0)
+            src, dst, weight = src[keep], dst[keep], weight[keep]
+            m, end = self._edges, self._edges + len(src)
+            if end > len(self._src):
+                size = max(end, 2 * len(self._src))
+                for name in ('_src', '_dst', '_weight'):
+                    old = getattr(self, name)
+                    grown = np.empty(size, dtype=old.dtype)
+                    grown[:m] = old[:m]
+                    setattr(self, name, grown)
+            self._src[m:end], self._dst[m:end], self._weight[m:end] = src, dst, weight
+            self._edges = end
+            self._dirty = self._dirty or end > m
+            return end - m
+
+    def add_mandate(self, issuer: str, beneficiary: str, amount: float = 1.0) -> int:
+        return self.add_edges([issuer], [beneficiary], [amount if self.amount_weighted else 1.0])
+
+    def add_mandates(self, mandates: Iterable[Dict]) -> int:
+        """Edges for mandate dicts (e.g. storage.iter_mandates()); those without both parties are skipped."""
+        issuers, beneficiaries, weights = [], [], []
+        for mandate in mandates:
+            issuer, beneficiary = mandate.get('issuer'), mandate.get('beneficiary')
+            if issuer and beneficiary:
+                issuers.append(issuer)
+                beneficiaries.append(beneficiary)
+                weights.append(float(mandate.get('amount') or 0.0) if self.amount_weighted else 1.0)
+        return self.add_edges(issuers, beneficiaries, weights)
+
+    def ingest_from_scribe(self, scribe) -> int:
+        """Add the mandates created since the last call (mandate_created entries); returns edges added."""
+        with self._lock:
+            offset = self._cursors.get(scribe, 0)
+            entries, end = scribe.entries_since(offset)
+            added = self.add_mandates(entry.get('payload') or {} for entry in entries
+                                      if entry.get('entry_type') == 'mandate_created')
+            self._cursors[scribe] = end
+            return added
+
+    # -- trust ---------------------------------------------------------------
+    def _teleport(self, n):
+        p = np.zeros(n)
+        trusted = [self._ids[a] for a in self.pre_trusted if a in self._ids]
+        if trusted:
+            p[trusted] = 1.0 / len(trusted)
+        else:
+            p[:] = 1.0 / n
+        return p
+
+    def converge(self) -> int:
+        """
+        Recompute trust after new edges, warm-started from the previous result; returns the
+        number of iteration steps (0 when nothing changed). Listeners hear about every actor
+        whose get_score() moved, including moves caused only by rescaling to a new maximum.
+        """
+        with self._lock:
+            n = len(self.actors)
+            if not self._dirty or not n:
+                return 0
+            m = self._edges
+            src, dst, weight = self._src[:m], self._dst[:m], self._weight[:m]
+            out = np.bincount(src, weights=weight, minlength=n)
+            share = weight / out[src]
+            dangling = out == 0
+            p = self._teleport(n)
+            x = p.copy()
+            known = len(self._trust)
+            if known:  # warm start: previous trust, new actors at their teleport share
+                x[:known] = self._trust
+                x /= x.sum()
+            keep = 1.0 - self.alpha
+            steps = 0
+            for steps in range(1, self.max_iter + 1):
+                y = np.bincount(dst, weights=share * x[src], minlength=n)
+                y *= keep
+                y += (keep * x[dangling].sum() + self.alpha) * p
+                change = np.abs(y - x).sum()
+                x = y
+                if change < self.tol:
+                    break
+            old = np.zeros(n)
+            old[:len(self._scores)] = self._scores
+            self._trust = x
+            self._scores = x / x.max()
+            self._dirty = False
+            self.iterations = steps
+            notify = []
+            if self._listeners:
+                moved = np.nonzero(np.abs(self._scores - old) > _NOTIFY_EPSILON)[0]
+                notify = [(self.actors[i], old[i] if i < known else self.default_score, self._scores[i])
+                          for i in moved.tolist()]
+            listeners = list(self._listeners.values()) if notify else ()
+        for listener in listeners:
+            for change in notify:
+                listener(*change)
+        return steps
+
+    def get_score(self, actor_id: str) -> float:
+        """Trust relative to the most trusted actor (0-1) as of the last converge()."""
+        i = self._ids.get(actor_id)
+        if i is None or i >= len(self._scores):
+            return self.default_score
+        return float(self._scores[i])
+
+    def trust(self, actor_id: str) -> float:
+        """The actor's share of global trust (all shares sum to 1) as of the last converge()."""
+        i = self._ids.get(actor_id)
+        return float(self._trust[i]) if i is not None and i < len(self._trust) else 0.0
+
+    def top(self, limit: int = 10) -> List[Dict]:
+        """The most trusted actors, best first: [{actor_id, score, rank}]."""
+        with self._lock:
+            scores = self._scores
+            limit = min(limit, len(scores))
+            if limit <= 0:
+                return []
+            best = np.argpartition(-scores, limit - 1)[:limit]
+            best = best[np.argsort(-scores[best], kind='stable')]
+            return [{'actor_id': self.actors[i], 'score': float(scores[i]), 'rank': r + 1}
+                    for r, i in enumerate(best.tolist())]
+
+    def subscribe(self, listener) -> int:
+        """Call listener(actor_id, old_score, new_score) for score changes at each converge(); returns a token."""
+        with self._lock:
+            self._next_token += 1
+            self._listeners[self._next_token] = listener
+            return self._next_token
+
+    def unsubscribe(self, token: int):
+        with self._lock:
+            self._listeners.pop(token, None)
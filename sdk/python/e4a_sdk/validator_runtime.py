@@ -9,13 +9,13 @@ Provides:
 import os
 import json
 from datetime import datetime, timedelta
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
+from . import schema_registry
 
 LOG_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'mission_log.jsonl')
-SPEC = os.path.join(os.path.dirname(__file__), '..', '..', '..', 'specs', 'mandate_v2.json')
+SPEC = 'mandate_v2.json'
 
-with open(SPEC, 'r') as _f:
-    MANDATE_SCHEMA = json.load(_f)
+MANDATE_SCHEMA = schema_registry.get_schema(SPEC)
 
 
 class ValidatorRuntime:
@@ -28,7 +28,7 @@ class ValidatorRuntime:
 
     def validate_mandate(self, mandate):
         try:
-            validate(instance=mandate, schema=MANDATE_SCHEMA)
+            schema_registry.validate(mandate, SPEC)
         except ValidationError as e:
             raise ValueError(f"Mandate validation error: {e.message}")
 
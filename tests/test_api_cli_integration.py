@@ -1,4 +1,7 @@
 # tests/test_api_cli_integration.py
+import json
+import threading
+import time
 from fastapi.testclient import TestClient
 from api.server import create_app
 import pytest
@@ -33,3 +36,182 @@ def test_mandate_lifecycle(client):
     assert e.status_code == 200
     r = client.get("/reputation")
     assert "reputation" in r.json()
+
+    top = client.get("/reputation/top", params={"limit": 1}).json()
+    assert top["total"] >= 1 and top["actors"][0]["rank"] == 1
+    actor = client.get(f"/reputation/actors/{top['actors'][0]['actor_id']}").json()
+    assert actor["rank"] == 1 and actor["percentile"] == 100.0
+    assert client.get("/reputation/actors/did:ex:nobody").status_code == 404
+    assert client.get("/reputation/bottom", params={"limit": 0}).status_code == 400
+    assert client.get("/reputation/percentile", params={"p": 100}).json()["score"] == top["actors"][0]["score"]
+
+
+def test_mandate_batch(client):
+    def item(nonce, **extra):
+        m = {
+            "issuer": "did:ex:alice",
+            "beneficiary": "did:ex:bob",
+            "amount": 5,
+            "replay_nonce": nonce,
+            "intent": {
+                "goal": "batch create",
+                "expected_outcome": "mandates created together",
+                "contextual_tone": "neutral",
+                "statistical_purpose": "validate batch API"
+            }
+        }
+        m.update(extra)
+        return m
+
+    r = client.post("/mandates/batch", json={"mandates": [
+        item("b-1"),
+        item("b-2"),
+        item("b-1"),                 # duplicate within the batch
+        {"issuer": "did:ex:alice"},  # malformed
+    ]})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["status"] == "partial"
+    assert body["counts"] == {"created": 2, "duplicate": 1, "error": 1}
+    statuses = [res["status"] for res in body["results"]]
+    assert statuses == ["created", "created", "duplicate", "error"]
+    assert body["results"][2]["mandate"]["mandate_id"] == body["results"][0]["mandate"]["mandate_id"]
+
+    again = client.post("/mandates/batch", json={"mandates": [item("b-2")]}).json()
+    assert again["results"][0]["status"] == "duplicate"
+
+
+def test_background_execution(client):
+    m = client.post("/mandates/create", json={
+        "issuer": "did:ex:alice",
+        "beneficiary": "did:ex:bob",
+        "amount": 5,
+        "intent": {
+            "goal": "execute in background",
+            "expected_outcome": "execution id returned",
+            "contextual_tone": "neutral",
+            "statistical_purpose": "validate async execution"
+        }
+    }).json()["mandate"]
+    r = client.post(f"/mandates/execute/{m['mandate_id']}", params={"background": True})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["status"] == "queued"
+    for _ in range(200):
+        status = client.get(f"/executions/{body['execution_id']}").json()
+        if status["status"] in ("executed", "failed"):
+            break
+        time.sleep(0.01)
+    assert status["status"] == "executed"
+    assert client.get("/executions/exec-missing").status_code == 404
+    # unknown mandates are refused up front, not queued to fail inside the pipeline
+    r = client.post("/mandates/execute/no-such-mandate", params={"background": True})
+    assert r.status_code == 404
+    assert client.post("/mandates/execute/no-such-mandate").status_code == 404
+
+
+def test_gate_inbox(client):
+    intent = {"goal": "g", "expected_outcome": "o", "contextual_tone": "formal", "statistical_purpose": "p",
+              "requires_approval": ["human-admin", "human-security"]}
+    mids = []
+    for _ in range(3):
+        m = client.post("/mandates/create", json={"issuer": "did:ex:alice", "beneficiary": "did:ex:bob",
+                                                  "amount": 5, "intent": intent})
+        mids.append(m.json()["mandate"]["mandate_id"])
+        with pytest.raises(Exception, match="requires human approval"):
+            client.post(f"/mandates/execute/{mids[-1]}")
+
+    inbox = client.get("/gates/inbox/human-admin", params={"limit": 2}).json()
+    assert inbox["total"] == 3
+    assert [g["mandate_id"] for g in inbox["gates"]] == mids[:2]
+
+    client.post(f"/gates/{inbox['gates'][0]['gate_id']}/approve", params={"approver_id": "human-admin"})
+    assert client.get("/gates/inbox/human-admin").json()["total"] == 2
+    assert client.get("/gates/inbox/human-security").json()["total"] == 3
+    # approvers named like the {gate_id} sub-routes still reach their inbox
+    for approver in ("wait", "events"):
+        assert client.get(f"/gates/inbox/{approver}").json() == {"approver_id": approver, "total": 0, "gates": []}
+
+
+def test_bulk_gate_decisions(client):
+    intent = {"goal": "g", "expected_outcome": "o", "contextual_tone": "formal", "statistical_purpose": "p",
+              "requires_approval": ["human-admin"]}
+    for tag in ("routine", "routine", "critical"):
+        m = client.post("/mandates/create", json={"issuer": "did:ex:alice", "beneficiary": "did:ex:bob", "amount": 5,
+                                                  "intent": intent, "policy_tags": [tag]})
+        with pytest.raises(Exception, match="requires human approval"):
+            client.post(f"/mandates/execute/{m.json()['mandate']['mandate_id']}")
+
+    r = client.post("/gates/approve", json={"actor_id": "human-admin", "policy_tag": "routine"}).json()
+    assert r["status"] == "success"
+    assert r["counts"] == {"applied": 2, "error": 0}
+
+    remaining = client.get("/gates/inbox/human-admin").json()["gates"]
+    assert [g["payload"]["policy_tags"] for g in remaining] == [["critical"]]
+    r = client.post("/gates/reject", json={"actor_id": "human-admin",
+                                           "gate_ids": [remaining[0]["gate_id"], "missing"]}).json()
+    assert r["status"] == "partial"
+    assert [x["status"] for x in r["results"]] == ["applied", "error"]
+    assert client.post("/gates/approve", json={"actor_id": "human-admin"}).status_code == 400
+
+
+def _gated_mandate(client):
+    intent = {"goal": "g", "expected_outcome": "o", "contextual_tone": "formal", "statistical_purpose": "p",
+              "requires_approval": ["human-admin"]}
+    m = client.post("/mandates/create", json={"issuer": "did:ex:alice", "beneficiary": "did:ex:bob",
+                                              "amount": 5, "intent": intent}).json()["mandate"]
+    with pytest.raises(Exception, match="requires human approval"):
+        client.post(f"/mandates/execute/{m['mandate_id']}")
+    return m["mandate_id"], client.get("/gates/inbox/human-admin").json()["gates"][-1]["gate_id"]
+
+
+def test_gate_long_poll_and_sse(client):
+    engine = client.app.state.engine
+    _, gate_id = _gated_mandate(client)
+
+    r = client.get(f"/gates/{gate_id}/wait", params={"timeout": 0.05}).json()
+    assert r["status"] == "pending"
+
+    threading.Timer(0.1, engine.gate_engine.approve_gate, (gate_id, "human-admin")).start()
+    r = client.get(f"/gates/{gate_id}/wait", params={"timeout": 10}).json()
+    assert r["status"] == "resolved"
+    assert r["gate"]["status"] == "approved"
+    assert client.get("/gates/missing/wait").status_code == 404
+
+    _, gate_id = _gated_mandate(client)
+    threading.Timer(0.1, engine.gate_engine.reject_gate, (gate_id, "human-admin")).start()
+    with client.stream("GET", f"/gates/{gate_id}/events") as stream:
+        statuses = [json.loads(line[len("data: "):])["status"]
+                    for line in stream.iter_lines() if line.startswith("data: ")]
+    assert statuses == ["pending", "rejected"]
+
+
+def test_auto_execute_on_approval_via_pipeline():
+    from sdk.python.e4a_sdk.config_loader import Config
+
+    with TestClient(create_app(Config({"gates": {"auto_execute": True}}))) as client:
+        mandate_id, gate_id = _gated_mandate(client)
+        approved = client.post(f"/gates/{gate_id}/approve", params={"approver_id": "human-admin"}).json()
+        pipeline = client.app.state.pipeline
+        handle = pipeline.get(approved["execution_id"])
+        assert handle.mandate_id == mandate_id
+        assert pipeline.wait(handle.execution_id, timeout=5).status == "executed"
+        assert handle.executor_id == "gate-approval"
+        lookup = client.get(f"/mandates/{mandate_id}/execution").json()
+        assert lookup["result"] == handle.execution_id
+
+
+def test_auto_execute_reports_a_full_queue():
+    from sdk.python.e4a_sdk.config_loader import Config
+    from sdk.python.e4a_sdk.execution_pipeline import ExecutionQueueFull
+
+    with TestClient(create_app(Config({"gates": {"auto_execute": True}}))) as client:
+        def submit(mandate_id, rail="default", executor_id="system"):
+            raise ExecutionQueueFull(f"Rail {rail} queue is full")
+
+        client.app.state.pipeline.submit = submit
+        mandate_id, gate_id = _gated_mandate(client)
+        approved = client.post(f"/gates/{gate_id}/approve", params={"approver_id": "human-admin"}).json()
+        assert approved["gate"]["status"] == "approved"
+        assert "queue is full" in approved["execution_error"]
+        assert client.get(f"/mandates/{mandate_id}/execution").json()["status"] == "failed"
@@ -0,0 +1,180 @@
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sdk.python.e4a_sdk.mandate_engine import MandateEngine, MandateEngineError
+from sdk.python.e4a_sdk.reputation_index import ReputationIndex
+from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
+from sdk.python.e4a_sdk.storage import SQLiteStorage
+
+CLIENTS = 32
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    # switch threads far more often than the default 5ms so races actually interleave
+    old = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(old)
+
+
+def _mandate(i=0, **extra):
+    m = {
+        "issuer": f"did:ex:issuer-{i % 7}",
+        "beneficiary": "did:ex:bob",
+        "amount": 10.0,
+        "currency": "USD",
+        "fee_distribution": {"protocol": 0.01, "validator": 0.01, "issuer": 0.0},
+        "intent": {"goal": "g", "expected_outcome": "o", "contextual_tone": "formal",
+                   "statistical_purpose": "p"},
+    }
+    m.update(extra)
+    return m
+
+
+def _hammer(fn, items, clients=CLIENTS):
+    barrier = threading.Barrier(clients)
+
+    def run(chunk):
+        barrier.wait()
+        return [fn(item) for item in chunk]
+
+    chunks = [items[i::clients] for i in range(clients)]
+    with ThreadPoolExecutor(clients) as pool:
+        return [r for rs in pool.map(run, chunks) for r in rs]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def engine(request, tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "e4a.db")) if request.param == "sqlite" else None
+    engine = MandateEngine(scribe=ScribeAgent(log_path=str(tmp_path / "ledger.jsonl")), storage=storage)
+    yield engine
+    engine.storage.close()
+
+
+def test_concurrent_creates_with_shared_nonces_store_one_mandate_per_nonce(engine):
+    created = _hammer(lambda i: engine.create_mandate(_mandate(i, replay_nonce=f"n-{i % 10}")), list(range(400)))
+
+    by_nonce = {}
+    for m in created:
+        by_nonce.setdefault(m["replay_nonce"], set()).add(m["mandate_id"])
+    assert all(len(ids) == 1 for ids in by_nonce.values())
+    assert len(engine.mandates) == 10
+    assert len(engine.scribe.get_entries("mandate_created")) == 10
+
+
+def test_concurrent_batches_do_not_duplicate_nonces(engine):
+    def batch(i):
+        return engine.create_mandates([_mandate(i, replay_nonce=f"n-{(i + k) % 25}") for k in range(5)])
+
+    results = _hammer(batch, list(range(64)))
+    created = [r for rs in results for r in rs if r["status"] == "created"]
+    assert len(created) == 25
+    assert len(engine.mandates) == 25
+
+
+def test_concurrent_submandates_keep_tree_index_complete(engine):
+    root = engine.create_mandate(_mandate())
+    _hammer(lambda i: engine.create_submandate(root["mandate_id"], _mandate(i)), list(range(300)))
+    assert len(engine.get_children(root["mandate_id"])) == 300
+    assert engine.subtree_stats(root["mandate_id"])["size"] == 301
+
+
+def test_concurrent_executions_share_one_gate(engine):
+    approvers = ["human-a", "human-b"]
+    m = engine.create_mandate(_mandate(intent={"goal": "g", "expected_outcome": "o", "contextual_tone": "formal",
+                                               "statistical_purpose": "p", "requires_approval": approvers}))
+
+    def execute(_):
+        with pytest.raises(MandateEngineError):
+            engine.execute_mandate(m["mandate_id"])
+
+    _hammer(execute, list(range(CLIENTS * 4)))
+    assert len(engine.storage.find_gates(mandate_id=m["mandate_id"])) == 1
+
+
+def test_concurrent_approvals_are_all_recorded(engine):
+    approvers = [f"human-{i}" for i in range(CLIENTS * 2)]
+    gate = engine.gate_engine.create_gate("mandate-1", approvers, {"action": "deploy"})
+
+    _hammer(lambda a: engine.gate_engine.approve_gate(gate["gate_id"], a), approvers)
+
+    final = engine.gate_engine.get_gate_status(gate["gate_id"])
+    assert sorted(final["approvals"]) == sorted(approvers)
+    assert final["status"] == "approved"
+
+
+def test_concurrent_approve_and_reject_resolve_consistently(engine):
+    approvers = [f"human-{i}" for i in range(CLIENTS)]
+    gate = engine.gate_engine.create_gate("mandate-1", approvers, {"action": "deploy"})
+
+    def vote(i):
+        try:
+            if i == 7:
+                return engine.gate_engine.reject_gate(gate["gate_id"], approvers[i])
+            return engine.gate_engine.approve_gate(gate["gate_id"], approvers[i])
+        except Exception as e:  # gate already resolved by the rejection
+            return e
+
+    _hammer(vote, list(range(CLIENTS)))
+    final = engine.gate_engine.get_gate_status(gate["gate_id"])
+    assert final["status"] == "rejected"
+    assert final["rejections"] == [approvers[7]]
+    assert approvers[7] not in final["approvals"]
+    assert len(set(final["approvals"])) == len(final["approvals"])
+
+
+def test_concurrent_reputation_updates_are_not_lost():
+    rep = ReputationIndex()
+    _hammer(lambda i: rep.record_action(f"actor-{i % 4}", 0.01), list(range(2000)))
+
+    snapshot = rep.get_all()
+    for actor in ("actor-0", "actor-1", "actor-2", "actor-3"):
+        assert len(snapshot["history"][actor]) == 500
+        assert snapshot["scores"][actor] == pytest.approx(0.5 + 500 * 0.001)
+
+
+@pytest.mark.parametrize("flush_policy", ["entry", "batch"])
+def test_concurrent_scribe_appends_match_log_file(tmp_path, flush_policy):
+    scribe = ScribeAgent(log_path=str(tmp_path / "ledger.jsonl"), flush_policy=flush_policy, flush_every=7)
+    _hammer(lambda i: scribe.append_entry({"entry_type": "event", "n": i}), list(range(1000)))
+    _hammer(lambda i: scribe.append_entries([{"entry_type": "event", "n": i}] * 2), list(range(1000, 1100)))
+    scribe.close()
+
+    lines = (tmp_path / "ledger.jsonl").read_text().splitlines()
+    assert len(scribe.ledger) == len(lines) == 1200
+    assert [json.loads(line)["n"] for line in lines] == [e["n"] for e in scribe.ledger]
+
+
+def test_scans_run_safely_alongside_inserts(engine):
+    def work(i):
+        if i % 2:
+            return engine.create_mandate(_mandate(i))
+        return engine.storage.find_mandates(issuer=f"did:ex:issuer-{i % 7}")
+
+    _hammer(work, list(range(400)))
+    assert len(engine.mandates) == 200
+    assert engine.settle_fees()["count"] == 200
+
+
+def test_bulk_and_single_decisions_interleave_without_deadlock(engine):
+    approvers = ["human-a", "human-b"]
+    gates = [engine.gate_engine.create_gate(f"m-{i}", approvers, {"action": "x"}) for i in range(64)]
+    ids = [g["gate_id"] for g in gates]
+
+    def work(i):
+        if i % 2:
+            return engine.gate_engine.approve_many("human-a", gate_ids=ids[(i // 2) % 8::8])
+        try:
+            return engine.gate_engine.approve_gate(ids[(i // 2) % 64], "human-b")
+        except Exception as e:
+            return e
+
+    _hammer(work, list(range(256)))
+    final = [engine.gate_engine.get_gate_status(gid) for gid in ids]
+    assert all(g["status"] == "approved" for g in final)
+    assert all(sorted(g["approvals"]) == approvers for g in final)
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from sdk.python.e4a_sdk.execution_pipeline import ExecutionPipeline, ExecutionPipelineError, ExecutionQueueFull
+from sdk.python.e4a_sdk.mandate_engine import MandateEngine
+from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
+
+
+def _mandate():
+    return {
+        'issuer': 'did:ex:alice',
+        'beneficiary': 'did:ex:bob',
+        'amount': 10,
+        'currency': 'USD',
+        'intent': {
+            'goal': 'execute asynchronously',
+            'expected_outcome': 'mandate executed by the pipeline',
+            'contextual_tone': 'neutral',
+            'statistical_purpose': 'validate execution pipeline',
+        }
+    }
+
+
+class _SlowRail:
+    def __init__(self, delay):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, mandate_id, executor_id):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return {'status': 'executed', 'mandate_id': mandate_id}
+
+
+def test_default_rail_executes_through_engine():
+    engine = MandateEngine(scribe=ScribeAgent())
+    m = engine.create_mandate(_mandate())
+    with ExecutionPipeline(engine) as pipeline:
+        handle = pipeline.submit(m['mandate_id'])
+        assert handle.status in ('queued', 'running', 'executed')
+        done = pipeline.wait(handle.execution_id, timeout=5)
+        assert done.status == 'executed'
+        assert done.result['status'] == 'executed'
+
+        failed = pipeline.wait(pipeline.submit('missing').execution_id, timeout=5)
+        assert failed.status == 'failed'
+        assert 'Mandate not found' in failed.error
+    with pytest.raises(ExecutionPipelineError):
+        pipeline.get('exec-unknown')
+    assert [e['entry_type'] for e in engine.scribe.ledger] == ['mandate_created', 'mandate_executed']
+
+
+def test_per_rail_concurrency_cap_and_overlap():
+    eth = _SlowRail(0.05)
+    pipeline = ExecutionPipeline(MandateEngine(), rail_limits={'eth': 4}, handlers={'eth': eth})
+    start = time.perf_counter()
+    with pipeline:
+        handles = [pipeline.submit(f'm-{i}', rail='eth') for i in range(16)]
+        for h in handles:
+            pipeline.wait(h.execution_id, timeout=5)
+    elapsed = time.perf_counter() - start
+    assert eth.peak == 4
+    assert all(h.status == 'executed' for h in handles)
+    # 16 jobs x 50ms, 4 at a time: ~0.2s rather than 0.8s serialized
+    assert elapsed < 0.6
+
+
+def test_backpressure_when_rail_queue_is_full():
+    release = threading.Event()
+    pipeline = ExecutionPipeline(MandateEngine(), rail_limits={'ap2': 1}, max_queue=2,
+                                 handlers={'ap2': lambda mid, ex: release.wait(5)})
+    with pipeline:
+        first = pipeline.submit('m-0', rail='ap2')
+        while first.status != 'running':
+            time.sleep(0.005)
+        pipeline.submit('m-1', rail='ap2')
+        pipeline.submit('m-2', rail='ap2')
+        with pytest.raises(ExecutionQueueFull):
+            pipeline.submit('m-3', rail='ap2')
+        # other rails are unaffected
+        other = pipeline.submit('m-4', rail='eth')
+        release.set()
+    assert pipeline.get(other.execution_id).status == 'failed'  # no such mandate on the engine
+    assert pipeline.get(first.execution_id).status == 'executed'
@@ -187,3 +187,238 @@ def test_mandate_engine_integration_rejected(mandate_engine):
     # Attempt execution again, should fail with rejected error
     with pytest.raises(MandateEngineError, match="was rejected by human approvers"):
         mandate_engine.execute_mandate(mandate['mandate_id'])
+
+
+def test_indexes_follow_gate_transitions(gate_engine):
+    g1 = gate_engine.create_gate("m-1", ["human-alice", "human-bob"], {"action": "a"})
+    g2 = gate_engine.create_gate("m-2", ["human-alice"], {"action": "b"})
+    g3 = gate_engine.create_gate("m-3", ["human-bob"], {"action": "c"})
+
+    assert gate_engine.get_gate_by_mandate_id("m-2")["gate_id"] == g2["gate_id"]
+    assert gate_engine.get_gate_by_mandate_id("m-unknown") is None
+    assert [g["gate_id"] for g in gate_engine.inbox("human-alice")] == [g1["gate_id"], g2["gate_id"]]
+    assert gate_engine.inbox_size("human-bob") == 2
+
+    # alice's approval takes g1 out of her inbox only; bob still has to decide
+    gate_engine.approve_gate(g1["gate_id"], "human-alice")
+    assert [g["gate_id"] for g in gate_engine.inbox("human-alice")] == [g2["gate_id"]]
+    assert [g["gate_id"] for g in gate_engine.inbox("human-bob")] == [g1["gate_id"], g3["gate_id"]]
+
+    gate_engine.reject_gate(g3["gate_id"], "human-bob")
+    gate_engine.approve_gate(g2["gate_id"], "human-alice")
+    assert gate_engine.inbox("human-alice") == []
+    assert [g["gate_id"] for g in gate_engine.inbox("human-bob", limit=5)] == [g1["gate_id"]]
+    assert [g["gate_id"] for g in gate_engine.pending_gates()] == [g1["gate_id"]]
+    assert [g["gate_id"] for g in gate_engine.gates_by_status("approved")] == [g2["gate_id"]]
+    assert [g["gate_id"] for g in gate_engine.gates_by_status("rejected")] == [g3["gate_id"]]
+
+
+def test_indexes_rebuilt_from_storage(tmp_path):
+    from sdk.python.e4a_sdk.storage import SQLiteStorage
+
+    path = str(tmp_path / "e4a.db")
+    with SQLiteStorage(path) as storage:
+        engine = GateEngine(storage=storage)
+        gate = engine.create_gate("m-1", ["human-alice", "human-bob"], {"action": "a"})
+        engine.approve_gate(gate["gate_id"], "human-bob")
+
+    with SQLiteStorage(path) as storage:
+        engine = GateEngine(storage=storage)
+        assert engine.get_gate_by_mandate_id("m-1")["gate_id"] == gate["gate_id"]
+        assert [g["gate_id"] for g in engine.inbox("human-alice")] == [gate["gate_id"]]
+        assert engine.inbox("human-bob") == []
+
+
+def test_engines_sharing_a_sqlite_store_see_each_others_gates(tmp_path):
+    from sdk.python.e4a_sdk.storage import SQLiteStorage
+
+    path = str(tmp_path / "e4a.db")
+    with SQLiteStorage(path) as store_a, SQLiteStorage(path) as store_b:
+        a, b = GateEngine(storage=store_a), GateEngine(storage=store_b)
+        gate = a.create_gate("m-1", ["human-alice", "human-bob"], {"action": "a"})
+        assert b.get_gate_by_mandate_id("m-1")["gate_id"] == gate["gate_id"]
+        assert [g["gate_id"] for g in b.inbox("human-alice")] == [gate["gate_id"]]
+        assert b.inbox_size("human-bob") == 1
+        assert [g["gate_id"] for g in b.pending_gates()] == [gate["gate_id"]]
+
+        b.approve_gate(gate["gate_id"], "human-bob")
+        assert a.inbox("human-bob") == [] and a.inbox_size("human-alice") == 1
+        a.approve_gate(gate["gate_id"], "human-alice")
+        assert b.pending_gates() == []
+        assert [g["gate_id"] for g in b.gates_by_status("approved")] == [gate["gate_id"]]
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_expiry_scheduler_expires_due_gates():
+    clock = FakeClock()
+    scribe = ScribeAgent()
+    engine = GateEngine(scribe=scribe, clock=clock)
+    short = engine.create_gate("m-1", ["human-alice"], {"action": "a"}, expires_in_seconds=10)
+    long = engine.create_gate("m-2", ["human-alice"], {"action": "b"}, expires_in_seconds=100)
+    resolved = engine.create_gate("m-3", ["human-alice"], {"action": "c"}, expires_in_seconds=5)
+    engine.approve_gate(resolved["gate_id"], "human-alice")
+    assert engine.next_deadline() == clock.now + 5
+
+    clock.now += 50
+    expired = engine.expire_due()
+    assert [g["gate_id"] for g in expired] == [short["gate_id"]]
+    assert engine.get_gate_status(short["gate_id"])["status"] == "expired"
+    assert engine.get_gate_status(resolved["gate_id"])["status"] == "approved"
+    assert [g["gate_id"] for g in engine.pending_gates()] == [long["gate_id"]]
+    assert [e["gate_id"] for e in scribe.get_entries("gate_expired")] == [short["gate_id"]]
+
+    # reads sweep lazily, so the long gate expires without an explicit call
+    clock.now += 100
+    assert engine.pending_gates() == []
+    assert engine.inbox("human-alice") == []
+    assert len(scribe.get_entries("gate_expired")) == 2
+    with pytest.raises(GateEngineError, match="already expired"):
+        engine.approve_gate(long["gate_id"], "human-alice")
+
+
+def test_expiry_thread_wakes_for_new_deadlines():
+    import time
+
+    scribe = ScribeAgent()
+    engine = GateEngine(scribe=scribe).start_expiry()
+    try:
+        gate = engine.create_gate("m-1", ["human-alice"], {"action": "a"}, expires_in_seconds=0.05)
+        deadline = time.monotonic() + 5
+        while not scribe.get_entries("gate_expired") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert engine.gates[gate["gate_id"]]["status"] == "expired"
+    finally:
+        engine.stop_expiry()
+
+
+def test_expired_gate_blocks_execution():
+    clock = FakeClock()
+    engine = MandateEngine(scribe=ScribeAgent(), gate_expiry_seconds=60)
+    engine.gate_engine._clock = clock
+    mandate = engine.create_mandate({
+        'issuer': 'did:ex:agent-a', 'beneficiary': 'did:ex:agent-b', 'amount': 1.0, 'currency': 'USD',
+        'intent': {'goal': 'g', 'expected_outcome': 'o', 'contextual_tone': 'formal',
+                   'statistical_purpose': 'p', 'requires_approval': ['human-manager']},
+    })
+    with pytest.raises(MandateEngineError, match="requires human approval"):
+        engine.execute_mandate(mandate['mandate_id'])
+
+    clock.now += 61
+    with pytest.raises(MandateEngineError, match="expired before it was resolved"):
+        engine.execute_mandate(mandate['mandate_id'])
+
+
+def test_approve_many_by_ids_reports_per_gate_outcomes(gate_engine):
+    g1 = gate_engine.create_gate("m-1", ["human-alice"], {"action": "a"})
+    g2 = gate_engine.create_gate("m-2", ["human-alice", "human-bob"], {"action": "b"})
+    g3 = gate_engine.create_gate("m-3", ["human-bob"], {"action": "c"})
+
+    results = gate_engine.approve_many("human-alice", gate_ids=[g1["gate_id"], g2["gate_id"], g3["gate_id"], "nope"])
+
+    assert [r["status"] for r in results] == ["applied", "applied", "error", "error"]
+    assert results[0]["gate"]["status"] == "approved"
+    assert results[1]["gate"]["status"] == "pending"
+    assert "not authorized" in results[2]["error"]
+    assert results[3]["error"] == "Gate not found"
+    assert gate_engine.inbox("human-alice") == []
+
+
+def test_decide_many_by_policy_tag_uses_the_actors_inbox(gate_engine):
+    tagged = [gate_engine.create_gate(f"m-{i}", ["human-alice"], {"mandate_id": f"m-{i}", "policy_tags": ["low-risk"]})
+              for i in range(3)]
+    other = gate_engine.create_gate("m-9", ["human-alice"], {"mandate_id": "m-9", "policy_tags": ["high-risk"]})
+    foreign = gate_engine.create_gate("m-8", ["human-bob"], {"mandate_id": "m-8", "policy_tags": ["low-risk"]})
+
+    results = gate_engine.reject_many("human-alice", policy_tag="low-risk")
+
+    assert [r["gate_id"] for r in results] == [g["gate_id"] for g in tagged]
+    assert all(r["gate"]["status"] == "rejected" for r in results)
+    assert gate_engine.get_gate_status(other["gate_id"])["status"] == "pending"
+    assert gate_engine.get_gate_status(foreign["gate_id"])["status"] == "pending"
+    with pytest.raises(GateEngineError, match="Pass gate_ids or a filter"):
+        gate_engine.approve_many("human-alice")
+
+
+def test_subscribers_see_status_transitions(gate_engine):
+    seen, watched = [], []
+    g1 = gate_engine.create_gate("m-1", ["human-alice", "human-bob"], {"action": "a"})
+    g2 = gate_engine.create_gate("m-2", ["human-alice"], {"action": "b"})
+    token = gate_engine.subscribe(lambda gate, previous: seen.append((gate["gate_id"], previous, gate["status"])))
+    gate_engine.subscribe(lambda gate, previous: watched.append(gate["status"]), gate_id=g2["gate_id"])
+
+    gate_engine.approve_gate(g1["gate_id"], "human-alice")  # still pending: no transition
+    gate_engine.approve_gate(g1["gate_id"], "human-bob")
+    gate_engine.unsubscribe(token)
+    gate_engine.reject_gate(g2["gate_id"], "human-alice")
+
+    assert seen == [(g1["gate_id"], "pending", "approved")]
+    assert watched == ["rejected"]
+
+
+def test_wait_for_resolution_wakes_on_approval(gate_engine):
+    import threading
+
+    gate = gate_engine.create_gate("m-1", ["human-alice"], {"action": "a"})
+    assert gate_engine.wait_for_resolution(gate["gate_id"], timeout=0.01)["status"] == "pending"
+
+    threading.Timer(0.05, gate_engine.approve_gate, (gate["gate_id"], "human-alice")).start()
+    assert gate_engine.wait_for_resolution(gate["gate_id"], timeout=5)["status"] == "approved"
+    # already resolved: returns immediately
+    assert gate_engine.wait_for_resolution(gate["gate_id"])["status"] == "approved"
+
+
+def test_auto_execute_on_approval(mandate_engine):
+    mandate_engine.enable_auto_execute()
+    mandate = mandate_engine.create_mandate({
+        'issuer': 'did:ex:agent-a', 'beneficiary': 'did:ex:agent-b', 'amount': 10.0, 'currency': 'USD',
+        'intent': {'goal': 'g', 'expected_outcome': 'o', 'contextual_tone': 'formal',
+                   'statistical_purpose': 'p', 'requires_approval': ['human-manager']},
+    })
+    with pytest.raises(MandateEngineError, match="requires human approval"):
+        mandate_engine.execute_mandate(mandate['mandate_id'])
+    gate = mandate_engine.gate_engine.get_gate_by_mandate_id(mandate['mandate_id'])
+
+    mandate_engine.gate_engine.approve_gate(gate['gate_id'], 'human-manager')
+
+    executed = mandate_engine.scribe.get_entries('mandate_executed')
+    assert [e['mandate_id'] for e in executed] == [mandate['mandate_id']]
+    assert mandate_engine.auto_executions[mandate['mandate_id']]['status'] == 'started'
+
+    mandate_engine.disable_auto_execute()
+    other = mandate_engine.gate_engine.create_gate(mandate['mandate_id'], ['human-manager'], {'action': 'x'})
+    mandate_engine.gate_engine.approve_gate(other['gate_id'], 'human-manager')
+    assert len(mandate_engine.scribe.get_entries('mandate_executed')) == 1
+
+
+def test_auto_execute_records_executor_failures(mandate_engine):
+    def executor(mandate_id):
+        raise RuntimeError('rail saturated')
+
+    mandate_engine.enable_auto_execute(executor)
+    gate = mandate_engine.gate_engine.create_gate('m-1', ['human-manager'], {'action': 'x'})
+    mandate_engine.mandates['m-1'] = {'mandate_id': 'm-1'}
+    approved = mandate_engine.gate_engine.approve_gate(gate['gate_id'], 'human-manager')
+
+    assert approved['status'] == 'approved'
+    assert mandate_engine.auto_executions['m-1'] == {
+        'gate_id': gate['gate_id'], 'status': 'failed', 'error': 'rail saturated'}
+
+
+def test_auto_execution_outcomes_are_bounded():
+    engine = MandateEngine(scribe=ScribeAgent(), auto_execution_max_entries=2)
+    engine.enable_auto_execute(lambda mandate_id: f'exec-{mandate_id}')
+    for i in range(4):
+        engine.mandates[f'm-{i}'] = {'mandate_id': f'm-{i}'}
+        gate = engine.gate_engine.create_gate(f'm-{i}', ['human-manager'], {'action': 'x'})
+        engine.gate_engine.approve_gate(gate['gate_id'], 'human-manager')
+
+    assert list(engine.auto_executions) == ['m-2', 'm-3']
+    assert engine.auto_execution('m-0') is None
+    assert engine.auto_execution('m-3')['result'] == 'exec-m-3'
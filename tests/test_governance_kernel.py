@@ -0,0 +1,211 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+
+from sdk.python.e4a_sdk.governance_kernel import GovernanceKernel
+from sdk.python.e4a_sdk.reputation_index import ReputationIndex
+from sdk.python.e4a_sdk.state_journal import StateJournalError
+
+
+def _kernel(path, **kw):
+    return GovernanceKernel(reputation_index=ReputationIndex(), state_path=str(path), **kw)
+
+
+def _seed(g, votes=3):
+    g.register_charter("charter-x", {"name": "Test Charter"})
+    g.submit_proposal("charter-x", "prop-1", {"action": "a"})
+    for i in range(votes):
+        g.vote("prop-1", f"voter-{i}", "yes" if i % 3 else "no")
+
+
+def test_votes_are_journaled_not_rewritten(tmp_path):
+    path = tmp_path / "gov.json"
+    g = _kernel(path)
+    _seed(g)
+
+    assert not path.exists()  # no snapshot yet: every write was one journal line
+    lines = (tmp_path / "gov.json.journal").read_text().splitlines()
+    assert [json.loads(line)["op"] for line in lines] == ["register_charter", "submit_proposal", "vote", "vote", "vote"]
+    assert [json.loads(line)["seq"] for line in lines] == [1, 2, 3, 4, 5]
+
+    g.close()
+    restarted = _kernel(path)
+    assert restarted.state == g.state
+    assert restarted.simulate_and_enact("prop-1")["status"] == "enacted"
+
+
+def test_compaction_snapshots_and_resets_journal(tmp_path):
+    path = tmp_path / "gov.json"
+    g = _kernel(path, snapshot_every=10)
+    _seed(g, votes=12)  # 14 operations: one compaction at 10, four in the journal
+
+    snapshot = json.loads(path.read_text())
+    assert snapshot["seq"] == 10
+    assert len((tmp_path / "gov.json.journal").read_text().splitlines()) == 4
+
+    g.close()
+    restarted = _kernel(path)
+    assert restarted.state == g.state
+    assert restarted.journal.seq == 14
+    assert not [f for f in os.listdir(tmp_path) if ".tmp." in f]
+
+
+def test_torn_journal_tail_is_dropped(tmp_path):
+    path = tmp_path / "gov.json"
+    g = _kernel(path)
+    _seed(g, votes=2)
+    g.close()
+    with open(tmp_path / "gov.json.journal", "ab") as fh:
+        fh.write(b'{"seq": 5, "op": "vote", "proposal_id": "prop-1", "vot')  # crash mid-write
+
+    restarted = _kernel(path)
+    assert restarted.state["proposals"]["prop-1"]["votes"] == {"voter-0": "no", "voter-1": "yes"}
+    restarted.vote("prop-1", "voter-9", "yes")
+    restarted.close()
+    assert _kernel(path).state["proposals"]["prop-1"]["votes"]["voter-9"] == "yes"
+
+
+def test_records_already_in_snapshot_are_not_replayed(tmp_path):
+    path = tmp_path / "gov.json"
+    g = _kernel(path)
+    _seed(g, votes=2)
+    journal = (tmp_path / "gov.json.journal").read_bytes()
+    g.compact()
+    g.close()
+    # crash after the snapshot rename but before the journal reset
+    (tmp_path / "gov.json.journal").write_bytes(journal)
+
+    restarted = _kernel(path)
+    assert restarted.state == g.state
+    assert restarted.journal.pending == 0
+
+
+def test_legacy_snapshot_loads(tmp_path):
+    path = tmp_path / "gov.json"
+    legacy = {"charters": {"c": {"charter_id": "c", "doc": {}, "registered_at": "2025-11-11T00:00:00+00:00"}},
+              "proposals": {}}
+    path.write_text(json.dumps(legacy, indent=2))
+
+    g = _kernel(path)
+    assert g.state == legacy
+    g.submit_proposal("c", "p", {"action": "a"})
+    g.close()
+    assert "p" in _kernel(path).state["proposals"]
+
+
+def test_rejects_unknown_fsync_policy(tmp_path):
+    with pytest.raises(StateJournalError):
+        _kernel(tmp_path / "gov.json", fsync="sometimes")
+
+
+def _recomputed(g, proposal_id):
+    yes = no = 0.0
+    for voter_id, vote in g.state["proposals"][proposal_id]["votes"].items():
+        score = g.reputation_index.get_score(voter_id)
+        if vote in ("yes", "y", "approve"):
+            yes += score
+        elif vote in ("no", "n", "reject"):
+            no += score
+    return yes, no
+
+
+def test_tallies_follow_votes_and_vote_changes(tmp_path):
+    g = _kernel(tmp_path / "gov.json")
+    _seed(g, votes=0)
+    g.reputation_index.record_action("alice", 3.0)  # 0.8
+    g.vote("prop-1", "alice", "yes")
+    g.vote("prop-1", "bob", "no")
+    g.vote("prop-1", "carol", "abstain")
+    assert g.tally("prop-1") == {"yes": 0.8, "no": 0.5, "votes": 3}
+
+    g.vote("prop-1", "alice", "no")  # changed vote moves alice's weight
+    assert g.tally("prop-1") == {"yes": 0.0, "no": 1.3, "votes": 3}
+    assert g.simulate_and_enact("prop-1", quorum=3)["status"] == "rejected"
+
+
+def test_tallies_adjust_when_reputation_changes(tmp_path):
+    g = _kernel(tmp_path / "gov.json")
+    g.register_charter("c", {})
+    for p in range(50):
+        g.submit_proposal("c", f"p-{p}", {"action": "a"})
+        for v in range(20):
+            g.vote(f"p-{p}", f"voter-{v}", "yes" if (p + v) % 3 else "no")
+    for v in range(0, 20, 3):
+        g.reputation_index.record_action(f"voter-{v}", -2.0)
+        g.reputation_index.record_action(f"voter-{v + 1}", 1.5)
+
+    for p in range(50):
+        tally = g.tally(f"p-{p}")
+        assert (tally["yes"], tally["no"]) == pytest.approx(_recomputed(g, f"p-{p}"), abs=1e-8)
+
+
+def test_tallies_rebuilt_on_restart_and_reset_on_resubmit(tmp_path):
+    path = tmp_path / "gov.json"
+    g = _kernel(path)
+    _seed(g, votes=6)
+    g.close()
+
+    restarted = _kernel(path)
+    assert restarted.tally("prop-1") == {"yes": 2.0, "no": 1.0, "votes": 6}
+    restarted.simulate_and_enact("prop-1")
+    assert restarted.tallies() == {}
+    assert "prop-1" in restarted.tallies(open_only=False)
+
+    restarted.submit_proposal("charter-x", "prop-1", {"action": "again"})
+    assert restarted.tally("prop-1") == {"yes": 0.0, "no": 0.0, "votes": 0}
+    restarted.reputation_index.record_action("voter-1", 1.0)  # no longer a voter on prop-1
+    assert restarted.tally("prop-1")["yes"] == 0.0
+
+
+def test_tallies_follow_decaying_reputation(tmp_path):
+    now = [1_700_000_000.0]
+    rep = ReputationIndex(half_life=86400, clock=lambda: now[0])
+    g = GovernanceKernel(reputation_index=rep, state_path=str(tmp_path / "gov.json"))
+    _seed(g, votes=0)
+    rep.record_action("alice", 3.0)  # 0.8, a long time ago
+    rep.record_action("bob", -2.0)   # 0.3
+    g.vote("prop-1", "alice", "yes")
+    g.vote("prop-1", "bob", "no")
+    assert g.tally("prop-1") == {"yes": 0.8, "no": 0.3, "votes": 2}
+
+    now[0] += 86400  # one half-life: both halfway back to 0.5
+    assert g.tally("prop-1") == {"yes": 0.65, "no": 0.4, "votes": 2}
+    assert g.simulate_and_enact("prop-1")["weighted_votes"] == {"yes": 0.65, "no": 0.4}
+
+
+def _vote_worker(path, worker, votes, start):
+    g = _kernel(path, fsync="never", snapshot_every=250)
+    start.wait()
+    for i in range(votes):
+        g.vote(f"prop-{i % 4}", f"voter-{worker}-{i}", "yes" if i % 2 else "no")
+    g.close()
+
+
+def test_concurrent_processes_lose_no_votes(tmp_path):
+    path = str(tmp_path / "gov.json")
+    g = _kernel(path, fsync="never", snapshot_every=250)
+    g.register_charter("c", {})
+    for p in range(4):
+        g.submit_proposal("c", f"prop-{p}", {"action": "a"})
+
+    workers, votes = 4, 500
+    ctx = multiprocessing.get_context("spawn")
+    start = ctx.Event()
+    procs = [ctx.Process(target=_vote_worker, args=(path, w, votes, start)) for w in range(workers)]
+    for proc in procs:
+        proc.start()
+    start.set()
+    for proc in procs:
+        proc.join(120)
+        assert proc.exitcode == 0
+
+    # the long-lived kernel catches up (several compactions happened meanwhile)
+    assert g.tally("prop-0")["votes"] == workers * votes // 4
+    g.close()
+    restarted = _kernel(path)
+    assert restarted.journal.seq == 5 + workers * votes
+    assert restarted.state == g.state
+    cast = {v for prop in restarted.state["proposals"].values() for v in prop["votes"]}
+    assert cast == {f"voter-{w}-{i}" for w in range(workers) for i in range(votes)}
@@ -0,0 +1,76 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from sdk.python.e4a_sdk.governance_sim import GovernanceSimError, GovernanceSimulator, load_voting_rules, quorum_votes
+
+
+def _population(**extra):
+    pop = {
+        "voters": 101,
+        "reputation": {"distribution": "fixed", "value": 0.5},
+        "turnout": {"mean": 1.0},
+        "support": {"mean": 0.5},
+        "abstain": 0.0,
+        "reputation_tilt": 0.0,
+    }
+    pop.update(extra)
+    return pop
+
+
+def test_rules_file_merges_defaults():
+    config = load_voting_rules()
+    assert config["rules"]["standard"] == {"quorum_fraction": 0.2, "threshold": 0.5, "weighting": "reputation"}
+    assert config["rules"]["charter_amendment"]["threshold"] == 0.667
+    assert config["rules"]["parameter_change"]["weighting"] == "equal"
+    assert "default" in config["populations"]
+
+
+def test_invalid_rules_are_rejected(tmp_path):
+    path = tmp_path / "rules.yaml"
+    path.write_text("rules:\n  bad: {quorum_fraction: 1.5}\n")
+    with pytest.raises(GovernanceSimError):
+        load_voting_rules(str(path))
+    path.write_text("rules:\n  counted: {quorum: 40}\n")
+    with pytest.raises(GovernanceSimError, match="quorum_fraction"):
+        load_voting_rules(str(path))
+    with pytest.raises(GovernanceSimError):
+        GovernanceSimulator().simulate("no-such-rule")
+
+
+def test_certain_outcomes():
+    sim = GovernanceSimulator()
+    assert sim.simulate({}, _population(support={"mean": 1.0}), trials=200, seed=1)["enact_probability"] == 1.0
+    assert sim.simulate({}, _population(support={"mean": 0.0}), trials=200, seed=1)["enact_probability"] == 0.0
+    unreachable = sim.simulate({"quorum_fraction": 0.5}, _population(turnout={"mean": 0.3}, support={"mean": 1.0}),
+                               trials=200, seed=1)
+    assert unreachable["quorum_met_probability"] == 0.0
+    assert unreachable["enact_probability"] == 0.0
+
+
+def test_even_split_enacts_half_the_time():
+    # 101 equal voters, each yes with p=0.5: by symmetry a strict majority half the time
+    result = GovernanceSimulator().simulate({"weighting": "equal"}, _population(), trials=20_000, seed=7)
+    assert result["enact_probability"] == pytest.approx(0.5, abs=0.02)
+    assert result["sensitivity"]["threshold"] < 0
+
+
+def test_sweep_is_monotone_and_matches_simulate():
+    sim = GovernanceSimulator()
+    sweep = sim.sweep("default", trials=5_000, seed=3)
+    grid = sweep["enact_probability"]
+    assert len(grid) == len(sweep["quorum_fractions"]) and len(grid[0]) == len(sweep["thresholds"])
+    for row in grid:
+        assert all(a >= b for a, b in zip(row, row[1:]))  # stricter threshold never helps
+    for col in zip(*grid):
+        assert all(a >= b for a, b in zip(col, col[1:]))  # nor does a higher quorum
+
+    q, t = sweep["quorum_fractions"].index(0.2), sweep["thresholds"].index(0.5)
+    assert sim.simulate("standard", "default", trials=5_000, seed=3)["enact_probability"] == grid[q][t]
+
+
+def test_quorum_fraction_converts_to_the_kernel_vote_count():
+    assert quorum_votes(0.2, 200) == 40
+    assert quorum_votes(0.25, 101) == 26  # rounds up: 25 votes would be under a quarter
+    assert quorum_votes(0.0, 50) == 0
+    assert quorum_votes(0.1, 30) == 3  # 0.1 * 30 is 3.0000000000000004 in floating point
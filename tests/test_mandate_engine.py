@@ -1,5 +1,6 @@
 from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
 from sdk.python.e4a_sdk.mandate_engine import MandateEngine
+from sdk.python.e4a_sdk.nonce_index import NonceIndex
 
 
 def test_create_and_execute_mandate(tmp_path):
@@ -29,3 +30,104 @@ def test_create_and_execute_mandate(tmp_path):
     lines = open(log, 'r').read().strip().splitlines()
     assert any('mandate_created' in ln for ln in lines)
     assert any('mandate_executed' in ln for ln in lines)
+
+
+def _mandate(**extra):
+    m = {
+        "issuer": "did:ex:alice",
+        "beneficiary": "did:ex:bob",
+        "amount": 10,
+        "currency": "USD",
+        "intent": {
+            "goal": "idempotent create",
+            "expected_outcome": "one mandate per nonce",
+            "contextual_tone": "neutral",
+            "statistical_purpose": "validate replay protection"
+        }
+    }
+    m.update(extra)
+    return m
+
+
+def test_replay_nonce_returns_original_mandate():
+    me = MandateEngine(scribe=ScribeAgent())
+    first = me.create_mandate(_mandate(replay_nonce="n-1"))
+    again = me.create_mandate(_mandate(replay_nonce="n-1", amount=99))
+    assert again == first
+    assert len(me.mandates) == 1
+    assert len(me.scribe.ledger) == 1
+    other = me.create_mandate(_mandate(replay_nonce="n-2"))
+    assert other['mandate_id'] != first['mandate_id']
+
+
+def test_replay_nonce_through_submandate():
+    me = MandateEngine()
+    parent = me.create_mandate(_mandate(replay_nonce="parent"))
+    sub = me.create_submandate(parent['mandate_id'], _mandate(replay_nonce="child"))
+    assert sub['parent_mandate_id'] == parent['mandate_id']
+    assert me.create_submandate(parent['mandate_id'], _mandate(replay_nonce="child")) == sub
+    # a submandate replaying the parent's nonce resolves to the parent, not a new child
+    assert me.create_submandate(parent['mandate_id'], _mandate(replay_nonce="parent")) == parent
+    assert len(me.mandates) == 2
+
+
+def test_nonce_retention_by_count_and_age():
+    me = MandateEngine(nonce_max_entries=2)
+    for i in range(3):
+        me.create_mandate(_mandate(replay_nonce=f"n-{i}"))
+    assert len(me.nonce_index) == 2
+    assert me.nonce_index.get("n-0") is None
+    assert me.nonce_index.get("n-2") is not None
+
+    now = [0.0]
+    idx = NonceIndex(max_age_seconds=10, clock=lambda: now[0])
+    idx.add("a", "m-a")
+    now[0] = 5.0
+    idx.add("b", "m-b")
+    now[0] = 12.0
+    assert idx.get("a") is None
+    assert idx.get("b") == "m-b"
+    assert len(idx) == 1
+
+
+def test_create_mandates_batch_single_scribe_write(tmp_path):
+    log = tmp_path / "mission_log.jsonl"
+    me = MandateEngine(scribe=ScribeAgent(log_path=str(log)))
+    me.create_mandate(_mandate(replay_nonce="existing"))
+    results = me.create_mandates([
+        _mandate(replay_nonce="x"),
+        _mandate(replay_nonce="existing"),
+        {"issuer": "did:ex:alice"},
+        _mandate(),
+        _mandate(replay_nonce="x"),
+    ])
+    assert [r['status'] for r in results] == ['created', 'duplicate', 'error', 'created', 'duplicate']
+    assert results[4]['mandate'] is results[0]['mandate']
+    assert "Mandate validation error" in results[2]['error']
+    assert len(me.mandates) == 3
+    lines = log.read_text().strip().splitlines()
+    assert len(lines) == 3
+
+
+def test_submandate_tree_queries_and_fee_rollup():
+    me = MandateEngine()
+    fees = {"protocol": 0.1, "validator": 0.05, "issuer": 0.0}
+    root = me.create_mandate(_mandate(amount=100, fee_distribution=fees))
+    a = me.create_submandate(root['mandate_id'], _mandate(amount=10, fee_distribution=fees))
+    b = me.create_submandate(root['mandate_id'], _mandate(amount=20, currency="EUR", fee_distribution=fees))
+    chain = [a]
+    for _ in range(3000):
+        chain.append(me.create_submandate(chain[-1]['mandate_id'], _mandate(amount=1, fee_distribution=fees)))
+
+    assert me.get_children(root['mandate_id']) == [a['mandate_id'], b['mandate_id']]
+    descendants = me.list_descendants(root['mandate_id'])
+    assert descendants[:2] == [a['mandate_id'], b['mandate_id']]
+    assert len(descendants) == 3002
+    assert me.subtree_stats(root['mandate_id']) == {'mandate_id': root['mandate_id'], 'size': 3003, 'depth': 3001}
+    assert me.subtree_stats(b['mandate_id'])['size'] == 1
+
+    rollup = me.rollup_fees(root['mandate_id'])
+    usd = rollup['totals']['USD']
+    assert usd['amount'] == 100 + 10 + 3000
+    assert abs(usd['protocol_amount'] - 311.0) < 1e-6
+    assert rollup['totals']['EUR']['validator_amount'] == me.process_fees(b['mandate_id'])['validator_amount']
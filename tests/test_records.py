@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from sdk.python.e4a_sdk.mandate_engine import MandateEngine, MandateEngineError
+from sdk.python.e4a_sdk.records import MISSING, GateRecord, MandateRecord
+from sdk.python.e4a_sdk.storage import InMemoryStorage
+
+
+MANDATE = {
+    'mandate_id': 'm-1',
+    'parent_mandate_id': None,
+    'issuer': 'did:ex:alice',
+    'beneficiary': 'did:ex:bob',
+    'amount': 12.5,
+    'currency': 'USD',
+    'created_at': '2025-01-01T00:00:00Z',
+    'fee_distribution': {'protocol': 0.01, 'validator': 0.02, 'issuer': 0},
+    'policy_tags': ['ops', 'finance'],
+    'inherit_values': True,
+    'proof_anchor': {'chain': 'eth', 'tx': '0xabc'},
+    'intent': {
+        'goal': 'g', 'expected_outcome': 'o', 'contextual_tone': 'formal', 'statistical_purpose': 'p',
+        'requires_approval': ['human-a'], 'note': 'unknown intent field',
+    },
+}
+
+
+def test_mandate_record_round_trip_is_lossless():
+    rec = MandateRecord.from_dict(MANDATE)
+    assert rec.to_dict() == MANDATE
+    assert json.loads(json.dumps(rec.to_dict())) == MANDATE
+    assert rec.extra == {'inherit_values': True, 'proof_anchor': {'chain': 'eth', 'tx': '0xabc'}}
+    assert rec.validator_ref is MISSING and 'validator_ref' not in rec.to_dict()
+    assert rec.parent_mandate_id is None
+    assert rec.get('fee_distribution') == MANDATE['fee_distribution']
+    assert rec.get('inherit_values') is True
+    assert rec.get('missing', 'dflt') == 'dflt'
+
+    minimal = {'mandate_id': 'm-2', 'issuer': 'a', 'beneficiary': 'b', 'intent': {'goal': 'x'}}
+    assert MandateRecord.from_dict(minimal).to_dict() == minimal
+
+
+def test_records_share_interned_strings_and_fee_tuples():
+    a = MandateRecord.from_dict(json.loads(json.dumps(MANDATE)))
+    b = MandateRecord.from_dict(json.loads(json.dumps(MANDATE)))
+    assert a.issuer is b.issuer
+    assert a.currency is b.currency
+    assert a.fee_distribution is b.fee_distribution
+    assert not hasattr(a, '__dict__')
+
+
+def test_fee_values_keep_their_types():
+    for fees in ({'issuer': 0}, {'issuer': 0.0}, {'issuer': False}, {'issuer': 1}, {'issuer': True}):
+        out = MandateRecord.from_dict({**MANDATE, 'fee_distribution': fees}).to_dict()['fee_distribution']
+        assert out == fees and type(out['issuer']) is type(fees['issuer'])
+
+
+def test_fee_intern_table_is_bounded(monkeypatch):
+    from sdk.python.e4a_sdk import records
+    monkeypatch.setattr(records, '_FEE_CACHE', {})
+    monkeypatch.setattr(records, '_FEE_CACHE_SIZE', 2)
+    recs = [MandateRecord.from_dict({**MANDATE, 'fee_distribution': {'issuer': i / 100}}) for i in range(5)]
+    assert len(records._FEE_CACHE) == 2
+    assert [r.to_dict()['fee_distribution'] for r in recs] == [{'issuer': i / 100} for i in range(5)]
+
+
+def test_gate_record_round_trip():
+    gate = {'gate_id': 'g-1', 'mandate_id': 'm-1', 'status': 'pending', 'required_approvers': ['a', 'b'],
+            'approvals': [], 'rejections': [], 'created_at': 'now', 'expires_at': None, 'payload': {'x': 1}}
+    assert GateRecord.from_dict(gate).to_dict() == gate
+
+
+def test_records_do_not_alias_nested_documents():
+    gate = {'gate_id': 'g-1', 'mandate_id': 'm-1', 'status': 'pending', 'payload': {'x': [1]},
+            'note': {'by': 'ops'}}
+    record = GateRecord.from_dict(gate)
+    gate['payload']['x'].append(2)
+    gate['note']['by'] = 'someone else'
+    out = record.to_dict()
+    assert out['payload'] == {'x': [1]} and out['note'] == {'by': 'ops'}
+    out['payload']['x'].append(3)
+    out['note']['by'] = 'changed'
+    assert record.to_dict()['payload'] == {'x': [1]} and record.to_dict()['note'] == {'by': 'ops'}
+    # sequences come back as lists, whatever type they went in as
+    assert GateRecord.from_dict({'approvals': ('a', 'b')}).to_dict() == {'approvals': ['a', 'b']}
+
+
+def test_gates_reference_their_mandate_by_id():
+    engine = MandateEngine()
+    m = engine.create_mandate({k: v for k, v in MANDATE.items() if k != 'mandate_id'})
+    with pytest.raises(MandateEngineError):
+        engine.execute_mandate(m['mandate_id'])
+    gate = engine.gate_engine.get_gate_by_mandate_id(m['mandate_id'])
+    assert gate['payload'] == m
+
+    stored = engine.storage.gates.records()
+    (record,) = list(stored)
+    assert record.payload is MISSING
+    assert record.payload_ref == m['mandate_id']
+
+    approved = engine.gate_engine.approve_gate(gate['gate_id'], 'human-a')
+    assert approved['status'] == 'approved'
+    assert approved['payload'] == m
+    assert engine.execute_mandate(m['mandate_id'])['status'] == 'executed'
+
+
+def test_plain_dict_storage_still_available():
+    store = InMemoryStorage(compact=False)
+    store.mandates['m-1'] = MANDATE
+    assert store.mandates['m-1'] is MANDATE
@@ -0,0 +1,376 @@
+import multiprocessing
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+from sdk.python.e4a_sdk.ranked_set import RankedSet
+from sdk.python.e4a_sdk.reputation_index import ReputationIndex
+from sdk.python.e4a_sdk.reputation_store import ReputationStore
+from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
+
+
+def _executed(executor="node-1"):
+    return {"entry_type": "mandate_executed", "mandate_id": "m-1", "executor": executor}
+
+
+def test_ingest_applies_each_entry_once():
+    scribe, rep = ScribeAgent(), ReputationIndex()
+    scribe.append_entries([_executed(), _executed(), {"entry_type": "mandate_created", "mandate_id": "m-1"}])
+
+    assert rep.ingest_from_scribe(scribe) == 2
+    assert rep.get_score("node-1") == pytest.approx(0.7)
+    assert rep.ingest_from_scribe(scribe) == 0  # nothing new: scores do not drift
+    assert rep.get_score("node-1") == pytest.approx(0.7)
+
+    scribe.append_entry(_executed("node-2"))
+    assert rep.ingest_from_scribe(scribe) == 1
+    assert rep.get_score("node-2") == pytest.approx(0.6)
+    assert len(rep.get_all()["history"]["node-1"]) == 2
+
+
+def test_cursor_is_per_scribe():
+    a, b, rep = ScribeAgent(), ScribeAgent(), ReputationIndex()
+    a.append_entry(_executed())
+    rep.ingest_from_scribe(a)
+    b.append_entry(_executed())
+    assert rep.ingest_from_scribe(b) == 1
+    assert rep.get_score("node-1") == pytest.approx(0.7)
+
+
+def test_event_rules_are_configurable():
+    scribe = ScribeAgent()
+    rep = ReputationIndex(event_rules={
+        "mandate_executed": None,
+        "gate_expired": {"delta": -2.0, "actor": "mandate_id", "context": "Gate expired"},
+    })
+    scribe.append_entries([_executed(), {"entry_type": "gate_expired", "gate_id": "g-1", "mandate_id": "m-9"}])
+
+    assert rep.ingest_from_scribe(scribe) == 1
+    assert "node-1" not in rep.scores
+    assert rep.get_score("m-9") == pytest.approx(0.3)
+    assert rep.get_all()["history"]["m-9"][0]["context"] == "Gate expired"
+
+
+def test_legacy_event_text_and_actor_fallback():
+    scribe, rep = ScribeAgent(), ReputationIndex()
+    scribe.append_entries([{"entry_type": "event", "event": "Mandate executed", "actor": "agent-7"},
+                           {"entry_type": "event", "event": "infraction"}])
+    assert rep.ingest_from_scribe(scribe) == 2
+    assert rep.get_score("agent-7") == pytest.approx(0.6)
+    assert rep.get_score("api-node") == pytest.approx(0.4)
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_history_keeps_recent_events_and_aggregates():
+    clock = FakeClock(1_700_000_000.0 - 1_700_000_000.0 % 86400)  # midnight UTC
+    rep = ReputationIndex(history_size=3, hourly_buckets=2, clock=clock)
+    for i in range(10):
+        clock.now += 1800  # two events per hour
+        rep.record_action("a", 1.0 if i % 2 else -1.0, f"ctx-{i % 2}")
+
+    raw = rep.history_of("a")
+    assert [e["context"] for e in raw] == ["ctx-1", "ctx-0", "ctx-1"]
+    assert [e["new_score"] for e in raw] == [pytest.approx(0.5), pytest.approx(0.4), pytest.approx(0.5)]
+    assert rep.history["a"].total == 10
+    assert len(rep.contexts) == 2  # contexts interned once per distinct string
+
+    hourly = rep.history_of("a", "hourly")
+    assert [h["count"] for h in hourly] == [2, 1]  # only the two newest hours kept
+    daily = rep.history_of("a", "daily")
+    assert daily == [{"start": daily[0]["start"], "count": 10, "delta": 0.0, "min_score": pytest.approx(0.4),
+                      "max_score": pytest.approx(0.5), "last_score": pytest.approx(0.5)}]
+    assert daily[0]["start"].endswith("T00:00:00Z")
+    assert rep.get_all()["history"]["a"] == [{k: e[k] for k in ("delta", "context", "new_score")} for e in raw]
+
+
+def test_late_events_land_in_their_bucket():
+    clock = FakeClock(1_700_000_000.0)
+    rep = ReputationIndex(clock=clock)
+    rep.record_action("a", 1.0)
+    clock.now += 7200
+    rep.record_action("a", 1.0)
+    clock.now -= 3600  # out of order, e.g. a delayed ingest
+    rep.record_action("a", 1.0)
+    assert [h["count"] for h in rep.history_of("a", "hourly")] == [1, 1, 1]
+    with pytest.raises(ValueError):
+        rep.history_of("a", "weekly")
+
+
+def test_scores_decay_lazily_towards_neutral():
+    clock = FakeClock()
+    rep = ReputationIndex(half_life=3600, clock=clock)
+    rep.record_action("a", 4.0)  # 0.9
+    rep.record_action("b", 1.0)
+    assert rep.get_score("a") == pytest.approx(0.9)
+
+    clock.now += 3600
+    assert rep.scores["a"] == pytest.approx(0.9)  # nothing is rewritten until the actor is touched
+    assert rep.get_score("a") == pytest.approx(0.7)
+    assert rep.get_all()["scores"]["a"] == pytest.approx(0.7)
+    assert rep.record_action("a", 1.0) == pytest.approx(0.8)  # the step applies to the decayed score
+
+    rep.set_half_life("b", float("inf"))  # b never decays
+    clock.now += 7200
+    assert rep.get_score("a") == pytest.approx(0.575)
+    assert rep.get_score("b") == pytest.approx(0.5 + 0.1 * 0.5)  # decayed one hour, then frozen
+    assert ReputationIndex(clock=clock).decays is False
+
+
+def test_scores_as_of_replays_history():
+    clock = FakeClock(1_700_000_000.0)
+    rep = ReputationIndex(half_life=1000, history_size=2, clock=clock)
+    rep.record_action("a", 5.0)  # 1.0 at t0
+    clock.now += 1000
+    rep.record_action("a", -1.0)  # 0.75 - 0.1
+    clock.now += 1000
+    rep.record_action("a", 0.0)
+    clock.now += 1000
+    rep.record_action("b", 1.0)
+    t0 = 1_700_000_000.0
+
+    scores = rep.scores_as_of(t0 + 1500)
+    assert scores["a"] == pytest.approx(0.5 + 0.15 * 0.5 ** 0.5)
+    assert scores["b"] == 0.5  # no action yet
+    assert rep.scores_as_of(t0 + 4000, ["a", "zed"]) == {"a": pytest.approx(0.5 + 0.075 / 4), "zed": 0.5}
+    # a's first raw event rotated out, and the hourly bucket it landed in had not closed by then
+    assert rep.scores_as_of(t0 + 500, ["a"]) == {"a": None}
+    assert rep.scores_as_of("2023-11-14T23:00:00Z", ["b"]) == {"b": 0.5}  # b acted at 23:03:20
+
+
+def test_late_ingestion_uses_the_entry_timestamps():
+    t = 1_700_000_000.0
+    scribe, clock = ScribeAgent(), FakeClock(t + 30 * 86400)  # ingested 30 days after it happened
+    rep = ReputationIndex(half_life=30 * 86400, clock=clock)
+    scribe.append_entry({**_executed(), "timestamp": datetime.fromtimestamp(t, timezone.utc).isoformat()})
+    rep.ingest_from_scribe(scribe)
+
+    assert rep.updated["node-1"] == t
+    assert rep.scores_as_of(t + 10)["node-1"] == pytest.approx(0.6, abs=1e-5)
+    assert rep.scores_as_of(t - 10)["node-1"] == 0.5
+    assert rep.get_score("node-1") == pytest.approx(0.55)  # one half-life has passed since
+    assert rep.history_of("node-1")[0]["timestamp"] == "2023-11-14T22:13:20Z"
+
+
+def test_scores_as_of_falls_back_to_aggregates():
+    clock = FakeClock(1_700_000_000.0 - 1_700_000_000.0 % 3600)
+    rep = ReputationIndex(half_life=3600, history_size=1, clock=clock)
+    rep.record_action("a", 2.0)  # 0.7, in the first hour
+    clock.now += 7200
+    rep.record_action("a", 1.0)
+    assert rep.scores_as_of(clock.now - 1800, ["a"]) == {"a": pytest.approx(0.5 + 0.2 * 0.5 ** 0.5)}
+
+
+def test_decay_survives_the_store(tmp_path):
+    path, clock = str(tmp_path / "rep.db"), FakeClock()
+    rep = ReputationIndex(store=path, half_life=3600, clock=clock)
+    rep.record_action("a", 4.0)
+    rep.set_half_life("b", 60)
+    rep.record_action("b", -5.0)
+    rep.close()
+
+    clock.now += 3600
+    warm = ReputationIndex(store=path, half_life=3600, clock=clock)
+    assert warm.get_score("a") == pytest.approx(0.7)
+    assert warm.get_score("b") == pytest.approx(0.5)
+    assert warm.record_action("a", 1.0) == pytest.approx(0.8)
+    warm.checkpoint()
+    assert ReputationIndex(store=path, half_life=3600, clock=clock).get_score("a") == pytest.approx(0.8)
+    warm.close()
+
+
+def test_ranked_set_matches_a_sorted_list():
+    rng = random.Random(7)
+    ranked, reference = RankedSet(rng.sample(range(10_000), 300), load=4), None
+    reference = sorted(ranked)
+    for _ in range(2000):
+        item = rng.randrange(10_000)
+        if item in ranked:
+            ranked.remove(item)
+            reference.remove(item)
+        else:
+            ranked.add(item)
+            reference.append(item)
+            reference.sort()
+        probe = rng.randrange(10_000)
+        assert ranked.rank(probe) == sum(1 for x in reference if x < probe)
+    assert list(ranked) == reference and len(ranked) == len(reference)
+    assert [ranked[i] for i in range(-3, 3)] == reference[-3:] + reference[:3]
+    assert list(ranked.walk(10)) == reference[10:]
+    assert list(ranked.walk(10, reverse=True)) == reference[10::-1]
+    with pytest.raises(KeyError):
+        ranked.remove(-1)
+
+
+def _leaderboard(decay):
+    clock = FakeClock()
+    rep = ReputationIndex(half_life=3600 if decay else None, clock=clock)
+    rng = random.Random(3)
+    for i in range(400):
+        clock.now += rng.randrange(600)
+        rep.record_action(f"actor-{rng.randrange(60)}", rng.uniform(-3, 3))
+    if decay:
+        rep.set_half_life("actor-5", 60)  # ordered per query, not by key
+        rep.set_half_life("actor-6", float("inf"))
+    clock.now += 1800
+    return rep, sorted(rep.scores_as_of(clock.now).items(), key=lambda p: (p[1], p[0]), reverse=True)
+
+
+@pytest.mark.parametrize("decay", [False, True])
+def test_leaderboard_follows_current_scores(decay):
+    rep, expected = _leaderboard(decay)
+    top = rep.top(limit=5, offset=3)
+    assert [(e["actor_id"], e["rank"]) for e in top] == [(a, i + 4) for i, (a, _) in enumerate(expected[3:8])]
+    assert [e["score"] for e in top] == pytest.approx([s for _, s in expected[3:8]])
+    bottom = rep.bottom(limit=4)
+    assert [e["actor_id"] for e in bottom] == [a for a, _ in expected[::-1][:4]]
+    assert bottom[0]["rank"] == len(expected)
+    for i, (actor_id, _) in enumerate(expected):
+        assert rep.rank_of(actor_id) == i + 1
+    assert rep.percentile(expected[0][0]) == 100.0 and rep.percentile(expected[-1][0]) == 0.0
+    assert rep.score_at_percentile(50) == pytest.approx(expected[::-1][round((len(expected) - 1) / 2)][1])
+    assert rep.rank_of("nobody") is None
+
+
+def test_leaderboard_bounds_and_decay_order():
+    clock = FakeClock()
+    rep = ReputationIndex(half_life=100, clock=clock)
+    rep.record_action("old-high", 5.0)  # 1.0
+    clock.now += 300                    # decays to 0.5625
+    rep.record_action("new-mid", 1.0)   # 0.6
+    rep.record_action("low", -3.0)      # 0.2
+    assert [e["actor_id"] for e in rep.top()] == ["new-mid", "old-high", "low"]
+    assert [e["actor_id"] for e in rep.top(min_score=0.58)] == ["new-mid"]
+    assert [e["actor_id"] for e in rep.bottom(max_score=0.5)] == ["low"]
+    clock.now += 1000  # both above 0.5 decay at the same rate: order kept without re-keying
+    assert [e["actor_id"] for e in rep.top(limit=2)] == ["new-mid", "old-high"]
+    with pytest.raises(ValueError):
+        rep.top(limit=-1)
+
+
+def _event_batch(n, actors, seed=5):
+    rng = random.Random(seed)
+    hot = [f"hot-{i}" for i in range(3)]  # a few actors with long runs, to exercise the tail path
+    ids = [rng.choice(hot) if i % 4 == 0 else f"actor-{rng.randrange(actors)}" for i in range(n)]
+    types = [rng.choice(["positive_behavior", "negative_behavior", "infraction", "unknown"]) for _ in range(n)]
+    weights = [rng.uniform(-3, 3) for _ in range(n)]
+    return ids, types, weights
+
+
+@pytest.mark.parametrize("half_life", [None, 600])
+def test_batch_ingest_matches_sequential(half_life):
+    pytest.importorskip("numpy")
+    ids, types, weights = _event_batch(5000, 200)
+    results = []
+    for batched in (False, True):
+        clock = FakeClock()
+        rep = ReputationIndex(half_life=half_life, history_size=50, clock=clock)
+        rep.record_action("actor-1", 2.0)
+        clock.now += 900
+        if batched:
+            scores = rep.ingest_events(ids, types, weights)
+        else:
+            scores = [rep.ingest_event(a, t, w) for a, t, w in zip(ids, types, weights)]
+        assert type(scores) is list
+        results.append((scores, rep.scores, rep.updated, rep.contexts.names,
+                        {a: (rep.history_of(a), rep.history_of(a, "hourly"), rep.history[a].total)
+                         for a in rep.scores},
+                        [e["actor_id"] for e in rep.top(20)]))
+    assert results[0] == results[1]  # bit-identical, not approximately equal
+
+
+def test_batch_ingest_notifies_once_per_actor_and_queues_for_the_store(tmp_path):
+    pytest.importorskip("numpy")
+    rep = ReputationIndex(store=str(tmp_path / "rep.db"), clock=FakeClock())
+    seen = []
+    rep.subscribe(lambda actor, old, new: seen.append((actor, old, round(new, 6))))
+    rep.ingest_events(["a", "b", "a", "c"], ["positive_behavior", "unknown", "positive_behavior", "infraction"])
+    assert seen == [("a", 0.5, 0.7), ("c", 0.5, 0.4)]
+    assert [len(rep._pending[a]) for a in "abc"] == [2, 1, 1]
+    rep.close()
+    assert ReputationIndex(store=str(tmp_path / "rep.db")).history_of("a")[-1]["new_score"] == pytest.approx(0.7)
+    with pytest.raises(ValueError):
+        rep.ingest_events(["a"], [])
+
+
+def test_store_warm_start_restores_scores_and_history(tmp_path):
+    path = str(tmp_path / "rep.db")
+    rep = ReputationIndex(store=path, history_size=4)
+    for i in range(6):
+        rep.record_action("a", 1.0, f"ctx-{i % 2}")
+    rep.record_action("b", -1.0, "infraction")
+    expected = {actor: rep.history_of(actor) for actor in ("a", "b")}
+    rep.close()
+
+    warm = ReputationIndex(store=path, history_size=4)
+    assert warm.scores == pytest.approx({"a": 1.0, "b": 0.4})
+    assert warm.history == {}  # histories load on first use
+    assert [e["actor_id"] for e in warm.top()] == ["a", "b"]
+    assert {actor: warm.history_of(actor) for actor in ("a", "b")} == expected
+    assert warm.history["a"].total == 6
+    warm.record_action("a", -1.0, "ctx-0")
+    assert [e["context"] for e in warm.history_of("a")] == ["ctx-1", "ctx-0", "ctx-1", "ctx-0"]
+
+
+def test_checkpoint_merges_updates_from_other_writers(tmp_path):
+    path = str(tmp_path / "rep.db")
+    one, two = ReputationIndex(store=path), ReputationIndex(store=path)
+    seen = []
+    two.subscribe(lambda actor, old, new: seen.append((actor, round(new, 6))))
+
+    one.record_action("a", 1.0)
+    two.record_action("a", 1.0)
+    assert one.checkpoint() == 1
+    assert ReputationIndex(store=path).get_score("a") == pytest.approx(0.6)
+    two.record_action("a", 1.0)  # still queued while two checkpoints
+    assert two.checkpoint() == 1
+    assert two.get_score("a") == pytest.approx(0.8)  # one's action is kept, not overwritten
+    assert two.history_of("a")[-1]["new_score"] == pytest.approx(0.8)
+    assert two.history["a"].total == 3
+
+    assert one.checkpoint() == 0  # nothing to write; picks up two's actions
+    assert one.get_score("a") == pytest.approx(0.8)
+    one.record_action("b", 1.0)
+    assert one.top()[0] == {"actor_id": "a", "score": pytest.approx(0.8), "rank": 1}
+    assert seen[:3] == [("a", 0.6), ("a", 0.7), ("a", 0.8)]  # listeners hear about merged-in changes too
+    one.close()
+    two.close()
+
+
+def _rep_worker(path, worker, actions, start):
+    rep = ReputationIndex(store=path)
+    start.wait()
+    for i in range(actions):
+        rep.record_action(f"actor-{i % 5}", 0.001, f"worker-{worker}")
+        if i % 50 == 49:
+            rep.checkpoint()
+    rep.close()
+
+
+def test_concurrent_processes_share_a_store(tmp_path):
+    path = str(tmp_path / "rep.db")
+    ReputationStore(path).close()
+    workers, actions = 4, 300
+    ctx = multiprocessing.get_context("spawn")
+    start = ctx.Event()
+    procs = [ctx.Process(target=_rep_worker, args=(path, w, actions, start)) for w in range(workers)]
+    for proc in procs:
+        proc.start()
+    start.set()
+    for proc in procs:
+        proc.join(120)
+        assert proc.exitcode == 0
+
+    rep = ReputationIndex(store=path, history_size=None)
+    per_actor = workers * actions // 5
+    for a in range(5):
+        assert rep.get_score(f"actor-{a}") == pytest.approx(0.5 + per_actor * 0.0001)
+        assert len(rep.history_of(f"actor-{a}")) == per_actor
+    assert len(rep.contexts.names) == workers
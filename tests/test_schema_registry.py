@@ -0,0 +1,37 @@
+import pytest
+from jsonschema import ValidationError
+from sdk.python.e4a_sdk import schema_registry
+from sdk.python.e4a_sdk.gate_engine import GateEngine
+from sdk.python.e4a_sdk.mandate_engine import MandateEngine, MandateEngineError
+from sdk.python.e4a_sdk.validator_runtime import ValidatorRuntime
+
+
+def test_validator_is_compiled_once_and_shared():
+    v1 = schema_registry.get_validator('mandate_v2.json')
+    v2 = schema_registry.get_validator(f"{schema_registry.SPEC_DIR}/mandate_v2.json")
+    assert v1 is v2
+    assert schema_registry.get_schema('mandate_v2.json')['title'] == 'Mandate v2 Schema'
+
+    MandateEngine()
+    GateEngine()
+    assert schema_registry.get_validator('mandate_v2.json') is v1
+
+
+def test_draft_is_selected_from_schema():
+    assert type(schema_registry.get_validator('mandate_v2.json')).__name__ == 'Draft7Validator'
+    assert type(schema_registry.get_validator('attestation_v1.json')).__name__ == 'Draft202012Validator'
+
+
+def test_validation_errors_surface_through_engines():
+    bad = {'mandate_id': 'm-1', 'issuer': 'did:ex:a', 'beneficiary': 'did:ex:b'}
+    with pytest.raises(ValidationError, match="'intent' is a required property"):
+        schema_registry.validate(bad, 'mandate_v2.json')
+    with pytest.raises(MandateEngineError, match="'intent' is a required property"):
+        MandateEngine().validate_mandate(bad)
+    with pytest.raises(ValueError, match="'intent' is a required property"):
+        ValidatorRuntime().validate_mandate(bad)
+
+
+def test_missing_schema():
+    with pytest.raises(FileNotFoundError):
+        schema_registry.get_validator('no_such_spec.json')
@@ -0,0 +1,79 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
+
+
+def _lines(path):
+    return [json.loads(line)["n"] for line in path.read_text().splitlines()]
+
+
+def test_entry_policy_writes_through(tmp_path):
+    log = tmp_path / "ledger.jsonl"
+    scribe = ScribeAgent(log_path=str(log))
+    scribe.append_entry({"entry_type": "event", "n": 1})
+    assert _lines(log) == [1]  # visible to readers without flush()
+    scribe.close()
+    scribe.append_entry({"entry_type": "event", "n": 2})  # reopens after close
+    assert _lines(log) == [1, 2]
+    scribe.close()
+
+
+def test_batch_policy_writes_every_n_entries(tmp_path):
+    log = tmp_path / "ledger.jsonl"
+    with ScribeAgent(log_path=str(log), flush_policy="batch", flush_every=3, flush_interval=60) as scribe:
+        for n in range(4):
+            scribe.append_entry({"entry_type": "event", "n": n})
+        assert _lines(log) == [0, 1, 2]
+        assert len(scribe.ledger) == 4  # the ledger itself is never delayed
+    assert _lines(log) == [0, 1, 2, 3]  # leaving the block flushes the rest
+
+
+def test_batch_policy_writes_after_the_interval(tmp_path):
+    log = tmp_path / "ledger.jsonl"
+    scribe = ScribeAgent(log_path=str(log), flush_policy="batch", flush_every=1000, flush_interval=0.05)
+    scribe.append_entries([{"entry_type": "event", "n": n} for n in range(5)])
+    assert _lines(log) == []
+    deadline = time.monotonic() + 5
+    while not log.read_text() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert _lines(log) == list(range(5))
+    scribe.close()
+
+
+def test_concurrent_commits_share_fsyncs(tmp_path, monkeypatch):
+    log = tmp_path / "ledger.jsonl"
+    scribe = ScribeAgent(log_path=str(log), flush_policy="batch", flush_every=10_000, flush_interval=60)
+    fsyncs = []
+    real_fsync = os.fsync
+
+    def slow_fsync(fd):
+        fsyncs.append(fd)
+        time.sleep(0.01)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", slow_fsync)
+
+    def worker(w):
+        for i in range(10):
+            scribe.append_entry({"entry_type": "event", "n": w * 100 + i})
+            scribe.commit()
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(_lines(log)) == sorted(w * 100 + i for w in range(8) for i in range(10))
+    assert _lines(log) == [e["n"] for e in scribe.ledger]
+    assert len(fsyncs) < 80  # fewer fsyncs than commits
+    scribe.close()
+
+
+def test_rejects_unknown_flush_policy(tmp_path):
+    with pytest.raises(ValueError):
+        ScribeAgent(log_path=str(tmp_path / "l.jsonl"), flush_policy="sometimes")
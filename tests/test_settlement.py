@@ -0,0 +1,66 @@
+import pytest
+from sdk.python.e4a_sdk import settlement
+from sdk.python.e4a_sdk.mandate_engine import MandateEngine, MandateEngineError
+
+
+def _seed(engine):
+    rows = [
+        ('m-1', 'did:ex:alice', 'USD', 0.10, '2025-01-01T10:00:00.000000Z'),
+        ('m-2', 'did:ex:alice', 'USD', 0.20, '2025-01-01T11:00:00.000000Z'),
+        ('m-3', 'did:ex:bob', 'JPY', 1001, '2025-01-02T09:00:00.000000Z'),
+        ('m-4', 'did:ex:bob', 'USD', 333.33, '2025-01-03T09:00:00.000000Z'),
+    ]
+    for mid, issuer, currency, amount, created_at in rows:
+        engine.mandates[mid] = {
+            'mandate_id': mid, 'issuer': issuer, 'beneficiary': 'did:ex:zed', 'amount': amount,
+            'currency': currency, 'created_at': created_at, 'validator_ref': 'did:ex:val',
+            'fee_distribution': {'protocol': 0.1, 'validator': 0.05, 'issuer': 0.015},
+        }
+
+
+def test_exact_minor_unit_totals():
+    me = MandateEngine()
+    _seed(me)
+    out = me.settle_fees()
+    assert out['count'] == 4
+    usd = out['by_currency']['USD']
+    # 10 + 20 + 33333 cents; protocol split floors each mandate: 1 + 2 + 3333
+    assert usd == {'exponent': 2, 'amount': 33363, 'protocol': 3336, 'validator': 1667, 'issuer': 499}
+    assert settlement.format_minor(usd['amount'], 'USD') == '333.63'
+    assert out['by_currency']['JPY'] == {'exponent': 0, 'amount': 1001, 'protocol': 100, 'validator': 50, 'issuer': 15}
+    assert out['by_party']['protocol'] == {'USD': 3336, 'JPY': 100}
+    assert out['by_party']['did:ex:val'] == {'USD': 1667, 'JPY': 50}
+    assert out['by_party']['did:ex:bob'] == {'JPY': 15, 'USD': 499}
+    assert 'did:ex:alice' not in out['by_party']  # 0.015 * 10 and * 20 cents floor to 0
+
+
+def test_numpy_and_python_paths_agree():
+    pytest.importorskip('numpy')
+    me = MandateEngine()
+    _seed(me)
+    assert me.settle_fees(use_numpy=True) == me.settle_fees(use_numpy=False)
+
+
+def test_filters_and_explicit_ids():
+    me = MandateEngine()
+    _seed(me)
+    assert me.settle_fees(issuer='did:ex:bob')['count'] == 2
+    assert set(me.settle_fees(currency='USD')['by_currency']) == {'USD'}
+    window = me.settle_fees(since='2025-01-01T10:30:00Z', until='2025-01-03T00:00:00+00:00')
+    assert window['count'] == 2
+    # compared as times, not strings: other offsets and missing fractions land on the right side
+    assert me.settle_fees(since='2025-01-01T12:30:00+02:00', until='2025-01-03T01:00:00+01:00')['count'] == 2
+    me.mandates['m-5'] = {**me.mandates['m-1'], 'mandate_id': 'm-5', 'created_at': '2025-01-01T11:30:00+02:00'}
+    me.mandates['m-6'] = {**me.mandates['m-1'], 'mandate_id': 'm-6', 'created_at': '2025-01-01T10:30:00Z'}
+    assert me.settle_fees(since='2025-01-01T10:00:00Z', until='2025-01-01T10:30:00.5Z')['count'] == 2  # m-1, m-6
+    assert me.settle_fees(mandate_ids=['m-1'])['by_currency']['USD']['amount'] == 10
+    with pytest.raises(MandateEngineError):
+        me.settle_fees(mandate_ids=['missing'])
+    # a malformed bound must not widen the selection to the whole ledger
+    with pytest.raises(MandateEngineError, match='since'):
+        me.settle_fees(since='2025-13-01')
+    with pytest.raises(MandateEngineError, match='until'):
+        me.settle_fees(since='2025-01-02', until='garbage')
+    me.mandates['m-7'] = {**me.mandates['m-1'], 'mandate_id': 'm-7', 'created_at': 'not a date'}
+    assert me.settle_fees(since='2025-01-01T10:00:00Z', until='2025-01-01T10:30:00.5Z')['count'] == 2
+    assert me.settle_fees(currency='GBP') == {'count': 0, 'by_currency': {}, 'by_party': {}}
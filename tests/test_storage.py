@@ -0,0 +1,83 @@
+import pytest
+from sdk.python.e4a_sdk.config_loader import Config
+from sdk.python.e4a_sdk.mandate_engine import MandateEngine
+from sdk.python.e4a_sdk.storage import InMemoryStorage, SQLiteStorage, Storage, StorageError, open_storage
+
+
+def _mandate(**extra):
+    m = {
+        'issuer': 'did:ex:alice',
+        'beneficiary': 'did:ex:bob',
+        'amount': 20,
+        'currency': 'USD',
+        'intent': {
+            'goal': 'persist mandates',
+            'expected_outcome': 'mandates survive restart',
+            'contextual_tone': 'neutral',
+            'statistical_purpose': 'validate storage backend',
+        }
+    }
+    m.update(extra)
+    return m
+
+
+def test_open_storage_from_config(tmp_path):
+    assert isinstance(open_storage(None), InMemoryStorage)
+    assert isinstance(open_storage({'type': 'json', 'path': 'x.json'}), InMemoryStorage)
+    cfg = Config({'db': {'type': 'sqlite', 'path': str(tmp_path / 'e4a.db')}})
+    with open_storage(cfg) as store:
+        assert isinstance(store, SQLiteStorage)
+        mode = store._fetchall('PRAGMA journal_mode')[0][0]
+        assert mode == 'wal'
+    with pytest.raises(StorageError):
+        open_storage({'type': 'postgres'})
+
+
+def test_backends_must_implement_the_lookups():
+    class Partial(Storage):
+        def find_mandates(self, **criteria):
+            return []
+
+    with pytest.raises(TypeError, match='find_gates'):
+        Partial()
+
+
+def test_sqlite_engine_survives_restart(tmp_path):
+    path = str(tmp_path / 'e4a.db')
+    me = MandateEngine(storage=SQLiteStorage(path))
+    parent = me.create_mandate(_mandate(replay_nonce='p-1'))
+    child = me.create_submandate(parent['mandate_id'], _mandate(beneficiary='did:ex:carol'))
+    gated = me.create_mandate(_mandate(intent=dict(_mandate()['intent'], requires_approval=['human-a'])))
+    with pytest.raises(Exception):
+        me.execute_mandate(gated['mandate_id'])
+    gate = me.gate_engine.get_gate_by_mandate_id(gated['mandate_id'])
+    me.gate_engine.approve_gate(gate['gate_id'], 'human-a')
+    me.storage.close()
+
+    me2 = MandateEngine(storage=SQLiteStorage(path))
+    assert list(me2.mandates) == [parent['mandate_id'], child['mandate_id'], gated['mandate_id']]
+    assert me2.mandates[child['mandate_id']]['parent_mandate_id'] == parent['mandate_id']
+    # the replay index is rebuilt lazily from the store's replay_nonce index
+    assert me2.create_mandate(_mandate(replay_nonce='p-1'))['mandate_id'] == parent['mandate_id']
+    assert me2.gate_engine.get_gate_status(gate['gate_id'])['status'] == 'approved'
+    assert me2.execute_mandate(gated['mandate_id'])['status'] == 'executed'
+
+
+def test_sqlite_indexed_lookups_and_transaction(tmp_path):
+    store = SQLiteStorage(str(tmp_path / 'e4a.db'))
+    store.mandates['m-1'] = _mandate(mandate_id='m-1')
+    store.mandates['m-2'] = _mandate(mandate_id='m-2', issuer='did:ex:zed', parent_mandate_id='m-1')
+    assert [m['mandate_id'] for m in store.find_mandates(issuer='did:ex:alice')] == ['m-1']
+    assert [m['mandate_id'] for m in store.find_mandates(parent_mandate_id='m-1')] == ['m-2']
+    assert list(store.iter_child_links()) == [('m-2', 'm-1')]
+    plan = store._fetchall('EXPLAIN QUERY PLAN SELECT doc FROM mandates WHERE beneficiary = ?', ('x',))
+    assert 'idx_mandates_beneficiary' in str(plan)
+
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            store.mandates['m-3'] = _mandate(mandate_id='m-3')
+            raise RuntimeError('abort')
+    assert 'm-3' not in store.mandates
+    assert len(store.mandates) == 2
+    del store.mandates['m-2']
+    assert store.find_mandates(parent_mandate_id='m-1') == []
@@ -0,0 +1,116 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from sdk.python.e4a_sdk.governance_kernel import GovernanceKernel
+from sdk.python.e4a_sdk.scribe_agent import ScribeAgent
+from sdk.python.e4a_sdk.trust_graph import TrustGraph
+
+
+def _dense_trust(graph, alpha):
+    """Reference: power iteration on the dense matrix."""
+    n, m = len(graph), graph.edges
+    c = np.zeros((n, n))
+    np.add.at(c, (graph._src[:m], graph._dst[:m]), graph._weight[:m])
+    out = c.sum(axis=1)
+    p = np.full(n, 1.0 / n)
+    c[out > 0] /= out[out > 0, None]
+    c[out == 0] = p
+    t = p.copy()
+    for _ in range(2000):
+        t = (1 - alpha) * c.T @ t + alpha * p
+    return t
+
+
+def _random_edges(rng, actors, edges):
+    src = rng.integers(0, actors, edges)
+    dst = (src + 1 + rng.integers(0, actors - 1, edges)) % actors
+    return [f"a{i}" for i in src], [f"a{i}" for i in dst], rng.uniform(0.5, 2.0, edges)
+
+
+def test_matches_dense_power_iteration():
+    rng = np.random.default_rng(1)
+    graph = TrustGraph(amount_weighted=True)
+    graph.add_edges(*_random_edges(rng, 60, 300))
+    graph.add_edges(["sink"], ["a0"], [0.0])  # non-positive weight: actor known, edge skipped
+    assert graph.converge() > 0
+    expected = _dense_trust(graph, 0.15)
+    assert [graph.trust(a) for a in graph.actors] == pytest.approx(expected, abs=1e-9)
+    assert max(graph.get_score(a) for a in graph.actors) == 1.0
+    assert graph.get_score("stranger") == 0.0
+    assert graph.converge() == 0  # nothing new
+
+
+def test_incremental_converge_matches_a_cold_start():
+    rng = np.random.default_rng(2)
+    first, more = _random_edges(rng, 500, 5000), _random_edges(rng, 520, 50)
+    warm = TrustGraph()
+    warm.add_edges(*first)
+    cold_steps = warm.converge()
+    warm.add_edges(*more)
+    warm_steps = warm.converge()
+    assert warm_steps < cold_steps
+
+    cold = TrustGraph()
+    cold.add_edges(*first)
+    cold.add_edges(*more)
+    cold.converge()
+    assert [warm.trust(a) for a in cold.actors] == pytest.approx([cold.trust(a) for a in cold.actors], abs=1e-9)
+
+
+def test_trust_follows_mandates_and_pre_trusted_actors():
+    scribe = ScribeAgent()
+
+    def mandate(i, b):
+        return {"entry_type": "mandate_created", "mandate_id": f"m-{i}",
+                "payload": {"issuer": f"issuer-{i}", "beneficiary": b, "amount": 10}}
+
+    scribe.append_entries([mandate(i, "hub") for i in range(5)] + [mandate(5, "edge")])
+    graph = TrustGraph(pre_trusted=["issuer-5"])
+    assert graph.ingest_from_scribe(scribe) == 6
+    assert graph.ingest_from_scribe(scribe) == 0
+    graph.converge()
+    assert [e["actor_id"] for e in graph.top(2)] == ["issuer-5", "edge"]
+    assert graph.get_score("hub") == 0.0  # five mandates from actors nobody trusts count for nothing
+
+    scribe.append_entry({"entry_type": "mandate_created", "payload": {"issuer": "edge", "beneficiary": "issuer-0"}})
+    graph.ingest_from_scribe(scribe)
+    graph.converge()
+    assert 0 < graph.get_score("hub") < graph.get_score("issuer-0")  # trust now reaches hub through issuer-0
+
+
+def test_listeners_hear_every_score_change_including_rescaling():
+    graph = TrustGraph()
+    graph.add_edges(["a", "b", "c"], ["alice", "alice", "bob"])
+    graph.converge()
+    before = {a: graph.get_score(a) for a in graph.actors}
+    changes = {}
+    graph.subscribe(lambda actor_id, old, new: changes.__setitem__(actor_id, (old, new)))
+
+    graph.add_edges(["d", "e", "f", "g"], ["bob"] * 4)
+    graph.converge()
+    after = {a: graph.get_score(a) for a in graph.actors}
+    moved = {a for a in after if abs(after[a] - before.get(a, graph.default_score)) > 1e-12}
+    assert set(changes) == moved
+    assert all(changes[a] == pytest.approx((before.get(a, 0.0), after[a])) for a in moved)
+    assert after["bob"] == 1.0 and "alice" in changes  # alice is rescaled against the new maximum
+
+
+def test_governance_kernel_weighs_votes_by_trust(tmp_path):
+    graph = TrustGraph()
+    graph.add_edges(["a", "b", "c"], ["alice", "alice", "bob"])
+    graph.converge()
+    g = GovernanceKernel(reputation_index=graph, state_path=str(tmp_path / "gov.json"))
+    g.register_charter("c", {})
+    g.submit_proposal("c", "p", {"action": "x"})
+    g.vote("p", "alice", "yes")
+    g.vote("p", "bob", "no")
+    assert g.tally("p")["yes"] == pytest.approx(1.0)
+    assert g.tally("p")["no"] == pytest.approx(graph.get_score("bob"))
+
+    graph.add_edges(["d", "e", "f", "g"], ["bob"] * 4)  # bob becomes the most trusted
+    graph.converge()
+    tally = g.tally("p")
+    assert (tally["yes"], tally["no"]) == pytest.approx((graph.get_score("alice"), 1.0), abs=1e-9)
+    assert g.simulate_and_enact("p")["status"] == "rejected"
+    g.close()
@@ -1,10 +1,22 @@
 #!/usr/bin/env python3
-import json, jsonschema, sys
+import json, os, sys
+try:
+    from sdk.python.e4a_sdk import schema_registry
+except ImportError:
+    # Run as a plain script (python tools/validator.py): load the registry module directly so the
+    # check only needs jsonschema, not the full SDK dependency set.
+    import importlib.util
+    _path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "..", "sdk", "python", "e4a_sdk", "schema_registry.py")
+    _spec = importlib.util.spec_from_file_location("schema_registry", _path)
+    schema_registry = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(schema_registry)
 def validate_file(schema_path: str, data_path: str) -> int:
     try:
-        with open(schema_path, "r") as f: schema = json.load(f)
         with open(data_path, "r") as f: data = json.load(f)
-        jsonschema.validate(instance=data, schema=schema)
+        # the schema argument is a file path relative to the working directory, as before;
+        # abspath keeps the registry from resolving a bare name against specs/
+        schema_registry.validate(data, os.path.abspath(schema_path))
         print(f"✔ VALID: {data_path} conforms to {schema_path}")
         return 0
     except Exception as e: